@@ -0,0 +1,88 @@
+"""
+Measures the per-request overhead of OpenRouterClient against an in-process transport.
+
+Compares building and serializing the payload on every call (`max_compiled=0`) with
+reusing compiled request bodies. Run with `uv run python benchmarks/client_overhead.py`.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from promptum.providers import OpenRouterClient
+from promptum.providers.payload import JSON_BACKEND
+
+_RESPONSE = {
+    "choices": [{"message": {"content": "ok"}}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+}
+_SYSTEM_PROMPT = "You are a careful assistant. " * 20
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=_RESPONSE)
+
+
+def _prompt(i: int, prompts: int) -> str:
+    return f"Question {i % prompts}: " + "context " * 200
+
+
+def _measure_compile(max_compiled: int, requests: int, prompts: int) -> float:
+    client = OpenRouterClient(api_key="bench", max_compiled=max_compiled)
+    start = time.perf_counter()
+    for i in range(requests):
+        client.compile(
+            _prompt(i, prompts), "bench/model", system_prompt=_SYSTEM_PROMPT, max_tokens=256
+        )
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def _measure_generate(max_compiled: int, requests: int, prompts: int) -> float:
+    client = OpenRouterClient(api_key="bench", max_compiled=max_compiled)
+    async with client:
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        start = time.perf_counter()
+        for i in range(requests):
+            await client.generate(
+                prompt=_prompt(i, prompts),
+                model="bench/model",
+                system_prompt=_SYSTEM_PROMPT,
+                max_tokens=256,
+            )
+        elapsed = time.perf_counter() - start
+    return elapsed / requests * 1_000_000
+
+
+def _report(label: str, before: float, after: float) -> None:
+    saved = (1 - after / before) * 100
+    print(f"{label:<10} uncached {before:8.1f} us  compiled {after:8.1f} us  ({saved:.1f}% less)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--prompts", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"json backend: {JSON_BACKEND}")
+    # Best of several alternating rounds, so ordering and warm-up do not favour either side.
+    compile_times: dict[int, list[float]] = {0: [], 4096: []}
+    generate_times: dict[int, list[float]] = {0: [], 4096: []}
+    for _ in range(args.rounds):
+        for max_compiled in compile_times:
+            compile_times[max_compiled].append(
+                _measure_compile(max_compiled, args.requests, args.prompts)
+            )
+            generate_times[max_compiled].append(
+                await _measure_generate(max_compiled, args.requests, args.prompts)
+            )
+
+    _report("compile", min(compile_times[0]), min(compile_times[4096]))
+    _report("generate", min(generate_times[0]), min(generate_times[4096]))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
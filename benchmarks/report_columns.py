@@ -0,0 +1,95 @@
+"""
+Times Report summaries, filters and group-bys on the columnar path against plain row scans.
+
+Builds a synthetic report of `--size` results spread over a few models and tags, then
+times each operation through `Report` and through the equivalent list comprehensions.
+Run with `uv run python benchmarks/report_columns.py --size 1000000`.
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from promptum import Contains, Metrics, Prompt, Report, TestResult
+from promptum.session.columns import COLUMN_BACKEND
+
+
+def _report(size: int) -> Report:
+    validator = Contains("ok")
+    prompts = [
+        Prompt(
+            name=f"p{i}",
+            prompt="prompt",
+            model=f"model{i % 4}",
+            validator=validator,
+            tags=(f"tag{i % 7}", f"tag{i % 3}"),
+        )
+        for i in range(64)
+    ]
+    return Report(
+        results=[
+            TestResult(
+                test_case=prompts[i % len(prompts)],
+                response="ok",
+                passed=i % 5 != 0,
+                metrics=Metrics(latency_ms=float(i % 1000), total_tokens=i % 50, cost_usd=1e-5),
+                validation_details={},
+            )
+            for i in range(size)
+        ]
+    )
+
+
+def _rows_summary(report: Report) -> Any:
+    live = [r.metrics for r in report.results if r.metrics and not r.metrics.cached]
+    latencies = [m.latency_ms for m in live]
+    return (
+        sum(1 for r in report.results if r.passed),
+        sum(latencies) / len(latencies),
+        min(latencies),
+        max(latencies),
+        sum(m.cost_usd or 0 for m in live),
+    )
+
+
+def _rows_group_by_tag(report: Report) -> Any:
+    groups: dict[str, list[TestResult]] = {}
+    for result in report.results:
+        for tag in result.test_case.tags:
+            groups.setdefault(tag, []).append(result)
+    return {tag: _rows_summary(Report(results=group)) for tag, group in groups.items()}
+
+
+def _timed(label: str, func: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{label:<32} {time.perf_counter() - start:>8.3f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    report = _report(args.size)
+    print(f"{args.size} results, {COLUMN_BACKEND} columns")
+
+    _timed("rows: summary", lambda: _rows_summary(report))
+    _timed(
+        "rows: filter model and passed",
+        lambda: [r for r in report.results if r.test_case.model == "model1" and r.passed],
+    )
+    _timed("rows: summary per tag", lambda: _rows_group_by_tag(report))
+
+    _timed("columns: build", lambda: report.columns)
+    _timed("columns: summary", report.get_summary)
+    _timed("columns: filter model and passed", lambda: report.filter(model="model1", passed=True))
+    _timed(
+        "columns: summary per tag",
+        lambda: {tag: r.get_summary() for tag, r in report.group_by("tag").items()},
+    )
+
+
+if __name__ == "__main__":
+    main()
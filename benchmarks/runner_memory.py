@@ -0,0 +1,72 @@
+"""
+Shows that Runner's peak memory depends on concurrency, not on the number of test cases.
+
+Each size runs in a fresh subprocess that streams lazily generated prompts through
+`Runner.run_iter` against an instant in-process provider, then reports peak RSS.
+Run with `uv run python benchmarks/runner_memory.py --sizes 10000 100000 1000000`.
+"""
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from promptum import Contains, Metrics, Prompt, Runner
+
+
+class _InstantProvider:
+    async def generate(self, prompt: str, model: str, **kwargs: Any) -> tuple[str, Metrics]:
+        await asyncio.sleep(0)
+        return "ok", Metrics(latency_ms=0.0)
+
+
+def _prompts(count: int) -> Iterator[Prompt]:
+    validator = Contains("ok")
+    for i in range(count):
+        yield Prompt(name=f"p{i}", prompt=f"prompt {i}", model="m", validator=validator)
+
+
+async def _child(size: int, concurrency: int) -> None:
+    runner = Runner(_InstantProvider(), max_concurrent=concurrency)
+    passed = 0
+    start = time.perf_counter()
+    async for result in runner.run_iter(_prompts(size)):
+        passed += result.passed
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in kilobytes on Linux.
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{size:>10} {passed:>10} {elapsed:>9.1f}s {peak_mb:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        asyncio.run(_child(args.child, args.concurrency))
+        return
+
+    print(f"{'prompts':>10} {'passed':>10} {'time':>10} {'peak MB':>10}")
+    for size in args.sizes:
+        subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                str(size),
+                "--concurrency",
+                str(args.concurrency),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
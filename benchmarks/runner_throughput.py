@@ -0,0 +1,86 @@
+"""
+Runs a Session against the local mock server to measure Runner throughput and retries.
+
+Everything stays on localhost, so results are reproducible without network access.
+Run with `uv run python benchmarks/runner_throughput.py --prompts 2000 --concurrency 64`.
+The in-process server shares the event loop with the client; for high request rates start
+it separately with `python -m promptum.testing` and pass `--base-url`.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from promptum import Contains, OpenRouterClient, Prompt, RetryConfig, Session
+from promptum.testing import LogNormalLatency, MockServer, MockServerConfig
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prompts", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--median-latency", type=float, default=0.05)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--server-error-probability", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", default=None, help="use an already running mock server")
+    args = parser.parse_args()
+
+    config = MockServerConfig(
+        latency=LogNormalLatency(args.median_latency),
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_probability=args.rate_limit_probability,
+        server_error_probability=args.server_error_probability,
+        seed=args.seed,
+    )
+    retry_config = RetryConfig(max_attempts=5, initial_delay=0.01, max_delay=0.2)
+
+    server = MockServer(config)
+    if args.base_url is None:
+        await server.start()
+    try:
+        async with OpenRouterClient(
+            api_key="bench",
+            base_url=args.base_url or server.base_url,
+            default_retry_config=retry_config,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+            session = Session(client, max_concurrent=args.concurrency, stream=args.stream)
+            session.add_tests(
+                [
+                    Prompt(
+                        name=f"p{i}",
+                        prompt=f"prompt {i}",
+                        model="mock",
+                        validator=Contains("token"),
+                    )
+                    for i in range(args.prompts)
+                ]
+            )
+            start = time.perf_counter()
+            report = await session.run()
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.stop()
+
+    summary = report.get_summary()
+    metrics = [r.metrics for r in report.results if r.metrics]
+    latencies = sorted(m.latency_ms for m in metrics)
+    retries = sum(len(m.retry_delays) for m in metrics)
+    print(f"prompts:     {summary.total} ({summary.passed} passed, {summary.failed} failed)")
+    print(f"throughput:  {summary.total / elapsed:.1f} prompts/s over {elapsed:.2f}s")
+    if latencies:
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"latency:     p50 {p50:.1f} ms  p95 {p95:.1f} ms")
+    print(f"retries:     {retries}")
+    if args.base_url is None:
+        print(f"server:      {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,39 @@
-from promptum.providers import LLMProvider, Metrics, OpenRouterClient, RetryConfig, RetryStrategy
-from promptum.session import Prompt, Report, Runner, Session, Summary, TestResult
+from promptum.providers import (
+    Backend,
+    CachedProvider,
+    CircuitBreaker,
+    CoalescingProvider,
+    HedgingConfig,
+    LLMProvider,
+    Metrics,
+    OpenRouterClient,
+    RateLimit,
+    RateLimiter,
+    ResponseCache,
+    RetryConfig,
+    RetryStrategy,
+    RoutingProvider,
+    SamplingLLMProvider,
+    StreamingLLMProvider,
+)
+from promptum.session import (
+    AdaptiveConcurrency,
+    Budget,
+    EarlyStopping,
+    FairScheduling,
+    Journal,
+    LiveSummary,
+    Prompt,
+    PromptStats,
+    QuantileSketch,
+    Report,
+    Resume,
+    Runner,
+    Session,
+    Shard,
+    Summary,
+    TestResult,
+)
 from promptum.validation import (
     Contains,
     ExactMatch,
@@ -14,6 +48,9 @@ __all__ = [
     "Prompt",
     "TestResult",
     "Summary",
+    "LiveSummary",
+    "QuantileSketch",
+    "PromptStats",
     "Metrics",
     "RetryConfig",
     "RetryStrategy",
@@ -23,8 +60,26 @@ __all__ = [
     "Regex",
     "JsonSchema",
     "LLMProvider",
+    "StreamingLLMProvider",
+    "SamplingLLMProvider",
     "OpenRouterClient",
+    "CachedProvider",
+    "CoalescingProvider",
+    "CircuitBreaker",
+    "HedgingConfig",
+    "ResponseCache",
+    "RateLimit",
+    "RateLimiter",
+    "RoutingProvider",
+    "Backend",
     "Runner",
+    "AdaptiveConcurrency",
+    "Budget",
+    "EarlyStopping",
+    "FairScheduling",
     "Session",
+    "Shard",
+    "Journal",
     "Report",
+    "Resume",
 ]
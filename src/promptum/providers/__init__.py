@@ -1,4 +1,8 @@
+from promptum.providers.cache import CachedProvider, ResponseCache, cache_key
+from promptum.providers.circuit import CircuitBreaker, CircuitState
+from promptum.providers.coalescing import CoalescingProvider
 from promptum.providers.exceptions import (
+    ProviderCircuitOpenError,
     ProviderError,
     ProviderHTTPStatusError,
     ProviderNotInitializedError,
@@ -6,21 +10,48 @@ from promptum.providers.exceptions import (
     ProviderRetryExhaustedError,
     ProviderTransientError,
 )
+from promptum.providers.hedging import HedgingConfig, LatencyTracker
 from promptum.providers.metrics import Metrics
 from promptum.providers.openrouter import OpenRouterClient
-from promptum.providers.protocol import LLMProvider
+from promptum.providers.payload import CompiledRequest
+from promptum.providers.protocol import (
+    SAMPLE_INDEX,
+    LLMProvider,
+    SamplingLLMProvider,
+    StreamingLLMProvider,
+)
+from promptum.providers.ratelimit import RateLimit, RateLimiter
 from promptum.providers.retry import RetryConfig, RetryStrategy
+from promptum.providers.routing import Backend, RoutingProvider, RoutingStrategy
 
 __all__ = [
+    "SAMPLE_INDEX",
+    "Backend",
+    "CachedProvider",
+    "CircuitBreaker",
+    "CircuitState",
+    "CoalescingProvider",
+    "CompiledRequest",
+    "HedgingConfig",
     "LLMProvider",
+    "LatencyTracker",
     "Metrics",
     "OpenRouterClient",
+    "ProviderCircuitOpenError",
     "ProviderError",
     "ProviderHTTPStatusError",
     "ProviderNotInitializedError",
     "ProviderResponseParseError",
     "ProviderRetryExhaustedError",
     "ProviderTransientError",
+    "RateLimit",
+    "RateLimiter",
+    "ResponseCache",
     "RetryConfig",
     "RetryStrategy",
+    "RoutingProvider",
+    "RoutingStrategy",
+    "SamplingLLMProvider",
+    "StreamingLLMProvider",
+    "cache_key",
 ]
@@ -0,0 +1,266 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from promptum.providers.metrics import Metrics
+from promptum.providers.protocol import SAMPLE_INDEX, LLMProvider, StreamingLLMProvider
+
+# Call options that control how a request is made, not what it asks for.
+_UNKEYED_KWARGS = frozenset({"retry_config"})
+
+
+def cache_key(
+    prompt: str,
+    model: str,
+    system_prompt: str | None = None,
+    temperature: float = 1.0,
+    max_tokens: int | None = None,
+    sample_index: int = 0,
+    **kwargs: Any,
+) -> str:
+    """
+    Returns a stable SHA-256 hex digest identifying a generation request.
+
+    Samples after the first get keys of their own, so each sample of a prompt is replayed
+    as it was generated rather than as a copy of sample 0.
+    """
+    request: dict[str, Any] = {
+        "prompt": prompt,
+        "model": model,
+        "system_prompt": system_prompt,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "kwargs": {k: v for k, v in kwargs.items() if k not in _UNKEYED_KWARGS},
+    }
+    if sample_index:
+        request["sample_index"] = sample_index
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier response store: an in-memory LRU in front of an optional directory on disk."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int = 1024,
+        max_disk_bytes: int | None = None,
+        ttl: float | None = None,
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory: OrderedDict[str, tuple[float, str, Metrics]] = OrderedDict()
+        self._disk_bytes: int | None = None
+
+    async def get(self, key: str) -> tuple[str, Metrics] | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                return entry[1], entry[2]
+            del self._memory[key]
+
+        if self.directory is None:
+            return None
+
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is None:
+            return None
+        self._remember(key, entry)
+        return entry[1], entry[2]
+
+    async def set(self, key: str, content: str, metrics: Metrics) -> None:
+        entry = (time.time(), content, metrics)
+        self._remember(key, entry)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write_disk, key, entry)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def _remember(self, key: str, entry: tuple[float, str, Metrics]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> tuple[float, str, Metrics] | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            created_at, content = data["created_at"], data["content"]
+            metrics = Metrics.from_dict(data["metrics"])
+            expired = self._expired(created_at)
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, TypeError, ValueError, AttributeError):
+            # Unreadable or malformed entry: drop it and treat the lookup as a miss.
+            path.unlink(missing_ok=True)
+            return None
+
+        if expired:
+            path.unlink(missing_ok=True)
+            return None
+
+        # Touch the file so size-based eviction removes least recently used entries first.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return created_at, content, metrics
+
+    def _write_disk(self, key: str, entry: tuple[float, str, Metrics]) -> None:
+        created_at, content, metrics = entry
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(
+            {"created_at": created_at, "content": content, "metrics": metrics.to_dict()}
+        ).encode()
+
+        try:
+            previous_size = path.stat().st_size
+        except FileNotFoundError:
+            previous_size = 0
+        # A unique temporary file per write, so concurrent writers of one key cannot move
+        # each other's file away before `os.replace`.
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{key}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(encoded)
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+        if self.max_disk_bytes is None:
+            return
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan_disk_bytes()
+        else:
+            self._disk_bytes += len(encoded) - previous_size
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _scan_disk_bytes(self) -> int:
+        assert self.directory is not None
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                total += path.stat().st_size
+        return total
+
+    def _evict_disk(self) -> None:
+        assert self.directory is not None and self.max_disk_bytes is not None
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._disk_bytes = total
+
+
+class CachedProvider:
+    """Wraps a provider and replays stored responses for identical requests."""
+
+    def __init__(self, provider: LLMProvider, cache: ResponseCache | None = None):
+        self.provider = provider
+        self.cache = cache or ResponseCache()
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        return await self._generate(
+            self.provider.generate, prompt, model, system_prompt, temperature, max_tokens, kwargs
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        generate = self.provider.generate
+        if isinstance(self.provider, StreamingLLMProvider):
+            generate = self.provider.generate_stream
+        return await self._generate(
+            generate, prompt, model, system_prompt, temperature, max_tokens, kwargs
+        )
+
+    async def _generate(
+        self,
+        generate: Callable[..., Awaitable[tuple[str, Metrics]]],
+        prompt: str,
+        model: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> tuple[str, Metrics]:
+        start_time = time.perf_counter()
+        key = cache_key(
+            prompt,
+            model,
+            system_prompt,
+            temperature,
+            max_tokens,
+            sample_index=SAMPLE_INDEX.get(),
+            **kwargs,
+        )
+
+        hit = await self.cache.get(key)
+        if hit is not None:
+            content, metrics = hit
+            lookup_ms = (time.perf_counter() - start_time) * 1000
+            return content, replace(metrics, latency_ms=lookup_ms, retry_delays=(), cached=True)
+
+        content, metrics = await generate(
+            prompt=prompt,
+            model=model,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        await self.cache.set(key, content, metrics)
+        return content, metrics
@@ -0,0 +1,121 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+from promptum.providers.exceptions import ProviderCircuitOpenError
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class _ModelCircuit:
+    outcomes: deque[bool]
+    state: CircuitState = CircuitState.CLOSED
+    opened_at: float = 0.0
+    probes_in_flight: int = 0
+    half_open_successes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker.
+
+    The circuit opens when the failure rate over the last `window_size` requests reaches
+    `failure_rate_threshold`. While open, requests fail fast with ProviderCircuitOpenError.
+    After `recovery_timeout` seconds up to `half_open_probes` requests are let through;
+    if they all succeed the circuit closes, and any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_requests: int = 10,
+        recovery_timeout: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_requests = min_requests
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self._circuits: dict[str, _ModelCircuit] = {}
+
+    def state(self, model: str) -> CircuitState:
+        return self._get(model).state
+
+    def before_request(self, model: str) -> None:
+        """Admits a request for `model` or raises ProviderCircuitOpenError."""
+        circuit = self._get(model)
+
+        if circuit.state is CircuitState.OPEN:
+            remaining = circuit.opened_at + self.recovery_timeout - self._now()
+            if remaining > 0:
+                raise ProviderCircuitOpenError(model, remaining)
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.probes_in_flight = 0
+            circuit.half_open_successes = 0
+
+        if circuit.state is CircuitState.HALF_OPEN:
+            if circuit.probes_in_flight >= self.half_open_probes:
+                raise ProviderCircuitOpenError(model, 0.0)
+            circuit.probes_in_flight += 1
+
+    def retry_after(self, model: str) -> float | None:
+        """Seconds until an open circuit admits a probe, or None if the circuit is not open."""
+        circuit = self._get(model)
+        if circuit.state is not CircuitState.OPEN:
+            return None
+        return max(0.0, circuit.opened_at + self.recovery_timeout - self._now())
+
+    def record(self, model: str, success: bool | None) -> None:
+        """
+        Records the outcome of an admitted request.
+
+        `success=None` marks an outcome that says nothing about the model's health
+        (e.g. a client-side error); it only frees a half-open probe slot.
+        """
+        circuit = self._get(model)
+
+        if circuit.state is CircuitState.HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+            if success is False:
+                self._open(circuit)
+            elif success:
+                circuit.half_open_successes += 1
+                if circuit.half_open_successes >= self.half_open_probes:
+                    circuit.state = CircuitState.CLOSED
+                    circuit.outcomes.clear()
+            return
+
+        if success is None or circuit.state is CircuitState.OPEN:
+            return
+
+        circuit.outcomes.append(success)
+        failures = circuit.outcomes.count(False)
+        if (
+            len(circuit.outcomes) >= self.min_requests
+            and failures / len(circuit.outcomes) >= self.failure_rate_threshold
+        ):
+            self._open(circuit)
+
+    def _open(self, circuit: _ModelCircuit) -> None:
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = self._now()
+        circuit.probes_in_flight = 0
+        circuit.outcomes.clear()
+
+    def _get(self, model: str) -> _ModelCircuit:
+        circuit = self._circuits.get(model)
+        if circuit is None:
+            circuit = _ModelCircuit(outcomes=deque(maxlen=self.window_size))
+            self._circuits[model] = circuit
+        return circuit
+
+    def _now(self) -> float:
+        return time.monotonic()
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from typing import Any
+
+from promptum.providers.cache import cache_key
+from promptum.providers.metrics import Metrics
+from promptum.providers.protocol import LLMProvider, StreamingLLMProvider
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task[tuple[str, Metrics]]):
+        self.task = task
+        self.waiters = 0
+
+
+class CoalescingProvider:
+    """
+    Wraps a provider so identical concurrent requests share one call (singleflight).
+
+    Only deterministic requests (`temperature == 0`) are coalesced; sampled requests are
+    expected to differ and always go to the provider. The first caller gets the provider's
+    metrics, the others get a copy marked `coalesced=True`.
+    """
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self._flights: dict[str, _Flight] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        return await self._generate(
+            self.provider.generate,
+            "generate",
+            prompt,
+            model,
+            system_prompt,
+            temperature,
+            max_tokens,
+            kwargs,
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        generate = self.provider.generate
+        if isinstance(self.provider, StreamingLLMProvider):
+            generate = self.provider.generate_stream
+        return await self._generate(
+            generate, "stream", prompt, model, system_prompt, temperature, max_tokens, kwargs
+        )
+
+    async def _generate(
+        self,
+        generate: Callable[..., Awaitable[tuple[str, Metrics]]],
+        mode: str,
+        prompt: str,
+        model: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> tuple[str, Metrics]:
+        request = {
+            "prompt": prompt,
+            "model": model,
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        if temperature != 0:
+            return await generate(**request)
+
+        # Streamed and plain calls report different metrics, so they do not share flights.
+        key = (
+            mode + ":" + cache_key(prompt, model, system_prompt, temperature, max_tokens, **kwargs)
+        )
+        flight = self._flights.get(key)
+        leader = flight is None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(generate(**request)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+
+        start_time = time.perf_counter()
+        flight.waiters += 1
+        try:
+            # Shielded, so one caller being cancelled does not fail the others.
+            content, metrics = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+        if leader:
+            return content, metrics
+        waited_ms = (time.perf_counter() - start_time) * 1000
+        return content, replace(metrics, latency_ms=waited_ms, coalesced=True)
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
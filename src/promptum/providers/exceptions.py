@@ -50,6 +50,14 @@ class ProviderRetryExhaustedError(ProviderError):
         self.last_response_body = last_response_body
         self.retry_delays = retry_delays
         super().__init__(
-            f"Request failed after {attempts} attempts"
-            f" (last status {last_status_code})"
+            f"Request failed after {attempts} attempts (last status {last_status_code})"
         )
+
+
+class ProviderCircuitOpenError(ProviderError):
+    """Circuit breaker is open for the model; request rejected without being sent."""
+
+    def __init__(self, model: str, retry_after: float) -> None:
+        self.model = model
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for model {model!r}; retry in {retry_after:.1f}s")
@@ -0,0 +1,37 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class HedgingConfig:
+    percentile: float = 0.95
+    min_samples: int = 20
+    window_size: int = 200
+    min_delay: float = 0.0
+
+
+class LatencyTracker:
+    """Rolling window of recent request durations per model."""
+
+    def __init__(self, window_size: int = 200):
+        self.window_size = window_size
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        samples = self._samples.get(model)
+        if samples is None:
+            samples = deque(maxlen=self.window_size)
+            self._samples[model] = samples
+        samples.append(seconds)
+
+    def count(self, model: str) -> int:
+        return len(self._samples.get(model, ()))
+
+    def percentile(self, model: str, q: float) -> float | None:
+        samples = self._samples.get(model)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
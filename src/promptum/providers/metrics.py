@@ -1,5 +1,6 @@
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass, fields
+from typing import Any
 
 
 @dataclass(frozen=True, slots=True)
@@ -10,7 +11,31 @@ class Metrics:
     total_tokens: int | None = None
     cost_usd: float | None = None
     retry_delays: Sequence[float] = ()
+    time_to_first_token_ms: float | None = None
+    inter_token_latency_ms: float | None = None
+    tokens_per_second: float | None = None
+    cached: bool = False
+    pool_wait_ms: float | None = None
+    rate_limit_wait_ms: float | None = None
+    hedged: bool = False
+    hedge_won: bool = False
+    backend: str | None = None
+    coalesced: bool = False
 
     @property
     def total_attempts(self) -> int:
         return len(self.retry_delays) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready fields, for the response cache and the journal."""
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(data: Mapping[str, Any]) -> "Metrics":
+        """Inverse of `to_dict`; keys that are not fields (e.g. from other versions) are ignored."""
+        known = {key: value for key, value in data.items() if key in _FIELDS}
+        known["retry_delays"] = tuple(known.get("retry_delays", ()))
+        return Metrics(**known)
+
+
+_FIELDS = frozenset(field.name for field in fields(Metrics))
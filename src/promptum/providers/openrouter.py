@@ -1,18 +1,90 @@
 import asyncio
+import contextlib
 import time
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Any
 
 import httpx
 
+from promptum.providers.circuit import CircuitBreaker
 from promptum.providers.exceptions import (
+    ProviderCircuitOpenError,
     ProviderHTTPStatusError,
     ProviderNotInitializedError,
     ProviderResponseParseError,
     ProviderRetryExhaustedError,
     ProviderTransientError,
 )
+from promptum.providers.hedging import HedgingConfig, LatencyTracker
 from promptum.providers.metrics import Metrics
-from promptum.providers.retry import RetryConfig, RetryStrategy
+from promptum.providers.payload import CompiledRequest, decode_json, encode_json
+from promptum.providers.ratelimit import RateLimiter, estimate_tokens
+from promptum.providers.retry import RetryConfig
+
+
+class _PoolTimer:
+    """httpcore trace hook that records when a request gets a connection from the pool."""
+
+    def __init__(self) -> None:
+        self.start_time = time.perf_counter()
+        self.acquired_time: float | None = None
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        # The first connection-level event (connect_tcp for a new connection,
+        # send_request_headers for a reused one) happens right after the pool slot is granted.
+        if self.acquired_time is None and event_name.endswith(".started"):
+            self.acquired_time = time.perf_counter()
+
+    @property
+    def pool_wait_ms(self) -> float | None:
+        if self.acquired_time is None:
+            return None
+        return (self.acquired_time - self.start_time) * 1000
+
+    @property
+    def request_start_time(self) -> float:
+        return self.acquired_time if self.acquired_time is not None else self.start_time
+
+
+def _compile_key(
+    prompt: str,
+    model: str,
+    system_prompt: str | None,
+    temperature: float,
+    max_tokens: int | None,
+    kwargs: dict[str, Any],
+    stream: bool,
+    samples: int,
+) -> tuple[Any, ...] | None:
+    # `True`, `1` and `1.0` are equal keys but different JSON, so numbers carry their type.
+    key: tuple[Any, ...] = (
+        prompt,
+        model,
+        system_prompt,
+        type(temperature),
+        temperature,
+        type(max_tokens),
+        max_tokens,
+        stream,
+        samples,
+    )
+    if kwargs:
+        try:
+            key = (*key, *((name, _typed(value)) for name, value in sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return None
+    return key
+
+
+def _typed(value: Any) -> Any:
+    """`value` with the type of every nested value alongside it, for use in a request key."""
+    if isinstance(value, dict):
+        return dict, tuple((name, _typed(item)) for name, item in sorted(value.items()))
+    if isinstance(value, list | tuple):
+        return type(value), tuple(map(_typed, value))
+    return type(value), value
 
 
 class OpenRouterClient:
@@ -21,27 +93,73 @@ class OpenRouterClient:
         api_key: str,
         base_url: str = "https://openrouter.ai/api/v1",
         default_retry_config: RetryConfig | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        http_client: httpx.AsyncClient | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedging: HedgingConfig | None = None,
+        max_compiled: int = 4096,
     ):
         self.api_key = api_key
         self.base_url = base_url
         self.default_retry_config = default_retry_config or RetryConfig()
+        self.limits = limits
+        self.http2 = http2
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.latency_tracker = LatencyTracker(hedging.window_size if hedging else 200)
+        self.max_compiled = max_compiled
+        self._compiled: OrderedDict[tuple[Any, ...], CompiledRequest] = OrderedDict()
+        self._shared_client = http_client
         self._client: httpx.AsyncClient | None = None
+        self._url = f"{base_url.rstrip('/')}/chat/completions"
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
 
-    async def __aenter__(self) -> "OpenRouterClient":
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=self.default_retry_config.timeout,
+    @staticmethod
+    def create_http_client(
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        timeout: float = 60.0,
+    ) -> httpx.AsyncClient:
+        """Builds an HTTP client that several OpenRouterClient instances can share."""
+        return httpx.AsyncClient(
+            limits=limits or httpx.Limits(),
+            http2=http2,
+            timeout=timeout,
         )
+
+    async def __aenter__(self) -> "OpenRouterClient":
+        if self._shared_client is not None:
+            self._client = self._shared_client
+        else:
+            self._client = self.create_http_client(
+                self.limits, self.http2, self.default_retry_config.timeout
+            )
         return self
 
     async def __aexit__(self, *args: Any) -> None:
-        if self._client:
+        if self._client and self._client is not self._shared_client:
             await self._client.aclose()
 
+    async def warmup(self, connections: int = 1) -> None:
+        """Opens up to `connections` keep-alive connections before the first real request."""
+        if not self._client:
+            raise ProviderNotInitializedError()
+
+        url = f"{self.base_url.rstrip('/')}/models"
+        client = self._client
+
+        async def ping() -> None:
+            with contextlib.suppress(httpx.HTTPError):
+                await client.get(url, headers=self._headers)
+
+        await asyncio.gather(*(ping() for _ in range(connections)))
+
     async def generate(
         self,
         prompt: str,
@@ -52,14 +170,123 @@ class OpenRouterClient:
         retry_config: RetryConfig | None = None,
         **kwargs: Any,
     ) -> tuple[str, Metrics]:
-        if not self._client:
-            raise ProviderNotInitializedError()
+        request = self._compile(
+            prompt, model, system_prompt, temperature, max_tokens, kwargs, False
+        )
+        return await self.generate_compiled(request, retry_config)
 
-        config = retry_config or self.default_retry_config
-        retry_delays: list[float] = []
-        last_status_code: int = 0
-        last_response_body: str = ""
+    async def generate_samples(
+        self,
+        prompt: str,
+        model: str,
+        n: int,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        retry_config: RetryConfig | None = None,
+        **kwargs: Any,
+    ) -> tuple[list[str], Metrics]:
+        """Requests `n` choices in one call using the `n` parameter."""
+        request = self._compile(
+            prompt, model, system_prompt, temperature, max_tokens, kwargs, False, n
+        )
+        contents, metrics = await self._request(request, retry_config or self.default_retry_config)
+        if len(contents) != n:
+            raise ProviderResponseParseError(
+                ValueError(f"Expected {n} choices, got {len(contents)}")
+            )
+        return contents, metrics
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        retry_config: RetryConfig | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        request = self._compile(prompt, model, system_prompt, temperature, max_tokens, kwargs, True)
+        return await self.generate_compiled(request, retry_config)
+
+    async def generate_compiled(
+        self,
+        request: CompiledRequest,
+        retry_config: RetryConfig | None = None,
+    ) -> tuple[str, Metrics]:
+        contents, metrics = await self._request(request, retry_config or self.default_retry_config)
+        return contents[0], metrics
+
+    def compile(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        *,
+        stream: bool = False,
+        samples: int = 1,
+        **kwargs: Any,
+    ) -> CompiledRequest:
+        """Serializes a request once so retries and repeats send the same bytes."""
+        return self._compile(
+            prompt, model, system_prompt, temperature, max_tokens, kwargs, stream, samples
+        )
+
+    def _compile(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+        stream: bool,
+        samples: int = 1,
+    ) -> CompiledRequest:
+        key = None
+        if self.max_compiled > 0:
+            key = _compile_key(
+                prompt, model, system_prompt, temperature, max_tokens, kwargs, stream, samples
+            )
+        if key is not None:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
+
+        payload = self._build_payload(prompt, model, system_prompt, temperature, max_tokens, kwargs)
+        if stream:
+            payload["stream"] = True
+        if samples > 1:
+            payload["n"] = samples
+        compiled = CompiledRequest(
+            model=model,
+            body=encode_json(payload),
+            stream=stream,
+            # Every choice may use up to `max_tokens`; the prompt is only counted once.
+            estimated_tokens=estimate_tokens(prompt, system_prompt, max_tokens)
+            + (max_tokens or 0) * (samples - 1),
+            samples=samples,
+        )
+
+        if key is not None:
+            self._compiled[key] = compiled
+            if len(self._compiled) > self.max_compiled:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def _build_payload(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -72,44 +299,146 @@ class OpenRouterClient:
         }
         if max_tokens is not None:
             payload["max_tokens"] = max_tokens
-        reserved_keys: set[str] = {"model", "messages", "temperature", "max_tokens"}
+        reserved_keys: set[str] = {"model", "messages", "temperature", "max_tokens", "stream"}
         conflicts = reserved_keys.intersection(kwargs.keys())
         if conflicts:
             raise ValueError(
                 f"Cannot override reserved payload fields: {', '.join(sorted(conflicts))}"
-                )
+            )
         payload.update(kwargs)
+        return payload
 
+    async def _request(
+        self,
+        request: CompiledRequest,
+        config: RetryConfig,
+    ) -> tuple[list[str], Metrics]:
+        if not self._client:
+            raise ProviderNotInitializedError()
+        if self.circuit_breaker is None:
+            return await self._request_hedged(request, config)
+
+        model = request.model
+        self.circuit_breaker.before_request(model)
+        success: bool | None = None
+        try:
+            result = await self._request_hedged(request, config)
+            success = True
+            return result
+        except (ProviderTransientError, ProviderRetryExhaustedError):
+            success = False
+            raise
+        except ProviderHTTPStatusError as e:
+            # 4xx responses reflect the request, not the health of the model.
+            success = False if e.status_code >= 500 else None
+            raise
+        finally:
+            self.circuit_breaker.record(model, success)
+
+    async def _request_hedged(
+        self,
+        request: CompiledRequest,
+        config: RetryConfig,
+    ) -> tuple[list[str], Metrics]:
+        if self.hedging is None:
+            return await self._request_with_retries(request, config)
+
+        model = request.model
+        start_time = time.perf_counter()
+        hedge_delay = None
+        if self.latency_tracker.count(model) >= self.hedging.min_samples:
+            hedge_delay = self.latency_tracker.percentile(model, self.hedging.percentile)
+
+        if hedge_delay is None:
+            result = await self._request_with_retries(request, config)
+            self.latency_tracker.record(model, time.perf_counter() - start_time)
+            return result
+
+        primary = asyncio.create_task(self._request_with_retries(request, config))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=max(hedge_delay, self.hedging.min_delay))
+            if not done:
+                hedge = self._request_with_retries(request, config)
+                tasks.append(asyncio.create_task(hedge))
+
+            pending = set(tasks)
+            first_error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both copies finish in the same iteration.
+                for task in sorted(done, key=tasks.index):
+                    error = task.exception()
+                    if error is None:
+                        content, metrics = task.result()
+                        self.latency_tracker.record(model, time.perf_counter() - start_time)
+                        if len(tasks) > 1:
+                            metrics = replace(metrics, hedged=True, hedge_won=task is not primary)
+                        return content, metrics
+                    if first_error is None:
+                        first_error = error
+            assert first_error is not None
+            raise first_error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _request_with_retries(
+        self,
+        request: CompiledRequest,
+        config: RetryConfig,
+    ) -> tuple[list[str], Metrics]:
+        assert self._client is not None
+        retry_delays: list[float] = []
+        last_status_code: int = 0
+        last_response_body: str = ""
+        rate_limit_wait = 0.0
 
         for attempt in range(config.max_attempts):
-            start_time = time.perf_counter()
-            try:
-                response = await self._client.post(
-                    "/chat/completions",
-                    json=payload,
-                    timeout=config.timeout,
+            if attempt > 0 and self.circuit_breaker is not None:
+                # Other requests may have tripped the circuit while this one was backing off.
+                retry_after = self.circuit_breaker.retry_after(request.model)
+                if retry_after is not None:
+                    raise ProviderCircuitOpenError(request.model, retry_after)
+            if self.rate_limiter is not None:
+                rate_limit_wait += await self.rate_limiter.acquire(
+                    request.model, request.estimated_tokens
                 )
-
-                if response.status_code == 200:
-                    latency_ms = (time.perf_counter() - start_time) * 1000
-                    try:
-                        data = response.json()
-                        content = data["choices"][0]["message"]["content"]
-                    except (KeyError, IndexError, TypeError) as e:
-                        raise ProviderResponseParseError(e) from e
-
-                    usage = data.get("usage", {})
-                    metrics = Metrics(
-                        latency_ms=latency_ms,
-                        prompt_tokens=usage.get("prompt_tokens"),
-                        completion_tokens=usage.get("completion_tokens"),
-                        total_tokens=usage.get("total_tokens"),
-                        cost_usd=usage.get("cost") or usage.get("total_cost"),
-                        retry_delays=tuple(retry_delays),
+            timer = _PoolTimer()
+            try:
+                if request.stream:
+                    async with self._client.stream(
+                        "POST",
+                        self._url,
+                        content=request.body,
+                        headers=self._headers,
+                        timeout=config.timeout,
+                        extensions={"trace": timer},
+                    ) as response:
+                        if response.status_code == 200:
+                            content, metrics = await self._read_stream(
+                                response, timer, retry_delays
+                            )
+                            return [content], self._finish(
+                                metrics, request.model, request.estimated_tokens, rate_limit_wait
+                            )
+                        await response.aread()
+                else:
+                    response = await self._client.post(
+                        self._url,
+                        content=request.body,
+                        headers=self._headers,
+                        timeout=config.timeout,
+                        extensions={"trace": timer},
                     )
+                    if response.status_code == 200:
+                        contents, metrics = self._read_body(response, timer, retry_delays)
+                        return contents, self._finish(
+                            metrics, request.model, request.estimated_tokens, rate_limit_wait
+                        )
 
-                    return content, metrics
-
+                self._refund_tokens(request.model, request.estimated_tokens)
                 if response.status_code not in config.retryable_status_codes:
                     try:
                         response.raise_for_status()
@@ -127,24 +456,130 @@ class OpenRouterClient:
                     await self._sleep(delay)
 
             except (httpx.TimeoutException, httpx.NetworkError) as e:
+                self._refund_tokens(request.model, request.estimated_tokens)
                 if attempt < config.max_attempts - 1:
                     delay = self._calculate_delay(attempt, config)
                     retry_delays.append(delay)
                     await self._sleep(delay)
                 else:
-                    raise ProviderTransientError(
-                        config.max_attempts, retry_delays
-                    ) from e
+                    raise ProviderTransientError(config.max_attempts, retry_delays) from e
 
         raise ProviderRetryExhaustedError(
             config.max_attempts, last_status_code, last_response_body, retry_delays
         )
 
+    def _finish(
+        self,
+        metrics: Metrics,
+        model: str,
+        estimated_tokens: int,
+        rate_limit_wait: float,
+    ) -> Metrics:
+        if self.rate_limiter is None:
+            return metrics
+        if metrics.total_tokens is not None:
+            self.rate_limiter.reconcile(model, estimated_tokens, metrics.total_tokens)
+        return replace(metrics, rate_limit_wait_ms=rate_limit_wait * 1000)
+
+    def _refund_tokens(self, model: str, estimated_tokens: int) -> None:
+        # Rejected or failed attempts do not consume tokens on the provider side.
+        if self.rate_limiter is not None:
+            self.rate_limiter.reconcile(model, estimated_tokens, 0)
+
+    def _read_body(
+        self,
+        response: httpx.Response,
+        timer: _PoolTimer,
+        retry_delays: list[float],
+    ) -> tuple[list[str], Metrics]:
+        latency_ms = (time.perf_counter() - timer.request_start_time) * 1000
+        try:
+            data = decode_json(response.content)
+            choices = sorted(data["choices"], key=lambda choice: choice.get("index", 0))
+            contents = [choice["message"]["content"] for choice in choices]
+            if not contents:
+                raise IndexError("Response has no choices")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ProviderResponseParseError(e) from e
+
+        usage = data.get("usage", {})
+        metrics = Metrics(
+            latency_ms=latency_ms,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            total_tokens=usage.get("total_tokens"),
+            cost_usd=usage.get("cost") or usage.get("total_cost"),
+            retry_delays=tuple(retry_delays),
+            pool_wait_ms=timer.pool_wait_ms,
+        )
+        return contents, metrics
+
+    async def _read_stream(
+        self,
+        response: httpx.Response,
+        timer: _PoolTimer,
+        retry_delays: list[float],
+    ) -> tuple[str, Metrics]:
+        start_time = timer.request_start_time
+        parts: list[str] = []
+        usage: dict[str, Any] = {}
+        first_token_time: float | None = None
+        last_token_time: float | None = None
+
+        try:
+            async for line in response.aiter_lines():
+                # SSE comments (": OPENROUTER PROCESSING") and blank separators carry no data.
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = decode_json(data)
+                usage = chunk.get("usage") or usage
+                choices = chunk.get("choices")
+                if not choices:
+                    continue
+                delta = choices[0]["delta"].get("content")
+                if delta:
+                    last_token_time = time.perf_counter()
+                    if first_token_time is None:
+                        first_token_time = last_token_time
+                    parts.append(delta)
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            raise ProviderResponseParseError(e) from e
+
+        end_time = time.perf_counter()
+        completion_tokens = usage.get("completion_tokens")
+
+        time_to_first_token_ms = None
+        inter_token_latency_ms = None
+        tokens_per_second = None
+        if first_token_time is not None and last_token_time is not None:
+            time_to_first_token_ms = (first_token_time - start_time) * 1000
+            if len(parts) > 1:
+                inter_token_latency_ms = (
+                    (last_token_time - first_token_time) * 1000 / (len(parts) - 1)
+                )
+            generation_time = end_time - first_token_time
+            if generation_time > 0:
+                tokens_per_second = (completion_tokens or len(parts)) / generation_time
+
+        metrics = Metrics(
+            latency_ms=(end_time - start_time) * 1000,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=completion_tokens,
+            total_tokens=usage.get("total_tokens"),
+            cost_usd=usage.get("cost") or usage.get("total_cost"),
+            retry_delays=tuple(retry_delays),
+            time_to_first_token_ms=time_to_first_token_ms,
+            inter_token_latency_ms=inter_token_latency_ms,
+            tokens_per_second=tokens_per_second,
+            pool_wait_ms=timer.pool_wait_ms,
+        )
+        return "".join(parts), metrics
+
     async def _sleep(self, delay: float) -> None:
         await asyncio.sleep(delay)
 
     def _calculate_delay(self, attempt: int, config: RetryConfig) -> float:
-        if config.strategy == RetryStrategy.EXPONENTIAL_BACKOFF:
-            delay = config.initial_delay * (config.exponential_base**attempt)
-            return min(delay, config.max_delay)
-        return config.initial_delay
+        return config.delay(attempt)
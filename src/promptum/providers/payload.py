@@ -0,0 +1,34 @@
+import json
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import orjson  # ty: ignore[unresolved-import]
+
+    JSON_BACKEND = "orjson"
+
+    def encode_json(data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def decode_json(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+except ModuleNotFoundError:
+    JSON_BACKEND = "json"
+
+    def encode_json(data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def decode_json(data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRequest:
+    """A chat completion request serialized once and reused for every attempt."""
+
+    model: str
+    body: bytes
+    stream: bool = False
+    estimated_tokens: int = 0
+    samples: int = 1
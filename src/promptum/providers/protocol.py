@@ -1,7 +1,12 @@
-from typing import Any, Protocol
+from contextvars import ContextVar
+from typing import Any, Protocol, runtime_checkable
 
 from promptum.providers.metrics import Metrics
 
+# Which sample of a prompt the current request is for. Repeated samples send identical
+# requests, so wrappers that replay responses use this to keep them apart.
+SAMPLE_INDEX: ContextVar[int] = ContextVar("sample_index", default=0)
+
 
 class LLMProvider(Protocol):
     async def generate(
@@ -20,3 +25,44 @@ class LLMProvider(Protocol):
             (response_text, metrics)
         """
         ...
+
+
+@runtime_checkable
+class StreamingLLMProvider(LLMProvider, Protocol):
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        """
+        Generates a response by consuming the token stream as it arrives.
+
+        Returns:
+            (response_text, metrics) with the time-to-first-token fields populated
+        """
+        ...
+
+
+@runtime_checkable
+class SamplingLLMProvider(LLMProvider, Protocol):
+    async def generate_samples(
+        self,
+        prompt: str,
+        model: str,
+        n: int,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[list[str], Metrics]:
+        """
+        Generates `n` independent responses to the same prompt in a single request.
+
+        Returns:
+            (responses, metrics) where `metrics` covers the whole request
+        """
+        ...
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+
+
+def estimate_tokens(prompt: str, system_prompt: str | None, max_tokens: int | None) -> int:
+    """Rough upper estimate of the tokens a request will consume (~4 characters per token)."""
+    characters = len(prompt) + len(system_prompt or "")
+    return characters // 4 + 1 + (max_tokens or 0)
+
+
+def _scale(limit: RateLimit, factor: float) -> RateLimit:
+    return RateLimit(
+        requests_per_minute=limit.requests_per_minute and limit.requests_per_minute * factor,
+        tokens_per_minute=limit.tokens_per_minute and limit.tokens_per_minute * factor,
+    )
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = per_minute
+        self.refill_per_second = per_minute / 60
+        self.available = per_minute
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self.updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        # Requests larger than the bucket could never fit; let them through once it is full.
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+
+class _ModelBuckets:
+    def __init__(self, limit: RateLimit, now: float):
+        self.requests = (
+            _TokenBucket(limit.requests_per_minute, now) if limit.requests_per_minute else None
+        )
+        self.tokens = (
+            _TokenBucket(limit.tokens_per_minute, now) if limit.tokens_per_minute else None
+        )
+        self.lock = asyncio.Lock()
+
+
+class RateLimiter:
+    """
+    Per-model token buckets for requests and tokens per minute.
+
+    Share one instance between providers (or sessions) that hit the same account so
+    they draw from a common budget.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, RateLimit] | None = None,
+        default: RateLimit | None = None,
+    ):
+        self.limits = dict(limits or {})
+        self.default = default
+        self._buckets: dict[str, _ModelBuckets | None] = {}
+
+    async def acquire(self, model: str, tokens: int = 0) -> float:
+        """Waits until `model` has budget for one request of `tokens` tokens. Returns the wait."""
+        buckets = self._get_buckets(model)
+        if buckets is None:
+            return 0.0
+
+        start = self._now()
+        # Waiters queue on the lock, so budget is handed out in arrival order.
+        async with buckets.lock:
+            while True:
+                now = self._now()
+                wait = 0.0
+                for bucket, amount in ((buckets.requests, 1), (buckets.tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.seconds_until(amount))
+                if wait <= 0:
+                    break
+                await self._sleep(wait)
+
+            if buckets.requests is not None:
+                buckets.requests.available -= 1
+            if buckets.tokens is not None:
+                buckets.tokens.available -= min(tokens, buckets.tokens.capacity)
+
+        return self._now() - start
+
+    def partition(self, count: int) -> "RateLimiter":
+        """
+        Returns a limiter with `1/count` of every budget.
+
+        Give one to each of `count` processes that share an account, so together they stay
+        within the limits without coordinating.
+        """
+        return RateLimiter(
+            {model: _scale(limit, 1 / count) for model, limit in self.limits.items()},
+            _scale(self.default, 1 / count) if self.default else None,
+        )
+
+    def reconcile(self, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """Corrects the token budget once the real usage of a request is known."""
+        buckets = self._get_buckets(model)
+        if buckets is None or buckets.tokens is None:
+            return
+        # The balance may go negative; later requests then wait for the overdraft to refill.
+        buckets.tokens.available -= actual_tokens - estimated_tokens
+        buckets.tokens.available = min(buckets.tokens.available, buckets.tokens.capacity)
+
+    def _get_buckets(self, model: str) -> _ModelBuckets | None:
+        if model not in self._buckets:
+            limit = self.limits.get(model, self.default)
+            self._buckets[model] = _ModelBuckets(limit, self._now()) if limit else None
+        return self._buckets[model]
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    async def _sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
@@ -17,3 +17,9 @@ class RetryConfig:
     exponential_base: float = 2.0
     retryable_status_codes: Sequence[int] = (429, 500, 502, 503, 504)
     timeout: float = 60.0
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the failed attempt number `attempt` (starting at 0)."""
+        if self.strategy == RetryStrategy.EXPONENTIAL_BACKOFF:
+            return min(self.initial_delay * (self.exponential_base**attempt), self.max_delay)
+        return self.initial_delay
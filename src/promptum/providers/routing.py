@@ -0,0 +1,146 @@
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any
+
+from promptum.providers.exceptions import (
+    ProviderCircuitOpenError,
+    ProviderRetryExhaustedError,
+    ProviderTransientError,
+)
+from promptum.providers.metrics import Metrics
+from promptum.providers.protocol import LLMProvider, StreamingLLMProvider
+
+# Errors that say the backend is unavailable rather than that the request is bad.
+_FAILOVER_ERRORS = (ProviderRetryExhaustedError, ProviderTransientError, ProviderCircuitOpenError)
+
+
+class RoutingStrategy(Enum):
+    LEAST_OUTSTANDING = "least_outstanding"
+    WEIGHTED = "weighted"
+
+
+@dataclass(frozen=True, slots=True)
+class Backend:
+    name: str
+    provider: LLMProvider
+    weight: float = 1.0
+
+
+class RoutingProvider:
+    """
+    Spreads requests over several providers and fails over when one is unavailable.
+
+    LEAST_OUTSTANDING sends each request to the backend with the fewest requests in flight
+    relative to its weight; WEIGHTED uses smooth weighted round-robin. A request that fails
+    with a retry-exhausted, transient or circuit-open error is retried on the next backend.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[Backend],
+        strategy: RoutingStrategy = RoutingStrategy.LEAST_OUTSTANDING,
+    ):
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        names = [backend.name for backend in backends]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Backend names must be unique: {names}")
+        if any(backend.weight <= 0 for backend in backends):
+            raise ValueError("Backend weights must be positive")
+
+        self.backends = tuple(backends)
+        self.strategy = strategy
+        self._outstanding = dict.fromkeys(names, 0)
+        self._current_weights = dict.fromkeys(names, 0.0)
+        self._next = 0
+
+    def outstanding(self, name: str) -> int:
+        return self._outstanding[name]
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        return await self._route(
+            lambda provider: provider.generate,
+            prompt,
+            model,
+            system_prompt,
+            temperature,
+            max_tokens,
+            kwargs,
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str | None = None,
+        temperature: float = 1.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        def select(provider: LLMProvider) -> Callable[..., Awaitable[tuple[str, Metrics]]]:
+            if isinstance(provider, StreamingLLMProvider):
+                return provider.generate_stream
+            return provider.generate
+
+        return await self._route(
+            select, prompt, model, system_prompt, temperature, max_tokens, kwargs
+        )
+
+    async def _route(
+        self,
+        select: Callable[[LLMProvider], Callable[..., Awaitable[tuple[str, Metrics]]]],
+        prompt: str,
+        model: str,
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> tuple[str, Metrics]:
+        remaining = list(self.backends)
+        while True:
+            backend = self._pick(remaining)
+            remaining.remove(backend)
+            self._outstanding[backend.name] += 1
+            try:
+                content, metrics = await select(backend.provider)(
+                    prompt=prompt,
+                    model=model,
+                    system_prompt=system_prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                )
+            except _FAILOVER_ERRORS:
+                if not remaining:
+                    raise
+                continue
+            finally:
+                self._outstanding[backend.name] -= 1
+            return content, replace(metrics, backend=backend.name)
+
+    def _pick(self, candidates: list[Backend]) -> Backend:
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if self.strategy is RoutingStrategy.WEIGHTED:
+            total = sum(backend.weight for backend in candidates)
+            for backend in candidates:
+                self._current_weights[backend.name] += backend.weight
+            chosen = max(candidates, key=lambda b: self._current_weights[b.name])
+            self._current_weights[chosen.name] -= total
+            return chosen
+
+        # Rotate the starting point so ties do not always land on the first backend.
+        start = self._next % len(candidates)
+        self._next += 1
+        rotated = candidates[start:] + candidates[:start]
+        return min(rotated, key=lambda b: self._outstanding[b.name] / b.weight)
@@ -1,8 +1,39 @@
-from promptum.session.case import Prompt
+from promptum.session.budget import Budget
+from promptum.session.case import Prompt, Resume
+from promptum.session.concurrency import AdaptiveConcurrency, AdaptiveLimiter
+from promptum.session.journal import Journal, JournaledValidator, prompt_key
+from promptum.session.live import LiveSummary
 from promptum.session.report import Report
 from promptum.session.result import TestResult
 from promptum.session.runner import Runner
+from promptum.session.scheduling import FairScheduling
 from promptum.session.session import Session
+from promptum.session.sharding import Shard
+from promptum.session.sketch import QuantileSketch
+from promptum.session.stats import PromptStats, pass_at_k
+from promptum.session.stopping import EarlyStopping, wilson_interval
 from promptum.session.summary import Summary
 
-__all__ = ["Prompt", "Report", "Runner", "Session", "Summary", "TestResult"]
+__all__ = [
+    "AdaptiveConcurrency",
+    "AdaptiveLimiter",
+    "Budget",
+    "EarlyStopping",
+    "FairScheduling",
+    "Journal",
+    "JournaledValidator",
+    "LiveSummary",
+    "Prompt",
+    "PromptStats",
+    "QuantileSketch",
+    "Report",
+    "Resume",
+    "Runner",
+    "Session",
+    "Shard",
+    "Summary",
+    "TestResult",
+    "pass_at_k",
+    "prompt_key",
+    "wilson_interval",
+]
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from promptum.session.case import Prompt
+from promptum.session.result import TestResult
+
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    max_cost_usd: float | None = None
+    max_tokens: int | None = None
+    max_duration_s: float | None = None
+
+    def partition(self, count: int) -> "Budget":
+        """Splits the cost and token budgets `count` ways; the deadline applies to every part."""
+        return Budget(
+            max_cost_usd=self.max_cost_usd / count if self.max_cost_usd is not None else None,
+            max_tokens=self.max_tokens // count if self.max_tokens is not None else None,
+            max_duration_s=self.max_duration_s,
+        )
+
+
+def skipped_result(test_case: Prompt, sample_index: int = 0) -> TestResult:
+    return TestResult(
+        test_case=test_case,
+        response=None,
+        passed=False,
+        metrics=None,
+        validation_details={},
+        skipped=True,
+        sample_index=sample_index,
+    )
+
+
+Execute = Callable[[Prompt, Sequence[int]], Awaitable[tuple[list[TestResult], Exception | None]]]
+
+
+async def run_cancellable(
+    test_case: Prompt,
+    samples: Sequence[int],
+    execute: Execute,
+    in_flight: set[asyncio.Future[tuple[list[TestResult], Exception | None]]],
+    cancelling: Callable[[], bool],
+) -> tuple[list[TestResult], Exception | None]:
+    """
+    Runs `execute` as a task kept in `in_flight`, so its owner can cancel it.
+
+    A cancellation made while `cancelling()` holds reports the samples as skipped; any other
+    cancellation propagates.
+    """
+    task = asyncio.ensure_future(execute(test_case, samples))
+    in_flight.add(task)
+    try:
+        return await task
+    except asyncio.CancelledError:
+        current = asyncio.current_task()
+        # Only swallow the cancellation the owner caused, not one aimed at the caller.
+        if not (cancelling() and task.cancelled()) or (current and current.cancelling()):
+            raise
+        return [skipped_result(test_case, i) for i in samples], None
+    finally:
+        in_flight.discard(task)
+
+
+class BudgetTracker:
+    """
+    Tracks spend against a `Budget` while a run is in progress.
+
+    Once any limit is reached, requests still in flight are cancelled and every later test
+    is skipped without calling the provider.
+    """
+
+    def __init__(self, budget: Budget, on_exhaust: Callable[[], None] | None = None):
+        self.budget = budget
+        self.on_exhaust = on_exhaust
+        self.cost_usd = 0.0
+        self.tokens = 0
+        self.exhausted = False
+        self._started = time.monotonic()
+        self._in_flight: set[asyncio.Future[tuple[list[TestResult], Exception | None]]] = set()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self._started
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        if self.budget.max_duration_s is not None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.budget.max_duration_s, self.exhaust)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def exhaust(self) -> None:
+        self.exhausted = True
+        for task in self._in_flight:
+            task.cancel()
+        if self.on_exhaust is not None:
+            self.on_exhaust()
+
+    async def run(
+        self, test_case: Prompt, samples: Sequence[int], execute: Execute
+    ) -> tuple[list[TestResult], Exception | None]:
+        if self.exhausted:
+            return [skipped_result(test_case, i) for i in samples], None
+
+        results, error = await run_cancellable(
+            test_case, samples, execute, self._in_flight, lambda: self.exhausted
+        )
+        for result in results:
+            self.record(result)
+        return results, error
+
+    def record(self, result: TestResult) -> None:
+        metrics = result.metrics
+        if metrics is None or metrics.cached or metrics.coalesced:
+            return
+        self.cost_usd += metrics.cost_usd or 0
+        self.tokens += metrics.total_tokens or 0
+
+        budget = self.budget
+        if (budget.max_cost_usd is not None and self.cost_usd >= budget.max_cost_usd) or (
+            budget.max_tokens is not None and self.tokens >= budget.max_tokens
+        ):
+            self.exhaust()
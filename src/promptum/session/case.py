@@ -20,3 +20,27 @@ class Prompt:
     max_tokens: int | None = None
     retry_config: RetryConfig | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    samples: int = 1
+
+    def __post_init__(self):
+        if self.samples < 1:
+            raise ValueError(f"samples must be at least 1, got {self.samples}")
+
+
+@dataclass(frozen=True, slots=True)
+class Resume:
+    """
+    Progress of a prompt from an earlier, interrupted run.
+
+    `samples` are the sample indices still without a result; `completed` and `passed` count
+    the ones that have one, so early stopping can carry on from them.
+    """
+
+    samples: tuple[int, ...]
+    completed: int = 0
+    passed: int = 0
+
+
+def remaining_samples(test_case: Prompt, resume: Resume | None) -> Sequence[int]:
+    """The sample indices of `test_case` to run; all of them without `resume`."""
+    return range(test_case.samples) if resume is None else resume.samples
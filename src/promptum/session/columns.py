@@ -0,0 +1,377 @@
+from collections.abc import Sequence, Set
+from dataclasses import dataclass
+from itertools import chain, compress
+from operator import itemgetter
+from typing import Any
+
+from promptum.session.budget import Budget
+from promptum.session.result import TestResult
+from promptum.session.sketch import QuantileSketch
+from promptum.session.summary import Summary
+
+# NumPy arrays when installed; `bytes` masks and lists of the row values otherwise.
+Column = Any
+
+
+class _ListBackend:
+    """Column operations on `bytes` masks and plain lists, for installs without NumPy."""
+
+    name = "list"
+    _FLIP = bytes([1, 0]) + bytes(range(2, 256))
+
+    @staticmethod
+    def mask(values: list[bool]) -> Column:
+        return bytes(values)
+
+    @staticmethod
+    def floats(values: list[float]) -> Column:
+        return values
+
+    @staticmethod
+    def ints(values: list[int]) -> Column:
+        return values
+
+    @staticmethod
+    def ragged(rows: list[tuple[int, ...]]) -> Column:
+        return rows
+
+    @staticmethod
+    def count(mask: Column) -> int:
+        return mask.count(1)
+
+    @staticmethod
+    def and_(mask: Column, other: Column) -> Column:
+        # Every byte is 0 or 1, so a bitwise AND of the whole masks is an elementwise AND.
+        return (int.from_bytes(mask) & int.from_bytes(other)).to_bytes(len(mask))
+
+    @staticmethod
+    def not_(mask: Column) -> Column:
+        return mask.translate(_ListBackend._FLIP)
+
+    @staticmethod
+    def equals(codes: Column, code: int) -> Column:
+        return bytes(map(code.__eq__, codes))
+
+    @staticmethod
+    def where(mask: Column) -> list[int]:
+        return list(compress(range(len(mask)), mask))
+
+    @staticmethod
+    def take(column: Column, indices: list[int]) -> Column:
+        if len(indices) < 2:
+            taken = [column[i] for i in indices]
+        else:
+            taken = list(itemgetter(*indices)(column))
+        return bytes(taken) if isinstance(column, bytes) else taken
+
+    @staticmethod
+    def take_ragged(column: Column, indices: list[int]) -> Column:
+        return _ListBackend.take(column, indices)
+
+    @staticmethod
+    def selected(values: Column, mask: Column) -> Column:
+        return list(compress(values, mask))
+
+    @staticmethod
+    def sum(values: Column) -> float:
+        return sum(values)
+
+    @staticmethod
+    def has_any(column: Column, wanted: Set[int]) -> Column:
+        # Rows share the code tuple of their prompt, so each distinct tuple is tested once.
+        hits = {row: not wanted.isdisjoint(row) for row in set(column)}
+        return bytes(map(hits.__getitem__, column))
+
+    @staticmethod
+    def group(codes: Column, count: int) -> list[list[int]]:
+        groups: list[list[int]] = [[] for _ in range(count)]
+        appends = [group.append for group in groups]
+        for row, code in enumerate(codes):
+            appends[code](row)
+        return groups
+
+    @staticmethod
+    def group_ragged(column: Column, count: int) -> list[list[int]]:
+        groups: list[list[int]] = [[] for _ in range(count)]
+        appends = [group.append for group in groups]
+        for row, codes in enumerate(column):
+            for code in codes:
+                appends[code](row)
+        return groups
+
+
+BACKENDS: dict[str, Any] = {"list": _ListBackend}
+
+try:
+    import numpy as np
+
+    class _NumpyBackend:
+        """Column operations on NumPy arrays; tags are a CSR pair of offsets and codes."""
+
+        name = "numpy"
+
+        @staticmethod
+        def mask(values: list[bool]) -> Column:
+            return np.array(values, dtype=bool)
+
+        @staticmethod
+        def floats(values: list[float]) -> Column:
+            return np.array(values, dtype=np.float64)
+
+        @staticmethod
+        def ints(values: list[int]) -> Column:
+            return np.array(values, dtype=np.int64)
+
+        @staticmethod
+        def ragged(rows: list[tuple[int, ...]]) -> Column:
+            # Row `i` owns `codes[offsets[i]:offsets[i + 1]]`.
+            offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter(map(len, rows), dtype=np.int64, count=len(rows)), out=offsets[1:])
+            return offsets, np.fromiter(chain.from_iterable(rows), dtype=np.int64)
+
+        @staticmethod
+        def count(mask: Column) -> int:
+            return int(np.count_nonzero(mask))
+
+        @staticmethod
+        def and_(mask: Column, other: Column) -> Column:
+            return mask & other
+
+        @staticmethod
+        def not_(mask: Column) -> Column:
+            return ~mask
+
+        @staticmethod
+        def equals(codes: Column, code: int) -> Column:
+            return codes == code
+
+        @staticmethod
+        def where(mask: Column) -> list[int]:
+            return np.flatnonzero(mask).tolist()
+
+        @staticmethod
+        def take(column: Column, indices: list[int]) -> Column:
+            return column[np.asarray(indices, dtype=np.int64)]
+
+        @staticmethod
+        def take_ragged(column: Column, indices: list[int]) -> Column:
+            offsets, codes = column
+            index = np.asarray(indices, dtype=np.int64)
+            lengths = np.diff(offsets)[index]
+            taken = np.zeros(len(index) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=taken[1:])
+            # Position of every kept code in the old flat array, without a Python loop.
+            shift = np.repeat(offsets[:-1][index] - taken[:-1], lengths)
+            return taken, codes[shift + np.arange(taken[-1])]
+
+        @staticmethod
+        def selected(values: Column, mask: Column) -> Column:
+            return values[mask]
+
+        @staticmethod
+        def sum(values: Column) -> float:
+            return values.sum().item()
+
+        @staticmethod
+        def has_any(column: Column, wanted: Set[int]) -> Column:
+            offsets, codes = column
+            mask = np.zeros(len(offsets) - 1, dtype=bool)
+            mask[_NumpyBackend.rows_of(offsets)[np.isin(codes, list(wanted))]] = True
+            return mask
+
+        @staticmethod
+        def rows_of(offsets: Column) -> Column:
+            return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+        @staticmethod
+        def split(codes: Column, rows: Column, count: int) -> list[list[int]]:
+            if count == 0:
+                return []
+            order = np.argsort(codes, kind="stable")
+            bounds = np.cumsum(np.bincount(codes, minlength=count))[:-1]
+            return [group.tolist() for group in np.split(rows[order], bounds)]
+
+        @staticmethod
+        def group(codes: Column, count: int) -> list[list[int]]:
+            return _NumpyBackend.split(codes, np.arange(len(codes)), count)
+
+        @staticmethod
+        def group_ragged(column: Column, count: int) -> list[list[int]]:
+            offsets, codes = column
+            return _NumpyBackend.split(codes, _NumpyBackend.rows_of(offsets), count)
+
+    BACKENDS["numpy"] = _NumpyBackend
+
+except ModuleNotFoundError:
+    pass
+
+# The fastest available backend; new columns are built with it.
+_backend: Any = BACKENDS.get("numpy", _ListBackend)
+COLUMN_BACKEND: str = _backend.name
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ResultColumns:
+    """
+    Columnar copy of a sequence of `TestResult`s.
+
+    Flags, latency, cost and tokens get one column each; models and tags are stored as
+    integer codes into `models` and `tags`, with `tag_codes` holding every row's tag codes.
+    Summaries, filters and group-bys work on these columns and never touch the rows.
+    `backend` holds the column operations for the kind of arrays the columns were built as.
+    """
+
+    size: int
+    passed: Column
+    skipped: Column
+    errored: Column
+    cached: Column
+    live: Column
+    billed: Column
+    latency_ms: Column
+    cost_usd: Column
+    total_tokens: Column
+    model: Column
+    models: tuple[str, ...]
+    tag_codes: Column
+    tags: tuple[str, ...]
+    backend: Any
+
+    @staticmethod
+    def from_results(results: Sequence[TestResult]) -> "ResultColumns":
+        metrics = [r.metrics for r in results]
+        models: dict[str, int] = {}
+        tags: dict[str, int] = {}
+        # Samples of one prompt share its codes, so each prompt is encoded once.
+        codes: dict[int, tuple[int, tuple[int, ...]]] = {}
+
+        def encode(result: TestResult) -> tuple[int, tuple[int, ...]]:
+            test_case = result.test_case
+            key = id(test_case)
+            if key not in codes:
+                codes[key] = (
+                    models.setdefault(test_case.model, len(models)),
+                    tuple(tags.setdefault(tag, len(tags)) for tag in test_case.tags),
+                )
+            return codes[key]
+
+        encoded = [encode(r) for r in results]
+        b = _backend
+
+        return ResultColumns(
+            size=len(results),
+            passed=b.mask([r.passed for r in results]),
+            skipped=b.mask([r.skipped for r in results]),
+            errored=b.mask([r.execution_error is not None for r in results]),
+            cached=b.mask([m is not None and m.cached for m in metrics]),
+            # Cached replays cost nothing and their latency is a local lookup.
+            live=b.mask([m is not None and not m.cached for m in metrics]),
+            # Coalesced results waited for a real request whose cost is counted once.
+            billed=b.mask([m is not None and not m.cached and not m.coalesced for m in metrics]),
+            latency_ms=b.floats([m.latency_ms if m is not None else 0.0 for m in metrics]),
+            cost_usd=b.floats([(m.cost_usd or 0.0) if m is not None else 0.0 for m in metrics]),
+            total_tokens=b.ints([(m.total_tokens or 0) if m is not None else 0 for m in metrics]),
+            model=b.ints([model for model, _ in encoded]),
+            models=tuple(models),
+            tag_codes=b.ragged([row for _, row in encoded]),
+            tags=tuple(tags),
+            backend=b,
+        )
+
+    def take(self, indices: list[int]) -> "ResultColumns":
+        """The rows at `indices`, in that order; `models` and `tags` are shared."""
+        b = self.backend
+        return ResultColumns(
+            size=len(indices),
+            passed=b.take(self.passed, indices),
+            skipped=b.take(self.skipped, indices),
+            errored=b.take(self.errored, indices),
+            cached=b.take(self.cached, indices),
+            live=b.take(self.live, indices),
+            billed=b.take(self.billed, indices),
+            latency_ms=b.take(self.latency_ms, indices),
+            cost_usd=b.take(self.cost_usd, indices),
+            total_tokens=b.take(self.total_tokens, indices),
+            model=b.take(self.model, indices),
+            models=self.models,
+            tag_codes=b.take_ragged(self.tag_codes, indices),
+            tags=self.tags,
+            backend=b,
+        )
+
+    def select(
+        self,
+        model: str | None = None,
+        tags: Sequence[str] | None = None,
+        passed: bool | None = None,
+    ) -> list[int]:
+        """Indices of the rows matching every given criterion."""
+        b = self.backend
+        masks = []
+        if model is not None:
+            if model not in self.models:
+                return []
+            masks.append(b.equals(self.model, self.models.index(model)))
+        if tags is not None:
+            tag_set = set(tags)
+            wanted = {code for code, tag in enumerate(self.tags) if tag in tag_set}
+            masks.append(b.has_any(self.tag_codes, wanted))
+        if passed is not None:
+            masks.append(self.passed if passed else b.not_(self.passed))
+        if not masks:
+            return list(range(self.size))
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = b.and_(mask, other)
+        return b.where(mask)
+
+    def groups(self, by: str) -> dict[str, list[int]]:
+        """
+        Row indices per model, or per tag (a row is in the group of each of its tags).
+
+        Groups come in the order their model or tag first appears.
+        """
+        b = self.backend
+        if by == "model":
+            names, groups = self.models, b.group(self.model, len(self.models))
+        elif by == "tag":
+            names, groups = self.tags, b.group_ragged(self.tag_codes, len(self.tags))
+        else:
+            raise ValueError(f"Cannot group by {by!r}; use 'model', 'tag' or a callable")
+        return {name: group for name, group in zip(names, groups, strict=True) if group}
+
+    def summarize(self, budget: Budget | None = None) -> Summary:
+        b = self.backend
+        total = self.size
+        passed = b.count(self.passed)
+        skipped = b.count(self.skipped)
+        executed = total - skipped
+        execution_errors = b.count(self.errored)
+        validation_failures = b.count(
+            b.and_(b.and_(b.not_(self.passed), b.not_(self.errored)), b.not_(self.skipped))
+        )
+
+        latencies = b.selected(self.latency_ms, self.live)
+        costs = b.selected(self.cost_usd, self.billed)
+        latency = QuantileSketch.of(latencies)
+        live = latency.count
+
+        return Summary(
+            total=total,
+            passed=passed,
+            failed=execution_errors + validation_failures,
+            pass_rate=passed / executed if executed > 0 else 0,
+            avg_latency_ms=latency.avg,
+            min_latency_ms=latency.min if live else 0,
+            max_latency_ms=latency.max if live else 0,
+            total_cost_usd=b.sum(costs),
+            total_tokens=int(b.sum(b.selected(self.total_tokens, self.billed))),
+            execution_errors=execution_errors,
+            validation_failures=validation_failures,
+            cached=b.count(self.cached),
+            coalesced=live - len(costs),
+            skipped=skipped,
+            budget=budget,
+            latency_sketch=latency,
+            cost_sketch=QuantileSketch.of(costs),
+        )
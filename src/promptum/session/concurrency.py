@@ -0,0 +1,103 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class AdaptiveConcurrency:
+    min_concurrent: int = 1
+    max_concurrent: int = 64
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    latency_spike_factor: float = 2.0
+    latency_smoothing: float = 0.1
+    min_latency_samples: int = 10
+
+
+class AdaptiveLimiter:
+    """
+    Semaphore whose limit follows additive-increase/multiplicative-decrease.
+
+    The limit grows by `additive_increase` per window of healthy completions and is cut
+    by `multiplicative_decrease` on overload. Overload signals from requests already in
+    flight at the last cut are ignored, so one burst backs off only once.
+    """
+
+    def __init__(self, config: AdaptiveConcurrency, initial_limit: int):
+        self.config = config
+        self._limit = float(min(max(initial_limit, config.min_concurrent), config.max_concurrent))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._baseline_ms: float | None = None
+        self._latency_samples = 0
+        self._stale_in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation; pass it on.
+                self._in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency_ms: float | None = None, overloaded: bool = False) -> None:
+        self._in_flight -= 1
+        self._record(latency_ms, overloaded)
+        self._wake()
+
+    def _record(self, latency_ms: float | None, overloaded: bool) -> None:
+        config = self.config
+        spike = (
+            latency_ms is not None
+            and self._baseline_ms is not None
+            and self._latency_samples >= config.min_latency_samples
+            and latency_ms > self._baseline_ms * config.latency_spike_factor
+        )
+
+        if latency_ms is not None:
+            self._latency_samples += 1
+            if self._baseline_ms is None:
+                self._baseline_ms = latency_ms
+            else:
+                self._baseline_ms += config.latency_smoothing * (latency_ms - self._baseline_ms)
+
+        if self._stale_in_flight > 0:
+            self._stale_in_flight -= 1
+            if overloaded or spike:
+                return
+
+        if overloaded or spike:
+            self._limit = max(
+                float(config.min_concurrent), self._limit * config.multiplicative_decrease
+            )
+            self._stale_in_flight = self._in_flight
+        else:
+            self._limit = min(
+                float(config.max_concurrent),
+                self._limit + config.additive_increase / self._limit,
+            )
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
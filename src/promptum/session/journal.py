@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from promptum.providers.metrics import Metrics
+from promptum.session.case import Prompt, Resume
+from promptum.session.report import Report
+from promptum.session.result import TestResult
+from promptum.session.stopping import EarlyStopping
+
+
+def prompt_key(prompt: Prompt) -> str:
+    """Returns a stable SHA-256 hex digest identifying a prompt across runs."""
+    identity = {
+        "name": prompt.name,
+        "prompt": prompt.prompt,
+        "model": prompt.model,
+        "system_prompt": prompt.system_prompt,
+        "temperature": prompt.temperature,
+        "max_tokens": prompt.max_tokens,
+    }
+    encoded = json.dumps(identity, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class JournaledValidator:
+    """
+    Stand-in for a validator that is not available when a journal is loaded on its own.
+
+    It keeps the original description but cannot judge a response, so running its prompt
+    again gives a failed result saying so.
+    """
+
+    description: str
+
+    def validate(self, response: str) -> tuple[bool, dict[str, Any]]:
+        return False, {"error": "Journaled validators cannot re-validate a response"}
+
+    def describe(self) -> str:
+        return self.description
+
+
+class Journal:
+    """
+    Append-only JSONL log of completed test results.
+
+    Each result is written as one line and flushed as soon as it completes, so a crashed
+    or interrupted run can be resumed. Reading streams the file line by line.
+    """
+
+    def __init__(self, path: str | Path, fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self._file: IO[str] | None = None
+
+    def completed(self) -> Counter[str]:
+        """Counts journaled results per `prompt_key`."""
+        return Counter(record["key"] for record in self._records())
+
+    def pending(
+        self, prompts: Iterable[Prompt], early_stopping: EarlyStopping | None = None
+    ) -> list[tuple[Prompt, Resume]]:
+        """
+        Returns the prompts that still lack journaled results (duplicates count separately).
+
+        Each comes back unchanged, with a `Resume` listing the sample indices it is missing
+        and how many of its journaled samples passed. With `early_stopping`, prompts whose
+        journaled samples already decide them are done.
+        """
+        # Results of the same sample of a prompt added twice are used one per copy.
+        journaled: defaultdict[tuple[str, int], list[bool]] = defaultdict(list)
+        for record in self._records():
+            journaled[record["key"], record.get("sample_index", 0)].append(record["passed"])
+        remaining = []
+        for prompt in prompts:
+            key = prompt_key(prompt)
+            missing = []
+            passed = 0
+            for sample_index in range(prompt.samples):
+                results = journaled[key, sample_index]
+                if results:
+                    passed += results.pop()
+                else:
+                    missing.append(sample_index)
+            completed = prompt.samples - len(missing)
+            if early_stopping is not None and early_stopping.decided(passed, completed):
+                continue
+            if missing:
+                remaining.append((prompt, Resume(tuple(missing), completed, passed)))
+        return remaining
+
+    def read(self, prompts: Iterable[Prompt] = ()) -> Iterator[TestResult]:
+        """
+        Streams journaled results.
+
+        Results whose key matches one of `prompts` get that `Prompt` back (with its real
+        validator); the others are rebuilt with a `JournaledValidator`.
+        """
+        originals: dict[str, Prompt] = {prompt_key(p): p for p in prompts}
+        for record in self._records():
+            test_case = originals.get(record["key"]) or _decode_prompt(record["test_case"])
+            yield TestResult(
+                test_case=test_case,
+                response=record["response"],
+                passed=record["passed"],
+                metrics=Metrics.from_dict(record["metrics"]) if record["metrics"] else None,
+                validation_details=record["validation_details"],
+                execution_error=record["execution_error"],
+                timestamp=datetime.fromisoformat(record["timestamp"]),
+                sample_index=record.get("sample_index", 0),
+                validation_ms=record.get("validation_ms"),
+            )
+
+    def load_report(self, prompts: Iterable[Prompt] = ()) -> Report:
+        return Report(results=tuple(self.read(prompts)))
+
+    def append(self, result: TestResult) -> None:
+        if self._file is None:
+            self._file = self._open()
+        record = {
+            "key": prompt_key(result.test_case),
+            "test_case": _encode_prompt(result.test_case),
+            "response": result.response,
+            "passed": result.passed,
+            "metrics": result.metrics.to_dict() if result.metrics else None,
+            "validation_details": result.validation_details,
+            "execution_error": result.execution_error,
+            "timestamp": result.timestamp.isoformat(),
+            "sample_index": result.sample_index,
+            "validation_ms": result.validation_ms,
+        }
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def _open(self) -> IO[str]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        torn = False
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with self.path.open("rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                torn = existing.read(1) != b"\n"
+        file = self.path.open("a", encoding="utf-8")
+        if torn:
+            # Terminate a line left half-written by a crash so the next record starts cleanly.
+            file.write("\n")
+        return file
+
+    def _records(self) -> Iterator[dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Partial line from an interrupted write; the result was never completed.
+                    continue
+
+
+def _encode_prompt(prompt: Prompt) -> dict[str, Any]:
+    return {
+        "name": prompt.name,
+        "prompt": prompt.prompt,
+        "model": prompt.model,
+        "validator": prompt.validator.describe(),
+        "tags": list(prompt.tags),
+        "system_prompt": prompt.system_prompt,
+        "temperature": prompt.temperature,
+        "max_tokens": prompt.max_tokens,
+        "metadata": prompt.metadata,
+    }
+
+
+def _decode_prompt(data: dict[str, Any]) -> Prompt:
+    return Prompt(
+        name=data["name"],
+        prompt=data["prompt"],
+        model=data["model"],
+        validator=JournaledValidator(data["validator"]),
+        tags=tuple(data["tags"]),
+        system_prompt=data["system_prompt"],
+        temperature=data["temperature"],
+        max_tokens=data["max_tokens"],
+        metadata=data["metadata"],
+    )
@@ -0,0 +1,127 @@
+from promptum.session.budget import Budget
+from promptum.session.result import TestResult
+from promptum.session.sketch import QuantileSketch
+from promptum.session.summary import Summary
+
+
+class _Tally:
+    """Running totals behind one `Summary`, with the same rules as `Report.get_summary`."""
+
+    __slots__ = (
+        "total",
+        "passed",
+        "skipped",
+        "execution_errors",
+        "validation_failures",
+        "cached",
+        "coalesced",
+        "cost_usd",
+        "tokens",
+        "latency",
+        "cost",
+    )
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.skipped = 0
+        self.execution_errors = 0
+        self.validation_failures = 0
+        self.cached = 0
+        self.coalesced = 0
+        self.cost_usd = 0.0
+        self.tokens = 0
+        self.latency = QuantileSketch()
+        self.cost = QuantileSketch()
+
+    def add(self, result: TestResult) -> None:
+        self.total += 1
+        self.passed += result.passed
+        self.skipped += result.skipped
+        if result.execution_error is not None:
+            self.execution_errors += 1
+        elif not result.passed and not result.skipped:
+            self.validation_failures += 1
+
+        metrics = result.metrics
+        if metrics is None:
+            return
+        if metrics.cached:
+            self.cached += 1
+            return
+        self.latency.add(metrics.latency_ms)
+        if metrics.coalesced:
+            self.coalesced += 1
+            return
+        cost = metrics.cost_usd or 0.0
+        self.cost_usd += cost
+        self.tokens += metrics.total_tokens or 0
+        self.cost.add(cost)
+
+    def summary(self, budget: Budget | None) -> Summary:
+        executed = self.total - self.skipped
+        live = self.latency.count
+        return Summary(
+            total=self.total,
+            passed=self.passed,
+            failed=self.execution_errors + self.validation_failures,
+            pass_rate=self.passed / executed if executed > 0 else 0,
+            avg_latency_ms=self.latency.avg,
+            min_latency_ms=self.latency.min if live else 0,
+            max_latency_ms=self.latency.max if live else 0,
+            total_cost_usd=self.cost_usd,
+            total_tokens=self.tokens,
+            execution_errors=self.execution_errors,
+            validation_failures=self.validation_failures,
+            cached=self.cached,
+            coalesced=self.coalesced,
+            skipped=self.skipped,
+            budget=budget,
+            # Copies, so the snapshot does not move as more results arrive.
+            latency_sketch=QuantileSketch.merge(self.latency),
+            cost_sketch=QuantileSketch.merge(self.cost),
+        )
+
+
+class LiveSummary:
+    """
+    Running `Summary` of a run in progress, overall and per model and tag.
+
+    `add` costs the same for the first result as for the millionth, and so does reading a
+    summary, so a progress display can refresh it as often as it likes.
+    """
+
+    def __init__(self, budget: Budget | None = None):
+        self.budget = budget
+        self._overall = _Tally()
+        self._models: dict[str, _Tally] = {}
+        self._tags: dict[str, _Tally] = {}
+
+    @property
+    def completed(self) -> int:
+        return self._overall.total
+
+    def add(self, result: TestResult) -> None:
+        test_case = result.test_case
+        self._overall.add(result)
+        _tally(self._models, test_case.model).add(result)
+        for tag in test_case.tags:
+            _tally(self._tags, tag).add(result)
+
+    def summary(self) -> Summary:
+        return self._overall.summary(self.budget)
+
+    def by_model(self) -> dict[str, Summary]:
+        """One summary per model, in the order the models first completed a test."""
+        return {model: tally.summary(None) for model, tally in self._models.items()}
+
+    def by_tag(self) -> dict[str, Summary]:
+        """One summary per tag; a result counts towards each of its tags."""
+        return {tag: tally.summary(None) for tag, tally in self._tags.items()}
+
+
+def _tally(tallies: dict[str, _Tally], key: str) -> _Tally:
+    tally = tallies.get(key)
+    if tally is None:
+        tally = tallies[key] = _Tally()
+    return tally
@@ -1,62 +1,64 @@
 from collections.abc import Callable, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Literal
 
+from promptum.session.budget import Budget
+from promptum.session.columns import ResultColumns
 from promptum.session.result import TestResult
+from promptum.session.stats import PromptStats
 from promptum.session.summary import Summary
 
 
 @dataclass(frozen=True, slots=True)
 class Report:
     results: Sequence[TestResult]
+    budget: Budget | None = None
+    _columns: ResultColumns | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         object.__setattr__(self, "results", tuple(self.results))
 
-    def get_summary(self) -> Summary:
-        total = len(self.results)
-        passed = sum(1 for r in self.results if r.passed)
-        execution_errors=self._count_execution_errors()
-        validation_failures=self._count_validation_failures()
-
-        latencies = [r.metrics.latency_ms for r in self.results if r.metrics]
-        total_cost = sum(r.metrics.cost_usd or 0 for r in self.results if r.metrics)
-        total_tokens = sum(r.metrics.total_tokens or 0 for r in self.results if r.metrics)
-
-        return Summary(
-            total=total,
-            passed=passed,
-            failed=execution_errors + validation_failures,
-            pass_rate=passed / total if total > 0 else 0,
-            avg_latency_ms=sum(latencies) / len(latencies) if latencies else 0,
-            min_latency_ms=min(latencies) if latencies else 0,
-            max_latency_ms=max(latencies) if latencies else 0,
-            total_cost_usd=total_cost,
-            total_tokens=total_tokens,
-            execution_errors=execution_errors,
-            validation_failures=validation_failures,
+    @staticmethod
+    def merge(*reports: "Report") -> "Report":
+        """Concatenates reports (e.g. from shards or resumed runs) into one."""
+        return Report(
+            results=tuple(chain.from_iterable(r.results for r in reports)),
+            budget=next((r.budget for r in reports if r.budget is not None), None),
         )
 
+    @property
+    def columns(self) -> ResultColumns:
+        """Columnar copy of `results`, built on first use and shared with derived reports."""
+        columns = self._columns
+        if columns is None:
+            columns = ResultColumns.from_results(self.results)
+            object.__setattr__(self, "_columns", columns)
+        return columns
+
+    def get_summary(self) -> Summary:
+        return self.columns.summarize(self.budget)
+
     def filter(
         self,
         model: str | None = None,
         tags: Sequence[str] | None = None,
         passed: bool | None = None,
     ) -> "Report":
-        filtered = list(self.results)
-
-        if model is not None:
-            filtered = [r for r in filtered if r.test_case.model == model]
+        return self._take(self.columns.select(model, tags, passed))
 
-        if tags is not None:
-            tag_set = set(tags)
-            filtered = [r for r in filtered if tag_set.intersection(r.test_case.tags)]
+    def group_by(
+        self, key: Callable[[TestResult], str] | Literal["model", "tag"]
+    ) -> dict[str, "Report"]:
+        """
+        Splits the report by `key(result)`, or by the `"model"` or `"tag"` column.
 
-        if passed is not None:
-            filtered = [r for r in filtered if r.passed == passed]
+        Grouping by `"tag"` puts a result in the group of each of its tags. Column groups
+        reuse this report's columns instead of reading every result again.
+        """
+        if isinstance(key, str):
+            return {name: self._take(rows) for name, rows in self.columns.groups(key).items()}
 
-        return Report(results=filtered)
-
-    def group_by(self, key: Callable[[TestResult], str]) -> dict[str, "Report"]:
         groups: dict[str, list[TestResult]] = {}
 
         for result in self.results:
@@ -67,12 +69,19 @@ class Report:
 
         return {k: Report(results=v) for k, v in groups.items()}
 
-    def _count_execution_errors(self) -> int:
-        return sum(1 for r in self.results if r.execution_error is not None)
+    def prompt_stats(self, k: Sequence[int] = (1,)) -> list[PromptStats]:
+        """
+        Rolls up repeated samples into one `PromptStats` per prompt, in first-seen order.
 
-    def _count_validation_failures(self) -> int:
-        return sum(
-            1
-            for r in self.results
-            if not r.passed and r.execution_error is None
-        )
+        Results are grouped by test case `name` and `model`. `pass_at_k` holds an entry for
+        every `k` no larger than the number of executed samples.
+        """
+        groups: dict[tuple[str, str], list[TestResult]] = {}
+        for result in self.results:
+            groups.setdefault((result.test_case.name, result.test_case.model), []).append(result)
+        return [PromptStats.from_results(group, k) for group in groups.values()]
+
+    def _take(self, rows: list[int]) -> "Report":
+        report = Report(results=tuple(map(self.results.__getitem__, rows)))
+        object.__setattr__(report, "_columns", self.columns.take(rows))
+        return report
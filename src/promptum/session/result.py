@@ -15,3 +15,6 @@ class TestResult:
     validation_details: dict[str, Any]
     execution_error: str | None = None
     timestamp: datetime = field(default_factory=lambda:datetime.now(UTC))
+    skipped: bool = False
+    sample_index: int = 0
+    validation_ms: float | None = None
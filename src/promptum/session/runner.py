@@ -1,12 +1,47 @@
 import asyncio
-from collections.abc import Callable, Sequence
+import contextlib
+import heapq
+import itertools
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    Sized,
+)
+from concurrent.futures import Executor
+from dataclasses import replace
+from typing import Any, Protocol
 
 import httpx
 
-from promptum.providers.exceptions import ProviderError
-from promptum.providers.protocol import LLMProvider
-from promptum.session.case import Prompt
+from promptum.providers.exceptions import (
+    ProviderError,
+    ProviderHTTPStatusError,
+    ProviderRetryExhaustedError,
+    ProviderTransientError,
+)
+from promptum.providers.metrics import Metrics
+from promptum.providers.protocol import (
+    SAMPLE_INDEX,
+    LLMProvider,
+    SamplingLLMProvider,
+    StreamingLLMProvider,
+)
+from promptum.providers.retry import RetryConfig
+from promptum.session.budget import Budget, BudgetTracker
+from promptum.session.case import Prompt, Resume, remaining_samples
+from promptum.session.concurrency import AdaptiveConcurrency, AdaptiveLimiter
+from promptum.session.live import LiveSummary
 from promptum.session.result import TestResult
+from promptum.session.scheduling import FairScheduler, FairScheduling
+from promptum.session.shutdown import Shutdown, not_executed
+from promptum.session.stopping import EarlyStopping, Job, SampleScheduler
+from promptum.validation.protocol import Validator, is_cpu_heavy
 
 
 class Runner:
@@ -15,61 +50,535 @@ class Runner:
         provider: LLMProvider,
         max_concurrent: int = 5,
         progress_callback: Callable[[int, int, TestResult], None] | None = None,
+        stream: bool = False,
+        adaptive: AdaptiveConcurrency | None = None,
+        budget: Budget | None = None,
+        early_stopping: EarlyStopping | None = None,
+        validation_executor: Executor | None = None,
+        deferred_retries: RetryConfig | None = None,
+        fair_scheduling: FairScheduling | None = None,
     ):
+        if early_stopping is not None and fair_scheduling is not None:
+            # The sample scheduler picks the next sample itself, so it cannot share out slots.
+            raise ValueError("early_stopping and fair_scheduling cannot be used together")
         self.provider = provider
         self.max_concurrent = max_concurrent
         self.progress_callback = progress_callback
+        self.stream = stream
+        self.adaptive = adaptive
+        self.budget = budget
+        self.early_stopping = early_stopping
+        self.validation_executor = validation_executor
+        self.deferred_retries = deferred_retries
+        self.fair_scheduling = fair_scheduling
+        self._limiter: AdaptiveLimiter | None = None
+        self._budget_tracker: BudgetTracker | None = None
+        self._shutdown: Shutdown | None = None
+        self._retries: _RetryQueue | None = None
+        self.last_results: list[TestResult] = []
+        self.live = LiveSummary(budget)
 
-    async def run(self, test_cases: Sequence[Prompt]) -> list[TestResult]:
-        semaphore = asyncio.Semaphore(self.max_concurrent)
-        completed = 0
-        total = len(test_cases)
+    @property
+    def concurrency_limit(self) -> int:
+        if self._limiter is not None:
+            return self._limiter.limit
+        return self.max_concurrent
+
+    def stop(self, grace_period: float | None = None) -> None:
+        """
+        Stops the run in progress: no further tests are started and the rest are skipped.
+
+        Requests in flight finish, or are cancelled after `grace_period` seconds (at once
+        for `0`) and reported as skipped. The run then returns the results it has.
+        """
+        if self._shutdown is not None:
+            self._shutdown.stop(grace_period)
+        if self._retries is not None:
+            # Requests waiting out a backoff come due at once and are skipped.
+            self._retries.flush()
+
+    async def run(
+        self, test_cases: Iterable[Prompt], resume: Mapping[int, Resume] | None = None
+    ) -> list[TestResult]:
+        """
+        Runs `test_cases` and returns their results in input order.
+
+        A prompt whose position is in `resume` runs only the samples it still lacks.
+        """
+        results: dict[tuple[int, int], TestResult] = {}
+        try:
+            async with contextlib.aclosing(self._run_pool(test_cases, resume)) as completed:
+                async for (position, _), batch in completed:
+                    for result in batch:
+                        results[position, result.sample_index] = result
+        except BaseException:
+            if isinstance(test_cases, Sequence):
+                # A cancelled run keeps what completed; the tests it never ran are skipped.
+                results.update(not_executed(test_cases, results, resume))
+            raise
+        finally:
+            # Keys are (test case position, sample index), so this restores input order.
+            self.last_results = [results[key] for key in sorted(results)]
+        return self.last_results
+
+    async def run_iter(
+        self, test_cases: Iterable[Prompt], resume: Mapping[int, Resume] | None = None
+    ) -> AsyncGenerator[TestResult]:
+        """
+        Yields each result as soon as its test completes, in completion order.
+
+        `test_cases` may be a lazy iterable; it is consumed only as workers free up.
+        Closing the iterator early (e.g. `break` in `async for`) cancels the tests still
+        running or waiting for a slot.
+        """
+        async with contextlib.aclosing(self._run_pool(test_cases, resume)) as completed:
+            async for _, batch in completed:
+                for result in batch:
+                    yield result
+
+    async def run_batches(
+        self, test_cases: Iterable[Prompt], resume: Mapping[int, Resume] | None = None
+    ) -> AsyncGenerator[tuple[tuple[int, int], list[TestResult]]]:
+        """
+        Like `run_iter`, but yields the results of each request together with its key.
 
-        async def run_with_semaphore(test_case: Prompt) -> TestResult:
-            async with semaphore:
-                result = await self._run_single_test(test_case)
+        The key is `(position, first sample index)`, where `position` indexes `test_cases`,
+        so sorting the keys restores the input order.
+        """
+        async with contextlib.aclosing(self._run_pool(test_cases, resume)) as completed:
+            async for item in completed:
+                yield item
 
-                nonlocal completed
+    async def _run_pool(
+        self, test_cases: Iterable[Prompt], resume: Mapping[int, Resume] | None = None
+    ) -> AsyncGenerator[tuple[tuple[int, int], list[TestResult]]]:
+        # A fixed set of workers pulls jobs as they free up, so memory grows with the
+        # concurrency rather than with the number of test cases.
+        resume = resume or {}
+        total = 0
+        if isinstance(test_cases, Sized):
+            total = sum(len(remaining_samples(t, resume.get(i))) for i, t in enumerate(test_cases))
+        workers = self.max_concurrent
+        if self.adaptive is not None:
+            workers = max(workers, self.adaptive.max_concurrent)
+        if isinstance(test_cases, Sized):
+            workers = min(workers, total)
+        if workers <= 0:
+            return
+
+        jobs: _JobSource
+        if self.early_stopping is not None:
+            jobs = SampleScheduler(
+                test_cases, self.early_stopping, workers, self._batches_samples(), resume
+            )
+        elif self.fair_scheduling is not None:
+            jobs = FairScheduler(self._jobs(test_cases, resume), self.fair_scheduling)
+        else:
+            jobs = _Jobs(self._jobs(test_cases, resume))
+        retries = None
+        if self.deferred_retries is not None:
+            jobs = retries = _RetryQueue(jobs, self.deferred_retries)
+        self._retries = retries
+        run_limited = self._limited(total, retries)
+        completed: asyncio.Queue[
+            tuple[tuple[int, int], list[TestResult]] | BaseException | None
+        ] = asyncio.Queue(maxsize=workers)
+
+        async def work() -> None:
+            try:
+                while (job := await jobs.next()) is not None:
+                    results = await run_limited(job)
+                    if results is None:
+                        # Put back for a retry; the slot stays free during the backoff.
+                        continue
+                    jobs.complete(job, results)
+                    await completed.put((job[0], results))
+                    # Let the consumer see the result before taking more work, so a caller
+                    # that stops iterating early does not start another request.
+                    await asyncio.sleep(0)
+            except Exception as e:
+                await completed.put(e)
+            await completed.put(None)
+
+        tasks = [asyncio.create_task(work()) for _ in range(workers)]
+        if self._budget_tracker is not None:
+            self._budget_tracker.start()
+        try:
+            running = workers
+            while running:
+                item = await completed.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            if self._budget_tracker is not None:
+                self._budget_tracker.stop()
+            if self._shutdown is not None:
+                self._shutdown.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _jobs(self, test_cases: Iterable[Prompt], resume: Mapping[int, Resume]) -> Iterator[Job]:
+        batched = self._batches_samples()
+        for index, test_case in enumerate(test_cases):
+            samples = remaining_samples(test_case, resume.get(index))
+            if not samples:
+                continue
+            if batched or len(samples) == 1:
+                yield (index, samples[0]), test_case, samples
+            else:
+                # Without batching, each sample is a separate request that can run in parallel.
+                for sample_index in samples:
+                    yield (index, sample_index), test_case, range(sample_index, sample_index + 1)
+
+    def _batches_samples(self) -> bool:
+        streaming = self.stream and isinstance(self.provider, StreamingLLMProvider)
+        return not streaming and isinstance(self.provider, SamplingLLMProvider)
+
+    def _limited(
+        self, total: int, retries: "_RetryQueue | None"
+    ) -> Callable[[Job], Coroutine[Any, Any, list[TestResult] | None]]:
+        completed = 0
+        live = self.live = LiveSummary(self.budget)
+
+        def report_progress(results: list[TestResult]) -> None:
+            nonlocal completed
+            for result in results:
                 completed += 1
+                live.add(result)
                 if self.progress_callback:
                     self.progress_callback(completed, total, result)
 
-                return result
+        tracker = None
+        if self.budget is not None:
+            tracker = BudgetTracker(self.budget, retries.flush if retries is not None else None)
+        self._budget_tracker = tracker
+        shutdown = Shutdown()
+        self._shutdown = shutdown
+
+        async def execute_within_budget(
+            test_case: Prompt, samples: Sequence[int]
+        ) -> tuple[list[TestResult], Exception | None]:
+            if tracker is None:
+                return await self._execute(test_case, samples)
+            return await tracker.run(test_case, samples, self._execute)
+
+        async def execute(job: Job) -> tuple[list[TestResult], Exception | None]:
+            _, test_case, samples = job
+            return await shutdown.run(test_case, samples, execute_within_budget)
+
+        def settle(
+            job: Job, results: list[TestResult], error: Exception | None
+        ) -> list[TestResult] | None:
+            if retries is not None:
+                if retries.defer(job, error):
+                    return None
+                results = _with_retry_delays(results, error, retries.retry_delays(job))
+            report_progress(results)
+            return results
+
+        model_semaphores: dict[str, asyncio.Semaphore] = {}
+
+        def model_slot(model: str) -> contextlib.AbstractAsyncContextManager[Any]:
+            limit = self.fair_scheduling.limit(model) if self.fair_scheduling else None
+            if limit is None:
+                return contextlib.nullcontext()
+            if model not in model_semaphores:
+                model_semaphores[model] = asyncio.Semaphore(limit)
+            return model_semaphores[model]
+
+        if self.adaptive is not None:
+            limiter = AdaptiveLimiter(self.adaptive, self.max_concurrent)
+            self._limiter = limiter
+
+            async def run_adaptive(job: Job) -> list[TestResult] | None:
+                # The model slot comes first, so waiting for it does not hold a shared slot.
+                async with model_slot(job[1].model):
+                    await limiter.acquire()
+                    try:
+                        results, error = await execute(job)
+                    except BaseException:
+                        limiter.release()
+                        raise
+                    metrics = results[0].metrics
+                    latency_ms = metrics.latency_ms if metrics else None
+                    limiter.release(latency_ms, _is_overload(results[0], error))
+                return settle(job, results, error)
+
+            return run_adaptive
 
-        results = await asyncio.gather(
-            *[run_with_semaphore(tc) for tc in test_cases],
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def run_limited(job: Job) -> list[TestResult] | None:
+            async with model_slot(job[1].model), semaphore:
+                results, error = await execute(job)
+            return settle(job, results, error)
+
+        return run_limited
+
+    async def _execute(
+        self, test_case: Prompt, samples: Sequence[int]
+    ) -> tuple[list[TestResult], Exception | None]:
+        generate = self.provider.generate
+        if self.stream and isinstance(self.provider, StreamingLLMProvider):
+            generate = self.provider.generate_stream
+
+        request: dict[str, Any] = {
+            "prompt": test_case.prompt,
+            "model": test_case.model,
+            "system_prompt": test_case.system_prompt,
+            "temperature": test_case.temperature,
+            "max_tokens": test_case.max_tokens,
+            "retry_config": test_case.retry_config,
+        }
+        if self.deferred_retries is not None:
+            # The runner retries the request itself, so the provider makes a single attempt.
+            config = test_case.retry_config or self.deferred_retries
+            request["retry_config"] = replace(config, max_attempts=1)
+        try:
+            if len(samples) > 1:
+                assert isinstance(self.provider, SamplingLLMProvider)
+                responses, metrics = await self.provider.generate_samples(n=len(samples), **request)
+                shares = _share(metrics, len(samples))
+            else:
+                # Tells caching wrappers which sample this is, as the requests are identical.
+                token = SAMPLE_INDEX.set(samples[0])
+                try:
+                    response, metrics = await generate(**request)
+                finally:
+                    SAMPLE_INDEX.reset(token)
+                responses, shares = [response], [metrics]
+
+            results = []
+            for sample_index, response, share in zip(samples, responses, shares, strict=True):
+                passed, validation_details, validation_ms = await self._validate(
+                    test_case.validator, response
+                )
+                results.append(
+                    TestResult(
+                        test_case=test_case,
+                        response=response,
+                        passed=passed,
+                        metrics=share,
+                        validation_details=validation_details,
+                        execution_error=None,
+                        sample_index=sample_index,
+                        validation_ms=validation_ms,
+                    )
+                )
+            return results, None
+
+        except (ProviderError, ValueError, TypeError, httpx.HTTPError) as e:
+            results = [
+                TestResult(
+                    test_case=test_case,
+                    response=None,
+                    passed=False,
+                    metrics=None,
+                    validation_details={},
+                    execution_error=str(e),
+                    sample_index=sample_index,
+                )
+                for sample_index in samples
+            ]
+            return results, e
+
+    async def _validate(
+        self, validator: Validator, response: str
+    ) -> tuple[bool, dict[str, Any], float]:
+        if self.validation_executor is None or not is_cpu_heavy(validator):
+            return _timed_validate(validator, response)
+        # Off the event loop, a slow validator cannot delay other requests or their latency.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.validation_executor, _timed_validate, validator, response
         )
 
-        return list(results)
 
-    async def _run_single_test(self, test_case: Prompt) -> TestResult:
+def _timed_validate(validator: Validator, response: str) -> tuple[bool, dict[str, Any], float]:
+    start = time.perf_counter()
+    passed, details = validator.validate(response)
+    return passed, details, (time.perf_counter() - start) * 1000
+
+
+class _JobSource(Protocol):
+    async def next(self) -> Job | None: ...
+
+    def complete(self, job: Job, results: list[TestResult]) -> None: ...
+
+    def release(self, job: Job) -> None: ...
+
+    def reacquire(self, job: Job) -> None: ...
+
+
+class _Jobs:
+    def __init__(self, jobs: Iterator[Job]):
+        self._jobs = jobs
+
+    async def next(self) -> Job | None:
+        return next(self._jobs, None)
+
+    def complete(self, job: Job, results: list[TestResult]) -> None:
+        pass
+
+    def release(self, job: Job) -> None:
+        pass
+
+    def reacquire(self, job: Job) -> None:
+        pass
+
+
+class _RetryQueue:
+    """
+    Job source that takes back jobs whose attempt failed with a retryable error and hands
+    them out again once their backoff has passed, so no worker or slot waits through it.
+    """
+
+    def __init__(self, source: _JobSource, config: RetryConfig):
+        self.config = config
+        self._source = source
+        self._backoff: list[tuple[float, int, Job]] = []
+        self._order = itertools.count()
+        self._delays: dict[tuple[int, int], list[float]] = {}
+        self._in_flight = 0
+        self._exhausted = False
+        self._flushed = False
+        self._changed = asyncio.Event()
+
+    def retry_delays(self, job: Job) -> list[float]:
+        return self._delays.get(job[0], [])
+
+    def defer(self, job: Job, error: Exception | None) -> bool:
+        """Puts `job` back for another attempt if `error` is retryable and attempts remain."""
+        if not isinstance(error, ProviderRetryExhaustedError | ProviderTransientError):
+            return False
+        config = job[1].retry_config or self.config
+        delays = self._delays.setdefault(job[0], [])
+        if len(delays) >= config.max_attempts - 1:
+            return False
+        delay = config.delay(len(delays))
+        delays.append(delay)
+        due = 0.0 if self._flushed else time.monotonic() + delay
+        heapq.heappush(self._backoff, (due, next(self._order), job))
+        self._in_flight -= 1
+        self.release(job)
+        self._changed.set()
+        return True
+
+    def flush(self) -> None:
+        """Makes every job waiting out its backoff, and every later one, due at once."""
+        self._flushed = True
+        self._backoff = [(0.0, order, job) for _, order, job in self._backoff]
+        heapq.heapify(self._backoff)
+        self._changed.set()
+
+    async def next(self) -> Job | None:
+        fetch: asyncio.Future[Job | None] | None = None
         try:
-            response, metrics = await self.provider.generate(
-                prompt=test_case.prompt,
-                model=test_case.model,
-                system_prompt=test_case.system_prompt,
-                temperature=test_case.temperature,
-                max_tokens=test_case.max_tokens,
-                retry_config=test_case.retry_config,
-            )
+            while True:
+                if fetch is not None and fetch.done():
+                    job = fetch.result()
+                    fetch = None
+                    if job is not None:
+                        break
+                    self._exhausted = True
+                now = time.monotonic()
+                if self._backoff and self._backoff[0][0] <= now:
+                    job = heapq.heappop(self._backoff)[2]
+                    self.reacquire(job)
+                    break
+                if fetch is None and not self._exhausted:
+                    # The source may block (e.g. SampleScheduler), so a retry coming due
+                    # must be able to interrupt the wait for it.
+                    fetch = asyncio.ensure_future(self._source.next())
+                elif fetch is None and not self._backoff and self._in_flight == 0:
+                    return None
 
-            passed, validation_details = test_case.validator.validate(response)
+                self._changed.clear()
+                changed = asyncio.ensure_future(self._changed.wait())
+                waiters = [changed] if fetch is None else [changed, fetch]
+                timeout = self._backoff[0][0] - now if self._backoff else None
+                try:
+                    await asyncio.wait(
+                        waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    changed.cancel()
+        finally:
+            if fetch is not None:
+                fetch.cancel()
+        self._in_flight += 1
+        return job
 
-            return TestResult(
-                test_case=test_case,
-                response=response,
-                passed=passed,
-                metrics=metrics,
-                validation_details=validation_details,
-                execution_error=None,
-            )
+    def complete(self, job: Job, results: list[TestResult]) -> None:
+        self._in_flight -= 1
+        self._delays.pop(job[0], None)
+        self._source.complete(job, results)
+        self._changed.set()
 
-        except (ProviderError, ValueError, TypeError, httpx.HTTPError) as e:
-            return TestResult(
-                test_case=test_case,
-                response=None,
-                passed=False,
-                metrics=None,
-                validation_details={},
-                execution_error=str(e),
-            )
+    def release(self, job: Job) -> None:
+        self._source.release(job)
+
+    def reacquire(self, job: Job) -> None:
+        self._source.reacquire(job)
+
+
+def _with_retry_delays(
+    results: list[TestResult], error: Exception | None, delays: list[float]
+) -> list[TestResult]:
+    """Adds the backoff of the earlier attempts to the results of a job's last attempt."""
+    if not delays:
+        return results
+    if isinstance(error, ProviderRetryExhaustedError):
+        error = ProviderRetryExhaustedError(
+            error.attempts + len(delays),
+            error.last_status_code,
+            error.last_response_body,
+            [*delays, *error.retry_delays],
+        )
+    elif isinstance(error, ProviderTransientError):
+        error = ProviderTransientError(error.attempts + len(delays), [*delays, *error.retry_delays])
+
+    def settle(result: TestResult) -> TestResult:
+        if result.metrics is None:
+            # Failed (or skipped, without an error) before a response came back.
+            return result if error is None else replace(result, execution_error=str(error))
+        retry_delays = (*delays, *result.metrics.retry_delays)
+        return replace(result, metrics=replace(result.metrics, retry_delays=retry_delays))
+
+    return [settle(result) for result in results]
+
+
+def _share(metrics: Metrics, count: int) -> list[Metrics]:
+    """Splits the tokens and cost of a batched request across its samples."""
+
+    def split(value: int | None, index: int) -> int | None:
+        if value is None:
+            return None
+        return value // count + (1 if index < value % count else 0)
+
+    return [
+        replace(
+            metrics,
+            prompt_tokens=split(metrics.prompt_tokens, index),
+            completion_tokens=split(metrics.completion_tokens, index),
+            total_tokens=split(metrics.total_tokens, index),
+            cost_usd=metrics.cost_usd / count if metrics.cost_usd is not None else None,
+        )
+        for index in range(count)
+    ]
+
+
+def _is_overload(result: TestResult, error: Exception | None) -> bool:
+    if isinstance(error, ProviderRetryExhaustedError | ProviderTransientError):
+        return True
+    if isinstance(error, ProviderHTTPStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    # Retries inside the provider mean it already hit throttling or server errors.
+    return result.metrics is not None and len(result.metrics.retry_delays) > 0
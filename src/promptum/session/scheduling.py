@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+from collections import Counter, deque
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+
+from promptum.session.result import TestResult
+from promptum.session.stopping import Job
+
+
+@dataclass(frozen=True, slots=True)
+class FairScheduling:
+    """
+    Shares the run's concurrency between models instead of dispatching in input order.
+
+    Each model gets at most `limits[model]` (or `default_limit`) requests at a time. Free
+    slots go to the model with the fewest requests in flight relative to its weight.
+    """
+
+    limits: Mapping[str, int] = field(default_factory=dict)
+    default_limit: int | None = None
+    weights: Mapping[str, float] = field(default_factory=dict)
+    lookahead: int = 1024
+
+    def __post_init__(self):
+        for model, limit in self.limits.items():
+            if limit < 1:
+                raise ValueError(f"Limit for {model!r} must be at least 1, got {limit}")
+        if self.default_limit is not None and self.default_limit < 1:
+            raise ValueError(f"default_limit must be at least 1, got {self.default_limit}")
+        for model, weight in self.weights.items():
+            if weight <= 0:
+                raise ValueError(f"Weight for {model!r} must be positive, got {weight}")
+        if self.lookahead < 1:
+            raise ValueError(f"lookahead must be at least 1, got {self.lookahead}")
+
+    def limit(self, model: str) -> int | None:
+        return self.limits.get(model, self.default_limit)
+
+    def weight(self, model: str) -> float:
+        return self.weights.get(model, 1.0)
+
+    def partition(self, count: int) -> "FairScheduling":
+        """Splits every limit `count` ways (at least one request per model and part)."""
+        return FairScheduling(
+            limits={model: max(1, limit // count) for model, limit in self.limits.items()},
+            default_limit=(
+                max(1, self.default_limit // count) if self.default_limit is not None else None
+            ),
+            weights=self.weights,
+            lookahead=self.lookahead,
+        )
+
+
+class FairScheduler:
+    """
+    Hands out jobs round-robin across models, weighted by their requests in flight.
+
+    Up to `lookahead` jobs are read ahead from `jobs` and queued per model, so prompts for
+    other models are found even when the input lists one model first. A model at its limit
+    gets no jobs until one of its requests completes.
+    """
+
+    def __init__(self, jobs: Iterator[Job], scheduling: FairScheduling):
+        self.scheduling = scheduling
+        self._jobs = jobs
+        self._exhausted = False
+        self._queues: dict[str, deque[Job]] = {}
+        self._buffered = 0
+        self._in_flight: Counter[str] = Counter()
+        self._served: dict[str, int] = {}
+        self._turn = itertools.count()
+        self._changed = asyncio.Event()
+
+    async def next(self) -> Job | None:
+        while True:
+            self._fill()
+            model = self._pick()
+            if model is not None:
+                return self._issue(model)
+            if not self._queues:
+                return None
+            self._changed.clear()
+            await self._changed.wait()
+
+    def complete(self, job: Job, results: list[TestResult]) -> None:
+        self._in_flight[job[1].model] -= 1
+        self._changed.set()
+
+    def release(self, job: Job) -> None:
+        """Frees the slot of a job put back for a retry, so its model can run others."""
+        self.complete(job, [])
+
+    def reacquire(self, job: Job) -> None:
+        """Takes the slot again for a deferred job that is handed out once more."""
+        self._in_flight[job[1].model] += 1
+
+    def _fill(self) -> None:
+        while not self._exhausted and self._buffered < self.scheduling.lookahead:
+            job = next(self._jobs, None)
+            if job is None:
+                self._exhausted = True
+                return
+            self._queues.setdefault(job[1].model, deque()).append(job)
+            self._buffered += 1
+
+    def _pick(self) -> str | None:
+        scheduling = self.scheduling
+        eligible = [
+            model
+            for model in self._queues
+            if (limit := scheduling.limit(model)) is None or self._in_flight[model] < limit
+        ]
+
+        def share(model: str) -> tuple[float, int]:
+            # Ties go to the model served longest ago, which makes equal weights round-robin.
+            return self._in_flight[model] / scheduling.weight(model), self._served.get(model, -1)
+
+        return min(eligible, key=share, default=None)
+
+    def _issue(self, model: str) -> Job:
+        queue = self._queues[model]
+        job = queue.popleft()
+        if not queue:
+            del self._queues[model]
+        self._buffered -= 1
+        self._in_flight[model] += 1
+        self._served[model] = next(self._turn)
+        return job
@@ -1,10 +1,28 @@
-from collections.abc import Callable, Sequence
+import asyncio
+import contextlib
+import multiprocessing
+import os
+from collections.abc import AsyncGenerator, Callable, Sequence
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Any
 
 from promptum.providers.protocol import LLMProvider
-from promptum.session.case import Prompt
+from promptum.providers.retry import RetryConfig
+from promptum.session.budget import Budget
+from promptum.session.case import Prompt, Resume, remaining_samples
+from promptum.session.concurrency import AdaptiveConcurrency
+from promptum.session.journal import Journal
+from promptum.session.live import LiveSummary
 from promptum.session.report import Report
 from promptum.session.result import TestResult
 from promptum.session.runner import Runner
+from promptum.session.scheduling import FairScheduling
+from promptum.session.sharding import ProviderFactory, Shard, partition, serve_shard, split
+from promptum.session.shutdown import not_executed
+from promptum.session.stopping import EarlyStopping
 
 
 class Session:
@@ -14,12 +32,47 @@ class Session:
         name: str = "benchmark",
         max_concurrent: int = 5,
         progress_callback: Callable[[int, int, TestResult], None] | None = None,
+        stream: bool = False,
+        adaptive: AdaptiveConcurrency | None = None,
+        budget: Budget | None = None,
+        early_stopping: EarlyStopping | None = None,
+        validation_executor: Executor | None = None,
+        deferred_retries: RetryConfig | None = None,
+        fair_scheduling: FairScheduling | None = None,
+        journal: Journal | str | Path | None = None,
     ):
+        if early_stopping is not None and fair_scheduling is not None:
+            raise ValueError("early_stopping and fair_scheduling cannot be used together")
         self.provider = provider
         self.name = name
         self.max_concurrent = max_concurrent
         self.progress_callback = progress_callback
+        self.stream = stream
+        self.adaptive = adaptive
+        self.budget = budget
+        self.early_stopping = early_stopping
+        self.validation_executor = validation_executor
+        self.deferred_retries = deferred_retries
+        self.fair_scheduling = fair_scheduling
+        self.journal = Journal(journal) if isinstance(journal, str | Path) else journal
         self._test_cases: list[Prompt] = []
+        self._runner: Runner | None = None
+        self._live: LiveSummary | None = None
+        self._shards: list[Connection] = []
+        self.last_report: Report | None = None
+
+    @property
+    def concurrency_limit(self) -> int:
+        if self._runner is not None:
+            return self._runner.concurrency_limit
+        return self.max_concurrent
+
+    @property
+    def live(self) -> LiveSummary | None:
+        """Running totals of the current (or last) run; `None` before the first run."""
+        if self._runner is not None:
+            return self._runner.live
+        return self._live
 
     def add_test(self, test_case: Prompt) -> None:
         self._test_cases.append(test_case)
@@ -27,16 +80,257 @@ class Session:
     def add_tests(self, test_cases: Sequence[Prompt]) -> None:
         self._test_cases.extend(test_cases)
 
+    def stop(self, grace_period: float | None = None) -> None:
+        """
+        Stops the run in progress (see `Runner.stop`); `run()` then returns a partial Report.
+
+        Safe to call from a signal handler installed with `loop.add_signal_handler`.
+        """
+        if self._runner is not None:
+            self._runner.stop(grace_period)
+        for control in self._shards:
+            # A shard that already finished has closed its end of the pipe.
+            with contextlib.suppress(OSError):
+                control.send(grace_period)
+
     async def run(self) -> Report:
+        """
+        Runs every test and returns the Report.
+
+        If the run is cancelled, the results so far are kept in `last_report` (tests that
+        never ran are skipped) before the cancellation propagates.
+        """
         if not self._test_cases:
             return Report(results=[])
 
+        if self.journal is None:
+            runner = self._create_runner()
+            try:
+                await runner.run(self._test_cases)
+            finally:
+                self.last_report = Report(results=runner.last_results, budget=self.budget)
+            return self.last_report
+
+        # Results from earlier runs come first, followed by the new ones in input order.
+        previous = Report(results=tuple(self.journal.read(self._test_cases)))
+        test_cases, resume = self._pending(self.journal)
+        results: dict[tuple[int, int], TestResult] = {}
+        try:
+            async with contextlib.aclosing(self._run_journaled(test_cases, resume)) as batches:
+                async for (position, _), batch in batches:
+                    for result in batch:
+                        results[position, result.sample_index] = result
+        except BaseException:
+            # Whatever the journal still lacks never ran.
+            results.update(not_executed(test_cases, results, resume))
+            raise
+        finally:
+            report = Report(results=[results[k] for k in sorted(results)], budget=self.budget)
+            self.last_report = Report.merge(previous, report)
+        return self.last_report
+
+    async def run_sharded(
+        self,
+        provider_factory: ProviderFactory,
+        shards: int | None = None,
+    ) -> Report:
+        """
+        Runs the tests across `shards` processes, each with its own event loop and provider.
+
+        `provider_factory` is called once in every worker process with its `Shard` and must be
+        picklable (e.g. a module-level function). `max_concurrent` is split between the shards.
+        Workers send back every result as it completes, so the journal, `progress_callback`,
+        `live` and `stop()` work as in `run()`. If the run is cancelled or a shard fails, the
+        workers are terminated and `last_report` keeps the results so far.
+        """
+        if self.validation_executor is not None:
+            raise ValueError(
+                "run_sharded validates in the worker processes; validation_executor must not be set"
+            )
+        if not self._test_cases:
+            return Report(results=[])
+
+        journal = self.journal
+        previous = Report(results=())
+        test_cases: Sequence[Prompt] = self._test_cases
+        resume: dict[int, Resume] = {}
+        if journal is not None:
+            previous = Report(results=tuple(journal.read(self._test_cases)))
+            test_cases, resume = self._pending(journal)
+            if not test_cases:
+                return previous
+
+        count = max(1, min(shards or os.cpu_count() or 1, len(test_cases)))
+        parts = partition(test_cases, count)
+        concurrency = split(self.max_concurrent, count)
+
+        context = multiprocessing.get_context("spawn")
+        processes: list[multiprocessing.process.BaseProcess] = []
+        pending: dict[Connection, int] = {}
+        controls: list[Connection] = []
+        loop = asyncio.get_running_loop()
+        completed = 0
+        self._runner = None
+        self._shards = controls
+        live = self._live = LiveSummary(self.budget)
+        total = sum(
+            len(remaining_samples(test_case, resume.get(position)))
+            for position, test_case in enumerate(test_cases)
+        )
+        # Keyed by (position in `test_cases`, sample index); shard `i` holds every
+        # `count`-th test case from position `i`.
+        results: dict[tuple[int, int], TestResult] = {}
+        try:
+            for index, part in enumerate(parts):
+                receiver, sender = context.Pipe(duplex=False)
+                control_receiver, control_sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=serve_shard,
+                    args=(
+                        sender,
+                        control_receiver,
+                        provider_factory,
+                        Shard(index, count),
+                        part,
+                        {p // count: r for p, r in resume.items() if p % count == index},
+                        concurrency[index],
+                        self.stream,
+                        self.adaptive,
+                        self.budget.partition(count) if self.budget is not None else None,
+                        self.early_stopping,
+                        self.deferred_retries,
+                        self.fair_scheduling.partition(count) if self.fair_scheduling else None,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                # The worker holds the other ends now; a dead worker shows up as EOF.
+                sender.close()
+                control_receiver.close()
+                processes.append(process)
+                pending[receiver] = index
+                controls.append(control_sender)
+
+            while pending:
+                messages = await loop.run_in_executor(None, _receive, list(pending))
+                for connection, message in messages:
+                    index = pending[connection]
+                    if message is None:
+                        del pending[connection]
+                        continue
+                    if isinstance(message, EOFError):
+                        raise BrokenProcessPool(f"Shard {index} exited before it finished")
+                    if isinstance(message, BaseException):
+                        raise message
+                    (position, _), batch = message
+                    for result in batch:
+                        results[position * count + index, result.sample_index] = result
+                        if journal is not None and _settled(result):
+                            journal.append(result)
+                        completed += 1
+                        live.add(result)
+                        if self.progress_callback:
+                            self.progress_callback(completed, total, result)
+        except BaseException:
+            # Whatever the shards did not report never ran.
+            results.update(not_executed(test_cases, results, resume))
+            raise
+        finally:
+            self._shards = []
+            for control in controls:
+                control.close()
+            # Workers that are done exit on their own; the rest are stopped now rather than
+            # after their shard, so cancelling does not wait for outstanding requests.
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            if journal is not None:
+                journal.close()
+            # Samples of a test case stay together; test cases keep their original order.
+            report = Report(results=[results[key] for key in sorted(results)], budget=self.budget)
+            self.last_report = Report.merge(previous, report)
+        return self.last_report
+
+    async def run_iter(self) -> AsyncGenerator[TestResult]:
+        """
+        Yields results as they complete, without collecting them into a Report.
+
+        With a journal, prompts that already have a journaled result are skipped and every
+        new result that is not skipped or errored is appended to the journal before it is
+        yielded.
+        """
+        if not self._test_cases:
+            return
+
+        test_cases: Sequence[Prompt] = self._test_cases
+        resume: dict[int, Resume] = {}
+        if self.journal is not None:
+            test_cases, resume = self._pending(self.journal)
+        async with contextlib.aclosing(self._run_journaled(test_cases, resume)) as batches:
+            async for _, batch in batches:
+                for result in batch:
+                    yield result
+
+    def _pending(self, journal: Journal) -> tuple[list[Prompt], dict[int, Resume]]:
+        """The prompts still lacking journaled results, and their progress by position."""
+        pending = journal.pending(self._test_cases, self.early_stopping)
+        return [prompt for prompt, _ in pending], dict(enumerate(r for _, r in pending))
+
+    async def _run_journaled(
+        self, test_cases: Sequence[Prompt], resume: dict[int, Resume]
+    ) -> AsyncGenerator[tuple[tuple[int, int], list[TestResult]]]:
+        """`Runner.run_batches` over `test_cases`, appending each new result to the journal."""
+        journal = self.journal
+        # Close the runner's iterator explicitly so an early exit cancels its workers now,
+        # not when the generator is garbage-collected.
+        try:
+            async with contextlib.aclosing(
+                self._create_runner().run_batches(test_cases, resume)
+            ) as batches:
+                async for key, batch in batches:
+                    if journal is not None:
+                        for result in batch:
+                            if _settled(result):
+                                journal.append(result)
+                    yield key, batch
+        finally:
+            if journal is not None:
+                journal.close()
+
+    def _create_runner(self) -> Runner:
         runner = Runner(
             provider=self.provider,
             max_concurrent=self.max_concurrent,
             progress_callback=self.progress_callback,
+            stream=self.stream,
+            adaptive=self.adaptive,
+            budget=self.budget,
+            early_stopping=self.early_stopping,
+            validation_executor=self.validation_executor,
+            deferred_retries=self.deferred_retries,
+            fair_scheduling=self.fair_scheduling,
         )
+        self._runner = runner
+        return runner
+
+
+def _settled(result: TestResult) -> bool:
+    """
+    Whether `result` goes into the journal. Skipped tests never ran and errored ones (e.g.
+    after `ProviderRetryExhaustedError`) did not finish, so a resumed session runs them.
+    """
+    return not result.skipped and result.execution_error is None
 
-        results = await runner.run(self._test_cases)
 
-        return Report(results=results)
+def _receive(connections: list[Connection]) -> list[tuple[Connection, Any]]:
+    """Waits for the next messages from shard workers; `EOFError()` for a closed pipe."""
+    messages: list[tuple[Connection, Any]] = []
+    for connection in wait(connections):
+        assert isinstance(connection, Connection)
+        try:
+            messages.append((connection, connection.recv()))
+        except EOFError as e:
+            messages.append((connection, e))
+    return messages
@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+
+from promptum.providers.protocol import LLMProvider
+from promptum.providers.retry import RetryConfig
+from promptum.session.budget import Budget
+from promptum.session.case import Prompt, Resume
+from promptum.session.concurrency import AdaptiveConcurrency
+from promptum.session.result import TestResult
+from promptum.session.runner import Runner
+from promptum.session.scheduling import FairScheduling
+from promptum.session.stopping import EarlyStopping
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    index: int
+    count: int
+
+
+ProviderFactory = Callable[[Shard], LLMProvider]
+
+
+def partition[T](items: Sequence[T], count: int) -> list[list[T]]:
+    """Deals items round-robin into `count` lists, so slow and fast cases spread evenly."""
+    return [list(items[i::count]) for i in range(count)]
+
+
+def split(total: int, count: int) -> list[int]:
+    """Splits `total` into `count` near-equal positive shares."""
+    base, extra = divmod(total, count)
+    return [max(1, base + (1 if i < extra else 0)) for i in range(count)]
+
+
+_Emit = Callable[[tuple[int, int], list[TestResult]], None]
+
+
+def serve_shard(
+    results: Connection,
+    control: Connection,
+    provider_factory: ProviderFactory,
+    shard: Shard,
+    test_cases: Sequence[Prompt],
+    resume: Mapping[int, Resume],
+    max_concurrent: int,
+    stream: bool,
+    adaptive: AdaptiveConcurrency | None,
+    budget: Budget | None,
+    early_stopping: EarlyStopping | None,
+    deferred_retries: RetryConfig | None,
+    fair_scheduling: FairScheduling | None,
+) -> None:
+    """
+    Worker process entry point of `Session.run_sharded`.
+
+    Sends `(key, results)` through `results` as each request of the shard completes (see
+    `Runner.run_batches`), then `None`, or the exception that ended the shard. A grace
+    period received on `control` stops the shard's runner. `resume` is keyed by position
+    in the shard's `test_cases`.
+    """
+    try:
+        asyncio.run(
+            _run_shard(
+                lambda key, batch: results.send((key, batch)),
+                control,
+                provider_factory,
+                shard,
+                test_cases,
+                resume,
+                max_concurrent,
+                stream,
+                adaptive,
+                budget,
+                early_stopping,
+                deferred_retries,
+                fair_scheduling,
+            )
+        )
+    except Exception as e:
+        results.send(e)
+    else:
+        results.send(None)
+    finally:
+        results.close()
+
+
+async def _run_shard(
+    emit: _Emit,
+    control: Connection | None,
+    provider_factory: ProviderFactory,
+    shard: Shard,
+    test_cases: Sequence[Prompt],
+    resume: Mapping[int, Resume],
+    max_concurrent: int,
+    stream: bool,
+    adaptive: AdaptiveConcurrency | None,
+    budget: Budget | None,
+    early_stopping: EarlyStopping | None,
+    deferred_retries: RetryConfig | None,
+    fair_scheduling: FairScheduling | None,
+) -> None:
+    provider = provider_factory(shard)
+    async with contextlib.AsyncExitStack() as stack:
+        # Clients such as OpenRouterClient open their connection pool on entry.
+        if isinstance(provider, contextlib.AbstractAsyncContextManager):
+            await stack.enter_async_context(provider)
+        runner = Runner(
+            provider,
+            max_concurrent=max_concurrent,
+            stream=stream,
+            adaptive=adaptive,
+            budget=budget,
+            early_stopping=early_stopping,
+            deferred_retries=deferred_retries,
+            fair_scheduling=fair_scheduling,
+        )
+        if control is not None:
+            _forward_stops(control, runner)
+        batches = await stack.enter_async_context(
+            contextlib.aclosing(runner.run_batches(test_cases, resume))
+        )
+        async for key, batch in batches:
+            emit(key, batch)
+
+
+def _forward_stops(control: Connection, runner: Runner) -> None:
+    """Calls `runner.stop` on this loop for every grace period the parent sends."""
+    loop = asyncio.get_running_loop()
+
+    def forward() -> None:
+        # Ends when the parent closes its end of the pipe, or once the loop is closed.
+        with contextlib.suppress(EOFError, OSError, RuntimeError):
+            while True:
+                loop.call_soon_threadsafe(runner.stop, control.recv())
+
+    threading.Thread(target=forward, daemon=True).start()
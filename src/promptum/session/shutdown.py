@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import Container, Iterable, Mapping, Sequence
+
+from promptum.session.budget import Execute, run_cancellable, skipped_result
+from promptum.session.case import Prompt, Resume, remaining_samples
+from promptum.session.result import TestResult
+
+
+def not_executed(
+    test_cases: Iterable[Prompt],
+    done: Container[tuple[int, int]],
+    resume: Mapping[int, Resume] | None = None,
+) -> dict[tuple[int, int], TestResult]:
+    """
+    Skipped results for every sample of `test_cases` that has no result.
+
+    Results are keyed by `(position in test_cases, sample index)`, as `Runner.run_batches`
+    reports them, so a prompt added twice or with some samples done is still accounted for.
+    Prompts in `resume` only account for their missing samples.
+    """
+    resume = resume or {}
+    return {
+        (position, sample_index): skipped_result(test_case, sample_index)
+        for position, test_case in enumerate(test_cases)
+        for sample_index in remaining_samples(test_case, resume.get(position))
+        if (position, sample_index) not in done
+    }
+
+
+class Shutdown:
+    """
+    Cooperative stop for a run in progress.
+
+    After `stop()`, later tests are skipped without calling the provider. Requests already
+    in flight finish, or are cancelled once the grace period runs out and reported as skipped.
+    """
+
+    def __init__(self):
+        self.stopping = False
+        self.cancelled = False
+        self._in_flight: set[asyncio.Future[tuple[list[TestResult], Exception | None]]] = set()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def stop(self, grace_period: float | None = None) -> None:
+        self.stopping = True
+        if grace_period is None or self.cancelled:
+            return
+        self.close()
+        if grace_period <= 0:
+            self.cancel()
+        else:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(grace_period, self.cancel)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        for task in self._in_flight:
+            task.cancel()
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def run(
+        self, test_case: Prompt, samples: Sequence[int], execute: Execute
+    ) -> tuple[list[TestResult], Exception | None]:
+        if self.stopping:
+            return [skipped_result(test_case, i) for i in samples], None
+        return await run_cancellable(
+            test_case, samples, execute, self._in_flight, lambda: self.cancelled
+        )
@@ -0,0 +1,208 @@
+import math
+import operator
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from itertools import repeat
+
+# `(count, zeros, min, max, sum, buckets)` of a batch, as `QuantileSketch._add_buckets` takes it.
+Batch = tuple[int, int, float, float, float, Mapping[int, int]]
+
+try:
+    import numpy as np
+
+    def _array_batch(values: object, multiplier: float, min_value: float) -> Batch | None:
+        """The batch of a non-empty NumPy array, bucketed in bulk; `None` for anything else."""
+        if not isinstance(values, np.ndarray) or not len(values):
+            return None
+        positive = values[values > min_value]
+        indices = np.ceil(np.log(positive) * multiplier).astype(np.int64)
+        buckets, counts = np.unique(indices, return_counts=True)
+        return (
+            len(values),
+            len(values) - len(positive),
+            values.min().item(),
+            values.max().item(),
+            values.sum().item(),
+            dict(zip(buckets.tolist(), counts.tolist(), strict=True)),
+        )
+
+except ModuleNotFoundError:
+
+    def _array_batch(values: object, multiplier: float, min_value: float) -> Batch | None:
+        return None
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with a bounded relative error (a DDSketch).
+
+    Values are counted in logarithmic buckets, so any quantile is within
+    `relative_accuracy` of a value of that rank, memory is bounded by `max_buckets` and
+    two sketches merge by adding their counts. Values at or below `min_value` (zero cost,
+    for instance) share one bucket. Once more than `max_buckets` are in use the lowest
+    buckets are folded together, which only loses accuracy at the bottom of the range.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        min_value: float = 1e-9,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        if max_buckets < 1:
+            raise ValueError(f"max_buckets must be at least 1, got {max_buckets}")
+        if min_value <= 0:
+            raise ValueError(f"min_value must be positive, got {min_value}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self.count = 0
+        self.zeros = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self._gamma)
+        self._buckets: Counter[int] = Counter()
+
+    @staticmethod
+    def of(values: Iterable[float], relative_accuracy: float = 0.01) -> "QuantileSketch":
+        sketch = QuantileSketch(relative_accuracy)
+        sketch.update(values)
+        return sketch
+
+    @staticmethod
+    def merge(*sketches: "QuantileSketch") -> "QuantileSketch":
+        """A new sketch holding the values of all `sketches`, which must share an accuracy."""
+        merged = QuantileSketch(*sketches[0]._config()) if sketches else QuantileSketch()
+        for sketch in sketches:
+            merged.add_sketch(sketch)
+        return merged
+
+    @property
+    def avg(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def add(self, value: float) -> None:
+        self._check(value)
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zeros += 1
+            return
+        buckets = self._buckets
+        index = math.ceil(math.log(value) * self._multiplier)
+        if index in buckets:
+            buckets[index] += 1
+        else:
+            buckets[index] = 1
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Adds every value; a NumPy array is bucketed without a Python call per value."""
+        array = _array_batch(values, self._multiplier, self.min_value)
+        if array is not None:
+            self._check(array[2])
+            self._add_buckets(*array)
+            return
+        batch = list(values)
+        if not batch:
+            return
+        low, high = min(batch), max(batch)
+        self._check(low)
+        positive = [v for v in batch if v > self.min_value]
+        # The bucket index of `add`, computed without a Python call per value.
+        logs = map(math.log, positive)
+        indices = map(math.ceil, map(operator.mul, logs, repeat(self._multiplier)))
+        self._add_buckets(
+            len(batch), len(batch) - len(positive), low, high, math.fsum(batch), Counter(indices)
+        )
+
+    def add_sketch(self, other: "QuantileSketch") -> None:
+        if other._config() != self._config():
+            raise ValueError("Cannot merge sketches with different accuracy settings")
+        self._add_buckets(other.count, other.zeros, other.min, other.max, other.sum, other._buckets)
+
+    def quantile(self, q: float) -> float:
+        """The value of rank `q` (0 for the minimum, 1 for the maximum); 0 when empty."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be between 0 and 1, got {q}")
+        if self.count == 0:
+            return 0.0
+        rank = round(q * (self.count - 1))
+        seen = self.zeros
+        if rank < seen or q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def histogram(self) -> list[tuple[float, float, int]]:
+        """`(lower, upper, count)` per non-empty bucket, lowest first."""
+        buckets = [(0.0, self.min_value, self.zeros)] if self.zeros else []
+        buckets.extend(
+            (self._gamma ** (index - 1), self._gamma**index, self._buckets[index])
+            for index in sorted(self._buckets)
+        )
+        return buckets
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, QuantileSketch):
+            return NotImplemented
+        return self._state() == other._state()
+
+    def __repr__(self) -> str:
+        return (
+            f"QuantileSketch(count={self.count}, p50={self.quantile(0.5):g}, "
+            f"p99={self.quantile(0.99):g}, relative_accuracy={self.relative_accuracy})"
+        )
+
+    def _state(self) -> tuple[object, ...]:
+        return self._config(), self.count, self.zeros, self.min, self.max, self._buckets
+
+    def _config(self) -> tuple[float, int, float]:
+        return self.relative_accuracy, self.max_buckets, self.min_value
+
+    def _check(self, value: float) -> None:
+        if not value >= 0:
+            raise ValueError(f"Sketched values must be non-negative, got {value}")
+
+    def _value(self, index: int) -> float:
+        # Midpoint of (gamma^(i-1), gamma^i] in relative terms.
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def _add_buckets(
+        self,
+        count: int,
+        zeros: int,
+        low: float,
+        high: float,
+        total: float,
+        buckets: Mapping[int, int],
+    ) -> None:
+        self.count += count
+        self.zeros += zeros
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+        self.sum += total
+        self._buckets.update(buckets)
+        self._collapse()
+
+    def _collapse(self) -> None:
+        excess = len(self._buckets) - self.max_buckets
+        if excess <= 0:
+            return
+        lowest = sorted(self._buckets)[: excess + 1]
+        folded = sum(self._buckets.pop(index) for index in lowest)
+        self._buckets[lowest[-1]] = folded
@@ -0,0 +1,64 @@
+import math
+import statistics
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+from promptum.session.case import Prompt
+from promptum.session.result import TestResult
+
+
+def pass_at_k(samples: int, passed: int, k: int) -> float:
+    """
+    Unbiased estimate of the probability that at least one of `k` samples passes.
+
+    Uses the estimator from Chen et al. (2021): `1 - C(samples - passed, k) / C(samples, k)`.
+    """
+    if not 0 < k <= samples:
+        raise ValueError(f"k must be between 1 and {samples}, got {k}")
+    if samples - passed < k:
+        return 1.0
+    return 1.0 - math.comb(samples - passed, k) / math.comb(samples, k)
+
+
+@dataclass(frozen=True, slots=True)
+class PromptStats:
+    test_case: Prompt
+    samples: int
+    passed: int
+    pass_rate: float
+    pass_rate_variance: float
+    pass_at_k: Mapping[int, float]
+    latencies_ms: Sequence[float]
+    avg_latency_ms: float
+    min_latency_ms: float
+    max_latency_ms: float
+    latency_stdev_ms: float
+
+    @property
+    def flaky(self) -> bool:
+        return 0 < self.passed < self.samples
+
+    @staticmethod
+    def from_results(results: Sequence[TestResult], k: Sequence[int] = (1,)) -> "PromptStats":
+        """Rolls up the samples of one prompt; skipped samples are left out."""
+        executed = [r for r in results if not r.skipped]
+        samples = len(executed)
+        passed = sum(1 for r in executed if r.passed)
+        pass_rate = passed / samples if samples else 0.0
+        latencies = tuple(
+            r.metrics.latency_ms for r in executed if r.metrics and not r.metrics.cached
+        )
+
+        return PromptStats(
+            test_case=results[0].test_case,
+            samples=samples,
+            passed=passed,
+            pass_rate=pass_rate,
+            pass_rate_variance=pass_rate * (1 - pass_rate) / samples if samples else 0.0,
+            pass_at_k={n: pass_at_k(samples, passed, n) for n in k if 0 < n <= samples},
+            latencies_ms=latencies,
+            avg_latency_ms=statistics.fmean(latencies) if latencies else 0.0,
+            min_latency_ms=min(latencies) if latencies else 0.0,
+            max_latency_ms=max(latencies) if latencies else 0.0,
+            latency_stdev_ms=statistics.pstdev(latencies) if latencies else 0.0,
+        )
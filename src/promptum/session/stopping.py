@@ -0,0 +1,160 @@
+import asyncio
+import math
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from statistics import NormalDist
+
+from promptum.session.case import Prompt, Resume, remaining_samples
+from promptum.session.result import TestResult
+
+Job = tuple[tuple[int, int], Prompt, Sequence[int]]
+
+
+def wilson_interval(passed: int, samples: int, confidence: float = 0.95) -> tuple[float, float]:
+    """Wilson score interval for a pass rate; `(0, 1)` when there are no samples."""
+    if samples == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = passed / samples
+    denominator = 1 + z * z / samples
+    center = (p + z * z / (2 * samples)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / samples + z * z / (4 * samples * samples)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+@dataclass(frozen=True, slots=True)
+class EarlyStopping:
+    """
+    Stops sampling a prompt once the Wilson interval on its pass rate is decisive.
+
+    A prompt is decided when the interval is at most `max_width` wide, or when it lies
+    entirely above or below `threshold`.
+    """
+
+    confidence: float = 0.95
+    max_width: float | None = 0.2
+    threshold: float | None = None
+    min_samples: int = 5
+
+    def __post_init__(self):
+        if not 0 < self.confidence < 1:
+            raise ValueError(f"confidence must be between 0 and 1, got {self.confidence}")
+        if self.max_width is None and self.threshold is None:
+            raise ValueError("Set max_width, threshold or both")
+        if self.min_samples < 1:
+            raise ValueError(f"min_samples must be at least 1, got {self.min_samples}")
+
+    def decided(self, passed: int, samples: int) -> bool:
+        if samples < self.min_samples:
+            return False
+        low, high = wilson_interval(passed, samples, self.confidence)
+        if self.max_width is not None and high - low <= self.max_width:
+            return True
+        return self.threshold is not None and (low > self.threshold or high < self.threshold)
+
+
+class _PromptState:
+    def __init__(self, ordinal: int, test_case: Prompt, resume: Resume | None):
+        self.ordinal = ordinal
+        self.test_case = test_case
+        self.remaining = remaining_samples(test_case, resume)
+        self.issued = 0
+        self.in_flight = 0
+        self.samples = resume.completed if resume is not None else 0
+        self.passed = resume.passed if resume is not None else 0
+        self.decided = False
+
+    @property
+    def open(self) -> bool:
+        return not self.decided and self.issued < len(self.remaining)
+
+    @property
+    def finished(self) -> bool:
+        return self.in_flight == 0 and not self.open
+
+
+class SampleScheduler:
+    """
+    Hands out samples to workers as they free up, preferring prompts with the fewest
+    samples so far, and stops issuing samples for prompts that `EarlyStopping` decided.
+
+    Up to `workers` prompts are sampled at a time; samples already in flight when a
+    prompt is decided still complete and are reported. A prompt in `resume` (keyed by its
+    position) only gets its missing samples, counted on top of its earlier ones.
+    """
+
+    def __init__(
+        self,
+        test_cases: Iterable[Prompt],
+        early_stopping: EarlyStopping,
+        workers: int,
+        batched: bool = False,
+        resume: Mapping[int, Resume] | None = None,
+    ):
+        self.early_stopping = early_stopping
+        self.workers = workers
+        self.batched = batched
+        self.resume = resume or {}
+        self._source: Iterator[tuple[int, Prompt]] = enumerate(test_cases)
+        self._exhausted = False
+        self._active: dict[int, _PromptState] = {}
+        self._changed = asyncio.Event()
+
+    async def next(self) -> Job | None:
+        while True:
+            state = min(
+                (s for s in self._active.values() if s.open),
+                key=lambda s: s.issued,
+                default=None,
+            )
+            if (state is None or len(self._active) < self.workers) and not self._exhausted:
+                state = self._admit() or state
+            if state is not None:
+                return self._issue(state)
+            if not self._active:
+                return None
+            self._changed.clear()
+            await self._changed.wait()
+
+    def complete(self, job: Job, results: list[TestResult]) -> None:
+        state = self._active[job[0][0]]
+        state.in_flight -= 1
+        for result in results:
+            if result.skipped:
+                # The budget ran out; further samples would be skipped too.
+                state.decided = True
+                continue
+            state.samples += 1
+            state.passed += result.passed
+        if not state.decided:
+            state.decided = self.early_stopping.decided(state.passed, state.samples)
+        if state.finished:
+            del self._active[state.ordinal]
+        self._changed.set()
+
+    def release(self, job: Job) -> None:
+        # The prompt's samples stay in flight while the job waits out its backoff.
+        pass
+
+    def reacquire(self, job: Job) -> None:
+        pass
+
+    def _admit(self) -> _PromptState | None:
+        for ordinal, test_case in self._source:
+            state = _PromptState(ordinal, test_case, self.resume.get(ordinal))
+            state.decided = self.early_stopping.decided(state.passed, state.samples)
+            if state.open:
+                self._active[ordinal] = state
+                return state
+        self._exhausted = True
+        return None
+
+    def _issue(self, state: _PromptState) -> Job:
+        size = 1
+        if self.batched and state.issued == 0:
+            # Nothing can be decided before `min_samples`, so those go out as one batch.
+            size = max(1, self.early_stopping.min_samples - state.samples)
+        samples = state.remaining[state.issued : state.issued + size]
+        state.issued += len(samples)
+        state.in_flight += 1
+        return (state.ordinal, samples[0]), state.test_case, samples
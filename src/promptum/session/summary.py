@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from promptum.session.budget import Budget
+from promptum.session.sketch import QuantileSketch
 
 
 @dataclass(frozen=True, slots=True)
@@ -14,3 +17,86 @@ class Summary:
     total_tokens: int
     execution_errors: int
     validation_failures: int
+    cached: int = 0
+    coalesced: int = 0
+    skipped: int = 0
+    budget: Budget | None = None
+    # Mutable, so left out of equality and hashing; compare the percentiles instead.
+    latency_sketch: QuantileSketch | None = field(default=None, compare=False)
+    cost_sketch: QuantileSketch | None = field(default=None, compare=False)
+
+    @property
+    def p50_latency_ms(self) -> float:
+        return self.latency_quantile(0.5)
+
+    @property
+    def p90_latency_ms(self) -> float:
+        return self.latency_quantile(0.9)
+
+    @property
+    def p95_latency_ms(self) -> float:
+        return self.latency_quantile(0.95)
+
+    @property
+    def p99_latency_ms(self) -> float:
+        return self.latency_quantile(0.99)
+
+    @property
+    def p50_cost_usd(self) -> float:
+        return self.cost_quantile(0.5)
+
+    @property
+    def p90_cost_usd(self) -> float:
+        return self.cost_quantile(0.9)
+
+    @property
+    def p95_cost_usd(self) -> float:
+        return self.cost_quantile(0.95)
+
+    @property
+    def p99_cost_usd(self) -> float:
+        return self.cost_quantile(0.99)
+
+    def latency_quantile(self, q: float) -> float:
+        return self.latency_sketch.quantile(q) if self.latency_sketch is not None else 0.0
+
+    def cost_quantile(self, q: float) -> float:
+        return self.cost_sketch.quantile(q) if self.cost_sketch is not None else 0.0
+
+    @staticmethod
+    def merge(*summaries: "Summary") -> "Summary":
+        """
+        Combines the summaries of disjoint result sets (e.g. shards or `group_by` buckets).
+
+        Latency averages are weighted by each summary's `latency_sketch`; summaries without
+        one contribute to the counts, cost and tokens only.
+        """
+        latency = [s.latency_sketch for s in summaries if s.latency_sketch is not None]
+        cost = [s.cost_sketch for s in summaries if s.cost_sketch is not None]
+        latency_sketch = QuantileSketch.merge(*latency)
+        total = sum(s.total for s in summaries)
+        passed = sum(s.passed for s in summaries)
+        skipped = sum(s.skipped for s in summaries)
+        execution_errors = sum(s.execution_errors for s in summaries)
+        validation_failures = sum(s.validation_failures for s in summaries)
+        live = latency_sketch.count
+
+        return Summary(
+            total=total,
+            passed=passed,
+            failed=execution_errors + validation_failures,
+            pass_rate=passed / (total - skipped) if total > skipped else 0,
+            avg_latency_ms=latency_sketch.avg,
+            min_latency_ms=latency_sketch.min if live else 0,
+            max_latency_ms=latency_sketch.max if live else 0,
+            total_cost_usd=sum(s.total_cost_usd for s in summaries),
+            total_tokens=sum(s.total_tokens for s in summaries),
+            execution_errors=execution_errors,
+            validation_failures=validation_failures,
+            cached=sum(s.cached for s in summaries),
+            coalesced=sum(s.coalesced for s in summaries),
+            skipped=skipped,
+            budget=next((s.budget for s in summaries if s.budget is not None), None),
+            latency_sketch=latency_sketch,
+            cost_sketch=QuantileSketch.merge(*cost),
+        )
@@ -0,0 +1,17 @@
+from promptum.testing.server import (
+    FixedLatency,
+    LatencyDistribution,
+    LogNormalLatency,
+    MockServer,
+    MockServerConfig,
+    UniformLatency,
+)
+
+__all__ = [
+    "FixedLatency",
+    "LatencyDistribution",
+    "LogNormalLatency",
+    "MockServer",
+    "MockServerConfig",
+    "UniformLatency",
+]
@@ -0,0 +1,40 @@
+"""Runs the mock server in its own process: `python -m promptum.testing --port 8080`."""
+
+import argparse
+import asyncio
+import contextlib
+
+from promptum.testing.server import LogNormalLatency, MockServer, MockServerConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--median-latency", type=float, default=0.05)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--completion-tokens", type=int, default=16)
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--server-error-probability", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockServerConfig(
+        latency=LogNormalLatency(args.median_latency, args.latency_sigma),
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        rate_limit_probability=args.rate_limit_probability,
+        server_error_probability=args.server_error_probability,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    server = MockServer(config, host=args.host, port=args.port)
+    print(f"Serving {server.base_url}", flush=True)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class LatencyDistribution(Protocol):
+    def sample(self, rng: random.Random) -> float:
+        """Returns a delay in seconds."""
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class FixedLatency:
+    seconds: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+@dataclass(frozen=True, slots=True)
+class UniformLatency:
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass(frozen=True, slots=True)
+class LogNormalLatency:
+    """Long-tailed latency: `median` seconds with log-space standard deviation `sigma`."""
+
+    median: float
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+@dataclass(frozen=True, slots=True)
+class MockServerConfig:
+    latency: LatencyDistribution = FixedLatency()
+    tokens_per_second: float | None = None
+    completion_tokens: int = 16
+    rate_limit_probability: float = 0.0
+    server_error_probability: float = 0.0
+    server_error_status: int = 503
+    retry_after: float | None = None
+    cost_per_token: float = 1e-6
+    respond: Callable[[dict[str, Any]], str] | None = None
+    seed: int | None = None
+
+
+class MockServer:
+    """
+    Local stand-in for the OpenRouter API, for load and soak tests without network access.
+
+    Serves `POST .../chat/completions` (plain, streaming and with `n` choices) and
+    `GET .../models` over HTTP/1.1 keep-alive. Latency, token rate and injected 429/5xx
+    responses follow the config; `stats` counts the responses sent by status code.
+    """
+
+    def __init__(
+        self,
+        config: MockServerConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or MockServerConfig()
+        self.host = host
+        self.port = port
+        self.stats: Counter[int] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/v1"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        self._server.close_clients()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> "MockServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                await self._handle(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        path = path.split("?", 1)[0].rstrip("/")
+        if method == "GET" and path.endswith("/models"):
+            await self._send_json(writer, 200, {"data": []})
+            return
+        if method != "POST" or not path.endswith("/chat/completions"):
+            await self._send_json(writer, 404, {"error": {"message": f"No route for {path}"}})
+            return
+
+        try:
+            payload = json.loads(body)
+            messages = payload["messages"]
+        except (ValueError, KeyError, TypeError):
+            await self._send_json(writer, 400, {"error": {"message": "Invalid request body"}})
+            return
+
+        config = self.config
+        roll = self._rng.random()
+        if roll < config.rate_limit_probability:
+            await self._send_error(writer, 429)
+            return
+        if roll < config.rate_limit_probability + config.server_error_probability:
+            await self._send_error(writer, config.server_error_status)
+            return
+
+        tokens = self._completion(payload)
+        # Extra choices requested with `n` are generated the same way as the first.
+        extra = [self._completion(payload) for _ in range(int(payload.get("n", 1)) - 1)]
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4 + 1
+        completion_tokens = len(tokens) + sum(len(choice) for choice in extra)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cost": (prompt_tokens + completion_tokens) * config.cost_per_token,
+        }
+        model = payload.get("model", "mock")
+
+        await asyncio.sleep(config.latency.sample(self._rng))
+        if payload.get("stream"):
+            await self._send_stream(writer, model, tokens, usage)
+            return
+
+        if config.tokens_per_second:
+            await asyncio.sleep(max(map(len, [tokens, *extra])) / config.tokens_per_second)
+        await self._send_json(
+            writer,
+            200,
+            {
+                "id": f"mock-{time.monotonic_ns()}",
+                "model": model,
+                "choices": [
+                    {
+                        "index": index,
+                        "message": {"role": "assistant", "content": "".join(choice)},
+                        "finish_reason": "stop",
+                    }
+                    for index, choice in enumerate([tokens, *extra])
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _completion(self, payload: dict[str, Any]) -> list[str]:
+        if self.config.respond is not None:
+            # Space-separated words stand in for tokens.
+            words = self.config.respond(payload).split(" ")
+            return [word + " " for word in words[:-1]] + [words[-1]]
+        count = self.config.completion_tokens
+        max_tokens = payload.get("max_tokens")
+        if max_tokens is not None:
+            count = min(count, max_tokens)
+        return [f"token{i} " for i in range(count)]
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int) -> None:
+        headers = {}
+        if self.config.retry_after is not None:
+            headers["Retry-After"] = f"{self.config.retry_after:g}"
+        await self._send_json(writer, status, {"error": {"code": status}}, headers)
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        data: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        body = json.dumps(data).encode()
+        fields = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            **(headers or {}),
+        }
+        lines = [_status_line(status)] + [f"{name}: {value}" for name, value in fields.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+        self.stats[status] += 1
+
+    async def _send_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        model: str,
+        tokens: list[str],
+        usage: dict[str, Any],
+    ) -> None:
+        head = [
+            _status_line(200),
+            "Content-Type: text/event-stream",
+            "Transfer-Encoding: chunked",
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+        _write_chunk(writer, b": OPENROUTER PROCESSING\n\n")
+
+        delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second else 0.0
+        for i, token in enumerate(tokens):
+            if i > 0 and delay:
+                await asyncio.sleep(delay)
+            chunk = {"model": model, "choices": [{"index": 0, "delta": {"content": token}}]}
+            _write_chunk(writer, f"data: {json.dumps(chunk)}\n\n".encode())
+            await writer.drain()
+
+        final = {"model": model, "choices": [], "usage": usage}
+        _write_chunk(writer, f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        self.stats[200] += 1
+
+
+def _status_line(status: int) -> str:
+    return f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}"
+
+
+def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, str], bytes] | None:
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
@@ -1,4 +1,4 @@
-from promptum.validation.protocol import Validator
+from promptum.validation.protocol import Validator, is_cpu_heavy
 from promptum.validation.validators import (
     Contains,
     ExactMatch,
@@ -12,4 +12,5 @@ __all__ = [
     "Contains",
     "Regex",
     "JsonSchema",
+    "is_cpu_heavy",
 ]
@@ -14,3 +14,12 @@ class Validator(Protocol):
     def describe(self) -> str:
         """Returns a human-readable description of validation criteria."""
         ...
+
+
+def is_cpu_heavy(validator: Validator) -> bool:
+    """
+    Whether a validator declared `cpu_heavy = True`.
+
+    `Runner` runs such validators on its `validation_executor` instead of the event loop.
+    """
+    return getattr(validator, "cpu_heavy", False) is True
@@ -1,7 +1,7 @@
 import json
 import re
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, ClassVar
 
 
 @dataclass(frozen=True, slots=True)
@@ -49,6 +49,8 @@ class Contains:
 
 @dataclass(frozen=True, slots=True)
 class Regex:
+    cpu_heavy: ClassVar[bool] = True
+
     pattern: str
     flags: int = 0
 
@@ -65,6 +67,8 @@ class Regex:
 
 @dataclass(frozen=True, slots=True)
 class JsonSchema:
+    cpu_heavy: ClassVar[bool] = True
+
     required_keys: tuple[str, ...] = ()
 
     def validate(self, response: str) -> tuple[bool, dict[str, Any]]:
@@ -3,7 +3,7 @@ from datetime import UTC, datetime
 import pytest
 
 from promptum.providers import Metrics
-from promptum.session import Prompt, Report, TestResult
+from promptum.session import Prompt, Report, TestResult, columns
 from promptum.validation import Contains
 
 
@@ -58,3 +58,33 @@ def sample_results() -> list[TestResult]:
 @pytest.fixture
 def sample_report(sample_results: list[TestResult]) -> Report:
     return Report(results=sample_results)
+
+
+@pytest.fixture
+def cached_report() -> Report:
+    prompt = Prompt(name="t", prompt="p", model="m", validator=Contains("x"))
+    return Report(
+        results=[
+            TestResult(
+                test_case=prompt,
+                response="x",
+                passed=True,
+                metrics=Metrics(latency_ms=200.0, total_tokens=10, cost_usd=0.02),
+                validation_details={},
+            ),
+            TestResult(
+                test_case=prompt,
+                response="x",
+                passed=True,
+                metrics=Metrics(latency_ms=0.1, total_tokens=10, cost_usd=0.02, cached=True),
+                validation_details={},
+            ),
+        ]
+    )
+
+
+@pytest.fixture(params=sorted(columns.BACKENDS))
+def column_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Builds report columns with each available backend in turn."""
+    monkeypatch.setattr(columns, "_backend", columns.BACKENDS[request.param])
+    return request.param
@@ -1,4 +1,11 @@
+from dataclasses import replace
+
+import pytest
+
 from promptum.session import Report
+from promptum.session import TestResult as _TestResult
+
+pytestmark = pytest.mark.usefixtures("column_backend")
 
 
 def test_report_filter_by_model(sample_report: Report) -> None:
@@ -40,3 +47,79 @@ def test_report_group_by_model(sample_report: Report) -> None:
     assert "model2" in grouped
     assert len(grouped["model1"].results) == 2
     assert len(grouped["model2"].results) == 1
+
+
+def test_report_merge_concatenates_results(sample_report: Report) -> None:
+    first = sample_report.filter(passed=True)
+    second = sample_report.filter(passed=False)
+
+    merged = Report.merge(first, second)
+
+    assert merged.results == first.results + second.results
+    assert Report.merge().results == ()
+
+
+def test_report_filter_unknown_model(sample_report: Report) -> None:
+    assert sample_report.filter(model="missing").results == ()
+
+
+def test_report_group_by_model_column(sample_report: Report) -> None:
+    grouped = sample_report.group_by("model")
+
+    assert list(grouped) == ["model1", "model2"]
+    assert [r.test_case.name for r in grouped["model1"].results] == ["test1", "test2"]
+    assert [r.test_case.name for r in grouped["model2"].results] == ["test3"]
+
+
+def test_report_group_by_tag_column(sample_report: Report) -> None:
+    grouped = sample_report.group_by("tag")
+
+    assert list(grouped) == ["math", "easy", "geography"]
+    assert [r.test_case.name for r in grouped["math"].results] == ["test1", "test3"]
+    assert [r.test_case.name for r in grouped["easy"].results] == ["test1"]
+
+
+def test_report_group_by_unknown_column(sample_report: Report) -> None:
+    with pytest.raises(ValueError, match="Cannot group by 'name'"):
+        sample_report.group_by("name")  # ty: ignore[invalid-argument-type]
+
+
+def test_derived_reports_reuse_the_columns(sample_report: Report) -> None:
+    math = sample_report.filter(tags=("math",))
+    easy = math.group_by("tag")["easy"]
+
+    # Derived reports take their columns from the parent instead of reading the rows.
+    assert math._columns is not None
+    assert easy.get_summary() == Report(results=easy.results).get_summary()
+    assert easy.filter(passed=False).results == ()
+    assert math.get_summary() == Report(results=math.results).get_summary()
+
+
+def test_empty_report_columns() -> None:
+    report = Report(results=[])
+
+    assert report.filter(model="model1").results == ()
+    assert report.filter(tags=("math",), passed=True).results == ()
+    assert report.group_by("model") == {}
+    assert report.group_by("tag") == {}
+
+
+def test_report_group_by_tag_without_tagged_rows(sample_results: list[_TestResult]) -> None:
+    untagged = [replace(r, test_case=replace(r.test_case, tags=())) for r in sample_results]
+    report = Report(results=untagged)
+
+    assert report.group_by("tag") == {}
+    assert report.filter(tags=("math",)).results == ()
+    assert list(report.group_by("model")) == ["model1", "model2"]
+
+
+def test_report_group_by_tag_skips_untagged_rows(sample_results: list[_TestResult]) -> None:
+    first = sample_results[0]
+    report = Report(
+        results=[replace(first, test_case=replace(first.test_case, tags=())), *sample_results]
+    )
+
+    grouped = report.group_by("tag")
+
+    assert [r.test_case.name for r in grouped["math"].results] == ["test1", "test3"]
+    assert grouped["easy"].filter(tags=("easy",)).get_summary().total == 1
@@ -1,4 +1,9 @@
-from promptum.session import Report
+import pytest
+
+from promptum.session import Budget, Report, Summary
+from promptum.session.budget import skipped_result
+
+pytestmark = pytest.mark.usefixtures("column_backend")
 
 
 def test_report_summary(sample_report: Report) -> None:
@@ -30,3 +35,94 @@ def test_report_summary_empty() -> None:
     assert summary.max_latency_ms == 0
     assert summary.execution_errors == 0
     assert summary.validation_failures == 0
+
+
+def test_report_summary_excludes_cached_replays_from_latency_and_cost(
+    cached_report: Report,
+) -> None:
+    summary = cached_report.get_summary()
+
+    assert summary.total == 2
+    assert summary.passed == 2
+    assert summary.cached == 1
+    assert summary.avg_latency_ms == 200.0
+    assert summary.min_latency_ms == 200.0
+    assert summary.total_cost_usd == 0.02
+    assert summary.total_tokens == 10
+
+
+def test_report_summary_counts_skipped_apart_from_failures(sample_report: Report) -> None:
+    budget = Budget(max_cost_usd=0.05)
+    skipped = skipped_result(sample_report.results[0].test_case)
+    report = Report.merge(Report(results=[]), Report([*sample_report.results, skipped], budget))
+
+    summary = report.get_summary()
+
+    assert summary.total == 4
+    assert summary.skipped == 1
+    assert summary.failed == 1
+    assert summary.pass_rate == 2 / 3
+    assert summary.budget == budget
+
+
+def test_report_summary_percentiles(sample_report: Report) -> None:
+    summary = sample_report.get_summary()
+
+    assert summary.p50_latency_ms == pytest.approx(120.0, rel=0.01)
+    assert summary.p99_latency_ms == pytest.approx(150.0, rel=0.01)
+    assert summary.p50_cost_usd == pytest.approx(0.015, rel=0.01)
+    assert summary.p90_cost_usd == pytest.approx(0.02, rel=0.01)
+    assert Report(results=[]).get_summary().p95_latency_ms == 0
+
+
+def test_report_summary_percentiles_skip_cached_replays(cached_report: Report) -> None:
+    summary = cached_report.get_summary()
+
+    assert summary.latency_sketch is not None
+    assert summary.latency_sketch.count == 1
+    assert summary.p50_latency_ms == 200.0
+
+
+def test_merged_summaries_match_the_overall_summary(sample_report: Report) -> None:
+    overall = sample_report.get_summary()
+    parts = [r.get_summary() for r in sample_report.group_by("model").values()]
+
+    merged = Summary.merge(*parts)
+
+    assert merged.latency_sketch == overall.latency_sketch
+    assert merged.cost_sketch == overall.cost_sketch
+    assert merged.p90_latency_ms == overall.p90_latency_ms
+    assert (merged.total, merged.passed, merged.failed) == (3, 2, 1)
+    assert merged.pass_rate == overall.pass_rate
+    assert merged.avg_latency_ms == pytest.approx(overall.avg_latency_ms)
+    assert (merged.min_latency_ms, merged.max_latency_ms) == (100.0, 150.0)
+    assert merged.total_cost_usd == pytest.approx(overall.total_cost_usd)
+
+
+def test_summaries_are_hashable(sample_report: Report) -> None:
+    summary = sample_report.get_summary()
+
+    assert hash(summary) == hash(Report(results=sample_report.results).get_summary())
+    assert {summary, sample_report.get_summary()} == {summary}
+
+
+def test_merged_summaries_without_sketches() -> None:
+    summary = Summary(
+        total=1,
+        passed=0,
+        failed=1,
+        pass_rate=0.0,
+        avg_latency_ms=0,
+        min_latency_ms=0,
+        max_latency_ms=0,
+        total_cost_usd=0,
+        total_tokens=0,
+        execution_errors=1,
+        validation_failures=0,
+    )
+
+    merged = Summary.merge(summary, summary)
+
+    assert (merged.total, merged.failed, merged.pass_rate) == (2, 2, 0)
+    assert merged.p99_latency_ms == 0
+    assert summary.p99_cost_usd == 0
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from promptum.providers.cache import CachedProvider, ResponseCache, cache_key
+from promptum.providers.metrics import Metrics
+from promptum.providers.retry import RetryConfig
+
+
+def _provider(content: str = "answer") -> AsyncMock:
+    provider = AsyncMock()
+    provider.generate.return_value = (
+        content,
+        Metrics(latency_ms=250.0, total_tokens=30, cost_usd=0.01, retry_delays=(1.0,)),
+    )
+    return provider
+
+
+def test_cache_key_is_stable_and_ignores_kwarg_order():
+    first = cache_key("p", "m", top_p=0.9, seed=1)
+    second = cache_key("p", "m", seed=1, top_p=0.9)
+
+    assert first == second
+    assert len(first) == 64
+
+
+def test_cache_key_ignores_retry_config():
+    assert cache_key("p", "m") == cache_key("p", "m", retry_config=RetryConfig(max_attempts=9))
+
+
+def test_cache_key_distinguishes_request_fields():
+    base = cache_key("p", "m", "sys", 0.0, 100)
+
+    assert base != cache_key("p2", "m", "sys", 0.0, 100)
+    assert base != cache_key("p", "m2", "sys", 0.0, 100)
+    assert base != cache_key("p", "m", None, 0.0, 100)
+    assert base != cache_key("p", "m", "sys", 0.5, 100)
+    assert base != cache_key("p", "m", "sys", 0.0, 200)
+    assert base != cache_key("p", "m", "sys", 0.0, 100, top_p=0.5)
+    assert base != cache_key("p", "m", "sys", 0.0, 100, sample_index=1)
+    assert base == cache_key("p", "m", "sys", 0.0, 100, sample_index=0)
+
+
+async def test_cached_provider_replays_identical_request():
+    provider = _provider()
+    cached = CachedProvider(provider)
+
+    first_content, first_metrics = await cached.generate(prompt="p", model="m", temperature=0.0)
+    second_content, second_metrics = await cached.generate(prompt="p", model="m", temperature=0.0)
+
+    assert provider.generate.await_count == 1
+    assert first_content == second_content == "answer"
+    assert first_metrics.cached is False
+    assert second_metrics.cached is True
+    assert second_metrics.retry_delays == ()
+    assert second_metrics.cost_usd == 0.01
+    assert second_metrics.latency_ms < first_metrics.latency_ms
+
+
+async def test_cached_provider_misses_on_different_request():
+    provider = _provider()
+    cached = CachedProvider(provider)
+
+    await cached.generate(prompt="p", model="m")
+    await cached.generate(prompt="p", model="m", max_tokens=10)
+
+    assert provider.generate.await_count == 2
+
+
+async def test_cached_provider_forwards_retry_config():
+    provider = _provider()
+    cached = CachedProvider(provider)
+    config = RetryConfig(max_attempts=1)
+
+    await cached.generate(prompt="p", model="m", retry_config=config)
+
+    assert provider.generate.await_args.kwargs["retry_config"] is config
+
+
+async def test_cached_provider_does_not_cache_errors():
+    provider = _provider()
+    provider.generate.side_effect = [ValueError("boom"), ("ok", Metrics(latency_ms=1.0))]
+    cached = CachedProvider(provider)
+
+    with pytest.raises(ValueError):
+        await cached.generate(prompt="p", model="m")
+    content, metrics = await cached.generate(prompt="p", model="m")
+
+    assert content == "ok"
+    assert metrics.cached is False
+
+
+async def test_cached_provider_generate_stream_uses_inner_stream():
+    class StreamingProvider:
+        async def generate(self, **kwargs):
+            raise AssertionError("should stream")
+
+        async def generate_stream(self, **kwargs):
+            return "streamed", Metrics(latency_ms=5.0, time_to_first_token_ms=1.0)
+
+    cached = CachedProvider(StreamingProvider())
+
+    content, _ = await cached.generate_stream(prompt="p", model="m")
+    replay, metrics = await cached.generate_stream(prompt="p", model="m")
+
+    assert content == replay == "streamed"
+    assert metrics.cached is True
+
+
+async def test_cached_provider_generate_stream_falls_back_to_generate():
+    provider = _provider()
+    cached = CachedProvider(provider)
+
+    content, _ = await cached.generate_stream(prompt="p", model="m")
+
+    assert content == "answer"
+    provider.generate.assert_awaited_once()
+
+
+async def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    metrics = Metrics(latency_ms=1.0)
+
+    await cache.set("a", "A", metrics)
+    await cache.set("b", "B", metrics)
+    await cache.get("a")
+    await cache.set("c", "C", metrics)
+
+    assert await cache.get("a") is not None
+    assert await cache.get("b") is None
+    assert await cache.get("c") is not None
+
+
+async def test_memory_tier_expires_after_ttl(monkeypatch):
+    cache = ResponseCache(ttl=10.0)
+    await cache.set("a", "A", Metrics(latency_ms=1.0))
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11.0)
+
+    assert await cache.get("a") is None
+
+
+async def test_disk_tier_persists_across_instances(tmp_path: Path):
+    metrics = Metrics(latency_ms=12.0, total_tokens=7, retry_delays=(0.5,))
+    await ResponseCache(directory=tmp_path).set("abcd", "stored", metrics)
+
+    hit = await ResponseCache(directory=tmp_path).get("abcd")
+
+    assert hit == ("stored", metrics)
+
+
+async def test_disk_tier_ignores_unknown_metrics_fields(tmp_path: Path):
+    path = tmp_path / "ab" / "abcd.json"
+    path.parent.mkdir()
+    path.write_text(
+        json.dumps(
+            {
+                "created_at": time.time(),
+                "content": "old",
+                "metrics": {"latency_ms": 1.0, "retry_delays": [], "removed_field": 1},
+            }
+        )
+    )
+
+    hit = await ResponseCache(directory=tmp_path).get("abcd")
+
+    assert hit == ("old", Metrics(latency_ms=1.0))
+
+
+async def test_disk_tier_drops_corrupt_entries(tmp_path: Path):
+    path = tmp_path / "ab" / "abcd.json"
+    path.parent.mkdir()
+    path.write_text("{not json")
+
+    assert await ResponseCache(directory=tmp_path).get("abcd") is None
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"content": "no timestamp", "metrics": {"latency_ms": 1.0}},
+        {"created_at": 1.0, "content": "bad metrics", "metrics": {"retry_delays": []}},
+        ["not", "an", "object"],
+    ],
+)
+async def test_disk_tier_treats_malformed_entries_as_misses(tmp_path: Path, data: object):
+    path = tmp_path / "ab" / "abcd.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(data))
+
+    assert await ResponseCache(directory=tmp_path).get("abcd") is None
+    assert not path.exists()
+
+
+async def test_concurrent_misses_on_one_key_all_write(tmp_path: Path):
+    provider = _provider()
+    cached = CachedProvider(provider, ResponseCache(directory=tmp_path, max_disk_bytes=10_000))
+
+    responses = await asyncio.gather(*(cached.generate("p", "m") for _ in range(32)))
+
+    assert {content for content, _ in responses} == {"answer"}
+    assert [p.name for p in tmp_path.glob("*/*")] == [f"{cache_key('p', 'm')}.json"]
+    assert await ResponseCache(directory=tmp_path).get(cache_key("p", "m")) is not None
+
+
+async def test_disk_tier_expires_after_ttl(tmp_path: Path, monkeypatch):
+    await ResponseCache(directory=tmp_path).set("abcd", "stored", Metrics(latency_ms=1.0))
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 100.0)
+
+    assert await ResponseCache(directory=tmp_path, ttl=10.0).get("abcd") is None
+    assert not (tmp_path / "ab" / "abcd.json").exists()
+
+
+async def test_disk_tier_evicts_oldest_entries_over_size_limit(tmp_path: Path):
+    metrics = Metrics(latency_ms=1.0)
+    await ResponseCache(directory=tmp_path).set("aaaa", "x" * 100, metrics)
+    entry_size = (tmp_path / "aa" / "aaaa.json").stat().st_size
+
+    # Slack for the few bytes by which serialized timestamps can differ.
+    cache = ResponseCache(directory=tmp_path, max_disk_bytes=entry_size * 2 + 16)
+    await cache.set("bbbb", "x" * 100, metrics)
+    await cache.set("cccc", "x" * 100, metrics)
+    await cache.set("dddd", "x" * 100, metrics)
+
+    remaining = sorted(p.stem for p in tmp_path.glob("*/*.json"))
+    assert len(remaining) == 2
+    assert "dddd" in remaining
+
+
+async def test_clear_removes_memory_and_disk_entries(tmp_path: Path):
+    cache = ResponseCache(directory=tmp_path)
+    await cache.set("abcd", "stored", Metrics(latency_ms=1.0))
+
+    cache.clear()
+
+    assert await cache.get("abcd") is None
+    assert list(tmp_path.glob("*/*.json")) == []
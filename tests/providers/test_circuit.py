@@ -0,0 +1,150 @@
+import pytest
+
+from promptum.providers.circuit import CircuitBreaker, CircuitState
+from promptum.providers.exceptions import ProviderCircuitOpenError
+
+
+class _FakeClockBreaker(CircuitBreaker):
+    def __init__(self, *args, **kwargs):
+        self.now = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _now(self) -> float:
+        return self.now
+
+
+def _trip(breaker: CircuitBreaker, model: str = "m") -> None:
+    for _ in range(breaker.min_requests):
+        breaker.before_request(model)
+        breaker.record(model, False)
+
+
+def test_circuit_starts_closed():
+    breaker = CircuitBreaker()
+
+    breaker.before_request("m")
+
+    assert breaker.state("m") is CircuitState.CLOSED
+    assert breaker.retry_after("m") is None
+
+
+def test_circuit_opens_at_failure_rate_threshold():
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_requests=4, window_size=4)
+
+    for success in (True, False, True, False):
+        breaker.before_request("m")
+        breaker.record("m", success)
+
+    assert breaker.state("m") is CircuitState.OPEN
+
+
+def test_circuit_stays_closed_below_min_requests():
+    breaker = CircuitBreaker(min_requests=5)
+
+    for _ in range(4):
+        breaker.before_request("m")
+        breaker.record("m", False)
+
+    assert breaker.state("m") is CircuitState.CLOSED
+
+
+def test_circuit_stays_closed_below_threshold():
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_requests=4, window_size=4)
+
+    for success in (True, True, True, False, True):
+        breaker.before_request("m")
+        breaker.record("m", success)
+
+    assert breaker.state("m") is CircuitState.CLOSED
+
+
+def test_neutral_outcomes_are_not_counted():
+    breaker = CircuitBreaker(min_requests=2)
+
+    for _ in range(5):
+        breaker.before_request("m")
+        breaker.record("m", None)
+
+    assert breaker.state("m") is CircuitState.CLOSED
+
+
+def test_open_circuit_fails_fast_with_retry_after():
+    breaker = _FakeClockBreaker(min_requests=2, recovery_timeout=30.0)
+    _trip(breaker)
+    breaker.now = 10.0
+
+    with pytest.raises(ProviderCircuitOpenError) as exc_info:
+        breaker.before_request("m")
+
+    assert exc_info.value.model == "m"
+    assert exc_info.value.retry_after == 20.0
+    assert breaker.retry_after("m") == 20.0
+
+
+def test_circuits_are_independent_per_model():
+    breaker = CircuitBreaker(min_requests=2)
+    _trip(breaker, "down")
+
+    breaker.before_request("up")
+
+    assert breaker.state("up") is CircuitState.CLOSED
+
+
+def test_half_open_admits_limited_probes():
+    breaker = _FakeClockBreaker(min_requests=2, recovery_timeout=30.0, half_open_probes=1)
+    _trip(breaker)
+    breaker.now = 31.0
+
+    breaker.before_request("m")
+
+    assert breaker.state("m") is CircuitState.HALF_OPEN
+    with pytest.raises(ProviderCircuitOpenError):
+        breaker.before_request("m")
+
+
+def test_successful_probes_close_circuit():
+    breaker = _FakeClockBreaker(min_requests=2, recovery_timeout=30.0, half_open_probes=2)
+    _trip(breaker)
+    breaker.now = 31.0
+
+    breaker.before_request("m")
+    breaker.before_request("m")
+    breaker.record("m", True)
+    assert breaker.state("m") is CircuitState.HALF_OPEN
+    breaker.record("m", True)
+
+    assert breaker.state("m") is CircuitState.CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = _FakeClockBreaker(min_requests=2, recovery_timeout=30.0)
+    _trip(breaker)
+    breaker.now = 31.0
+
+    breaker.before_request("m")
+    breaker.record("m", False)
+
+    assert breaker.state("m") is CircuitState.OPEN
+    assert breaker.retry_after("m") == 30.0
+
+
+def test_neutral_probe_frees_probe_slot():
+    breaker = _FakeClockBreaker(min_requests=2, recovery_timeout=30.0)
+    _trip(breaker)
+    breaker.now = 31.0
+
+    breaker.before_request("m")
+    breaker.record("m", None)
+    breaker.before_request("m")
+
+    assert breaker.state("m") is CircuitState.HALF_OPEN
+
+
+def test_late_outcome_while_open_is_ignored():
+    breaker = CircuitBreaker(min_requests=2)
+    breaker.before_request("m")
+    _trip(breaker)
+
+    breaker.record("m", True)
+
+    assert breaker.state("m") is CircuitState.OPEN
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from promptum.providers.coalescing import CoalescingProvider
+from promptum.providers.exceptions import ProviderTransientError
+from promptum.providers.metrics import Metrics
+from promptum.session.budget import Budget
+from promptum.session.case import Prompt
+from promptum.session.report import Report
+from promptum.session.runner import Runner
+
+
+class _SlowProvider:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.stream_calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        self.calls.append((prompt, kwargs))
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return f"answer to {prompt}", Metrics(latency_ms=100.0, total_tokens=10, cost_usd=0.5)
+
+    async def generate_stream(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        self.stream_calls += 1
+        return await self.generate(prompt, **kwargs)
+
+
+async def _settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_identical_deterministic_requests_share_one_call():
+    provider = _SlowProvider()
+    coalescing = CoalescingProvider(provider)
+
+    tasks = [asyncio.create_task(coalescing.generate("p", "m", temperature=0.0)) for _ in range(3)]
+    await _settle()
+    assert coalescing.in_flight == 1
+    provider.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(provider.calls) == 1
+    assert coalescing.in_flight == 0
+    assert {content for content, _ in results} == {"answer to p"}
+    leader, *followers = [metrics for _, metrics in results]
+    assert leader.coalesced is False
+    assert leader.latency_ms == 100.0
+    assert all(m.coalesced and m.cost_usd == 0.5 for m in followers)
+
+
+async def test_sampled_requests_are_not_coalesced():
+    provider = _SlowProvider()
+    provider.release.set()
+    coalescing = CoalescingProvider(provider)
+
+    results = await asyncio.gather(*(coalescing.generate("p", "m") for _ in range(2)))
+
+    assert len(provider.calls) == 2
+    assert not any(metrics.coalesced for _, metrics in results)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {"prompt": "q", "model": "m"},
+        {"prompt": "p", "model": "m2"},
+        {"prompt": "p", "model": "m", "max_tokens": 5},
+        {"prompt": "p", "model": "m", "seed": 1},
+    ],
+)
+async def test_different_requests_are_not_coalesced(other: dict[str, Any]):
+    provider = _SlowProvider()
+    coalescing = CoalescingProvider(provider)
+
+    first = asyncio.create_task(coalescing.generate("p", "m", temperature=0.0))
+    second = asyncio.create_task(coalescing.generate(temperature=0.0, **other))
+    await _settle()
+    provider.release.set()
+    await asyncio.gather(first, second)
+
+    assert len(provider.calls) == 2
+
+
+async def test_errors_are_shared_with_every_caller():
+    provider = _SlowProvider(error=ProviderTransientError(1, []))
+    coalescing = CoalescingProvider(provider)
+
+    tasks = [asyncio.create_task(coalescing.generate("p", "m", temperature=0.0)) for _ in range(2)]
+    await _settle()
+    provider.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert len(provider.calls) == 1
+    assert all(isinstance(r, ProviderTransientError) for r in results)
+    assert coalescing.in_flight == 0
+
+
+async def test_cancelling_one_caller_keeps_the_request_for_the_others():
+    provider = _SlowProvider()
+    coalescing = CoalescingProvider(provider)
+
+    leader = asyncio.create_task(coalescing.generate("p", "m", temperature=0.0))
+    follower = asyncio.create_task(coalescing.generate("p", "m", temperature=0.0))
+    await _settle()
+    leader.cancel()
+    await _settle()
+    provider.release.set()
+
+    content, metrics = await follower
+    assert leader.cancelled()
+    assert content == "answer to p"
+    assert metrics.coalesced is True
+    assert provider.cancelled == 0
+
+
+async def test_request_is_cancelled_when_every_caller_is():
+    provider = _SlowProvider()
+    coalescing = CoalescingProvider(provider)
+
+    tasks = [asyncio.create_task(coalescing.generate("p", "m", temperature=0.0)) for _ in range(2)]
+    await _settle()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await _settle()
+
+    assert provider.cancelled == 1
+    assert coalescing.in_flight == 0
+
+
+async def test_streamed_and_plain_requests_do_not_share_a_call():
+    provider = _SlowProvider()
+    coalescing = CoalescingProvider(provider)
+
+    plain = asyncio.create_task(coalescing.generate("p", "m", temperature=0.0))
+    streamed = asyncio.create_task(coalescing.generate_stream("p", "m", temperature=0.0))
+    await _settle()
+    provider.release.set()
+    await asyncio.gather(plain, streamed)
+
+    assert len(provider.calls) == 2
+    assert provider.stream_calls == 1
+
+
+async def test_runner_counts_coalesced_cost_once():
+    validator = MagicMock()
+    validator.validate.return_value = (True, {})
+    provider = _SlowProvider()
+    provider.release.set()
+    prompts = [
+        Prompt(name=str(i), prompt="same", model="m", validator=validator, temperature=0.0)
+        for i in range(3)
+    ]
+    runner = Runner(CoalescingProvider(provider), max_concurrent=3, budget=Budget(max_cost_usd=1.0))
+
+    results = await runner.run(prompts)
+    summary = Report(results=tuple(results)).get_summary()
+
+    assert len(provider.calls) == 1
+    assert not any(r.skipped for r in results)
+    assert summary.coalesced == 2
+    assert summary.total_cost_usd == 0.5
+    assert summary.total_tokens == 10
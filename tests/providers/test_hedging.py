@@ -0,0 +1,34 @@
+from promptum.providers.hedging import LatencyTracker
+
+
+def test_percentile_without_samples_is_none():
+    assert LatencyTracker().percentile("m", 0.95) is None
+
+
+def test_percentile_uses_nearest_rank():
+    tracker = LatencyTracker()
+    for seconds in range(1, 101):
+        tracker.record("m", float(seconds))
+
+    assert tracker.percentile("m", 0.5) == 50.0
+    assert tracker.percentile("m", 0.95) == 95.0
+    assert tracker.percentile("m", 1.0) == 100.0
+    assert tracker.percentile("m", 0.0) == 1.0
+
+
+def test_window_keeps_most_recent_samples():
+    tracker = LatencyTracker(window_size=3)
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        tracker.record("m", seconds)
+
+    assert tracker.count("m") == 3
+    assert tracker.percentile("m", 1.0) == 3.0
+
+
+def test_samples_are_tracked_per_model():
+    tracker = LatencyTracker()
+    tracker.record("fast", 0.1)
+    tracker.record("slow", 5.0)
+
+    assert tracker.percentile("fast", 0.99) == 0.1
+    assert tracker.count("other") == 0
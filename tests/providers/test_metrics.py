@@ -1,3 +1,5 @@
+import json
+
 from promptum.providers import Metrics
 
 
@@ -20,3 +22,19 @@ def test_metrics_without_cost() -> None:
     metrics = Metrics(latency_ms=100.0)
     assert metrics.cost_usd is None
     assert metrics.prompt_tokens is None
+
+
+def test_metrics_stream_fields_default_to_none() -> None:
+    metrics = Metrics(latency_ms=100.0)
+    assert metrics.time_to_first_token_ms is None
+    assert metrics.inter_token_latency_ms is None
+    assert metrics.tokens_per_second is None
+
+
+def test_metrics_dict_round_trip_through_json() -> None:
+    metrics = Metrics(latency_ms=12.0, total_tokens=7, retry_delays=(0.5, 1.0), cached=True)
+
+    data = json.loads(json.dumps(metrics.to_dict()))
+
+    assert Metrics.from_dict(data) == metrics
+    assert Metrics.from_dict({**data, "unknown_field": 1}) == metrics
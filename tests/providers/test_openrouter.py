@@ -1,17 +1,25 @@
+import asyncio
+import json
+from collections.abc import Callable
 from typing import Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
 
+from promptum.providers.circuit import CircuitBreaker, CircuitState
 from promptum.providers.exceptions import (
+    ProviderCircuitOpenError,
+    ProviderError,
     ProviderHTTPStatusError,
     ProviderNotInitializedError,
     ProviderResponseParseError,
     ProviderRetryExhaustedError,
     ProviderTransientError,
 )
+from promptum.providers.hedging import HedgingConfig
 from promptum.providers.openrouter import OpenRouterClient
+from promptum.providers.ratelimit import RateLimit, RateLimiter, estimate_tokens
 from promptum.providers.retry import RetryConfig, RetryStrategy
 
 
@@ -26,6 +34,28 @@ def _make_response(
     )
 
 
+def _sse_body(*chunks: dict[str, Any]) -> bytes:
+    lines = [": OPENROUTER PROCESSING", ""]
+    for chunk in chunks:
+        lines += [f"data: {json.dumps(chunk)}", ""]
+    lines += ["data: [DONE]", ""]
+    return "\n".join(lines).encode()
+
+
+def _delta(content: str) -> dict[str, Any]:
+    return {"choices": [{"delta": {"content": content}}]}
+
+
+def _mock_transport(
+    client: OpenRouterClient,
+    handler: Callable[[httpx.Request], httpx.Response],
+) -> None:
+    client._client = httpx.AsyncClient(
+        base_url="https://fake",
+        transport=httpx.MockTransport(handler),
+    )
+
+
 async def test_generate_without_context_manager_raises_not_initialized():
     client = OpenRouterClient(api_key="test-key")
 
@@ -67,7 +97,7 @@ async def test_generate_with_system_prompt_includes_system_message(
 
         await client.generate(prompt="hello", model="m", system_prompt="Be helpful")
 
-        payload = client._client.post.call_args[1]["json"]
+        payload = json.loads(client._client.post.call_args[1]["content"])
         assert payload["messages"][0] == {"role": "system", "content": "Be helpful"}
         assert payload["messages"][1] == {"role": "user", "content": "hello"}
 
@@ -81,7 +111,7 @@ async def test_generate_without_system_prompt_has_only_user_message(
 
         await client.generate(prompt="hello", model="m")
 
-        payload = client._client.post.call_args[1]["json"]
+        payload = json.loads(client._client.post.call_args[1]["content"])
         assert len(payload["messages"]) == 1
         assert payload["messages"][0]["role"] == "user"
 
@@ -95,7 +125,7 @@ async def test_generate_with_max_tokens_includes_in_payload(
 
         await client.generate(prompt="hello", model="m", max_tokens=512)
 
-        payload = client._client.post.call_args[1]["json"]
+        payload = json.loads(client._client.post.call_args[1]["content"])
         assert payload["max_tokens"] == 512
 
 
@@ -108,7 +138,7 @@ async def test_generate_without_max_tokens_omits_from_payload(
 
         await client.generate(prompt="hello", model="m")
 
-        payload = client._client.post.call_args[1]["json"]
+        payload = json.loads(client._client.post.call_args[1]["content"])
         assert "max_tokens" not in payload
 
 
@@ -121,11 +151,48 @@ async def test_generate_passes_extra_kwargs_to_payload(
 
         await client.generate(prompt="hello", model="m", top_p=0.9, frequency_penalty=0.5)
 
-        payload = client._client.post.call_args[1]["json"]
+        payload = json.loads(client._client.post.call_args[1]["content"])
         assert payload["top_p"] == 0.9
         assert payload["frequency_penalty"] == 0.5
 
 
+async def test_generate_samples_requests_n_choices_in_one_call(
+    no_retry_config: RetryConfig,
+):
+    body = {
+        "choices": [
+            {"index": 1, "message": {"content": "b"}},
+            {"index": 0, "message": {"content": "a"}},
+        ],
+        "usage": {"prompt_tokens": 4, "completion_tokens": 6, "total_tokens": 10},
+    }
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, body))
+
+        contents, metrics = await client.generate_samples(prompt="hi", model="m", n=2)
+        payload = json.loads(client._client.post.call_args[1]["content"])
+
+        assert client._client.post.await_count == 1
+        with pytest.raises(ProviderResponseParseError, match="Expected 3 choices, got 2"):
+            await client.generate_samples(prompt="hi", model="m", n=3)
+
+    assert payload["n"] == 2
+    assert contents == ["a", "b"]
+    assert metrics.total_tokens == 10
+
+
+def test_compile_samples_reserves_tokens_for_every_choice():
+    client = OpenRouterClient(api_key="k")
+
+    single = client.compile("hello", "m", max_tokens=100)
+    batched = client.compile("hello", "m", max_tokens=100, samples=4)
+
+    assert batched is not single
+    assert batched.samples == 4
+    assert batched.estimated_tokens == single.estimated_tokens + 300
+    assert "n" not in json.loads(single.body)
+
+
 async def test_generate_metrics_with_missing_usage(
     minimal_api_response: dict[str, Any],
     no_retry_config: RetryConfig,
@@ -367,8 +434,608 @@ async def test_generate_uses_per_call_retry_config_over_default(
         client._client.post = AsyncMock(side_effect=responses)
         client._sleep = AsyncMock()
 
-        content, _ = await client.generate(
-            prompt="hello", model="m", retry_config=per_call_config
+        content, _ = await client.generate(prompt="hello", model="m", retry_config=per_call_config)
+
+    assert content == "Hello, world!"
+
+
+async def test_generate_stream_without_context_manager_raises_not_initialized():
+    client = OpenRouterClient(api_key="test-key")
+
+    with pytest.raises(ProviderNotInitializedError):
+        await client.generate_stream(prompt="hello", model="test-model")
+
+
+async def test_generate_stream_joins_deltas_and_records_stream_metrics(
+    no_retry_config: RetryConfig,
+):
+    body = _sse_body(
+        _delta("Hello"),
+        _delta(", "),
+        _delta("world!"),
+        {
+            "choices": [{"delta": {}}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8, "cost": 0.2},
+        },
+    )
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=body)
+
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        _mock_transport(client, handler)
+
+        content, metrics = await client.generate_stream(prompt="hello", model="m")
+
+    assert content == "Hello, world!"
+    assert json.loads(requests[0].content)["stream"] is True
+    assert metrics.completion_tokens == 3
+    assert metrics.total_tokens == 8
+    assert metrics.cost_usd == 0.2
+    assert metrics.time_to_first_token_ms is not None
+    assert 0 < metrics.time_to_first_token_ms <= metrics.latency_ms
+    assert metrics.inter_token_latency_ms is not None
+    assert metrics.tokens_per_second is not None
+
+
+async def test_generate_stream_without_tokens_leaves_stream_metrics_empty(
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        _mock_transport(client, lambda request: httpx.Response(200, content=_sse_body()))
+
+        content, metrics = await client.generate_stream(prompt="hello", model="m")
+
+    assert content == ""
+    assert metrics.time_to_first_token_ms is None
+    assert metrics.inter_token_latency_ms is None
+    assert metrics.tokens_per_second is None
+
+
+async def test_generate_stream_invalid_chunk_raises_parse_error(
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        _mock_transport(client, lambda request: httpx.Response(200, content=b"data: {bad\n\n"))
+
+        with pytest.raises(ProviderResponseParseError):
+            await client.generate_stream(prompt="hello", model="m")
+
+
+async def test_generate_stream_retries_on_retryable_status(
+    retry_config_3_attempts: RetryConfig,
+):
+    responses = [
+        httpx.Response(429, content=b"slow down"),
+        httpx.Response(200, content=_sse_body(_delta("ok"))),
+    ]
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=retry_config_3_attempts
+    ) as client:
+        _mock_transport(client, lambda request: responses.pop(0))
+        client._sleep = AsyncMock()
+
+        content, metrics = await client.generate_stream(prompt="hello", model="m")
+
+    assert content == "ok"
+    assert len(metrics.retry_delays) == 1
+
+
+async def test_generate_stream_non_retryable_status_raises_http_status_error(
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        _mock_transport(client, lambda request: httpx.Response(401, content=b"bad key"))
+
+        with pytest.raises(ProviderHTTPStatusError) as exc_info:
+            await client.generate_stream(prompt="hello", model="m")
+
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.response_body == "bad key"
+
+
+async def test_generate_rejects_stream_override():
+    async with OpenRouterClient(api_key="test-key") as client:
+        with pytest.raises(ValueError, match="stream"):
+            await client.generate(prompt="hello", model="test-model", stream=True)
+
+
+async def test_generate_sends_auth_header_to_chat_completions_url(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=successful_api_response)
+
+    async with OpenRouterClient(
+        api_key="secret", base_url="https://fake/api/v1/", default_retry_config=no_retry_config
+    ) as client:
+        _mock_transport(client, handler)
+
+        await client.generate(prompt="hello", model="m")
+
+    assert str(requests[0].url) == "https://fake/api/v1/chat/completions"
+    assert requests[0].headers["Authorization"] == "Bearer secret"
+
+
+async def test_context_manager_applies_pool_limits():
+    limits = httpx.Limits(max_connections=7, max_keepalive_connections=3, keepalive_expiry=1.5)
+
+    async with OpenRouterClient(api_key="k", limits=limits) as client:
+        pool = client._client._transport._pool
+
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 1.5
+
+
+async def test_shared_http_client_is_reused_and_left_open():
+    shared = OpenRouterClient.create_http_client()
+
+    async with OpenRouterClient(api_key="a", http_client=shared) as first:
+        assert first._client is shared
+    async with OpenRouterClient(api_key="b", http_client=shared) as second:
+        assert second._client is shared
+
+    assert not shared.is_closed
+    await shared.aclose()
+
+
+class _DelayedPoolTransport(httpx.AsyncBaseTransport):
+    def __init__(self, pool_delay: float, body: dict[str, Any]):
+        self.pool_delay = pool_delay
+        self.body = body
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.pool_delay)
+        trace = request.extensions["trace"]
+        await trace("connection.connect_tcp.started", {})
+        return httpx.Response(200, json=self.body)
+
+
+async def test_generate_reports_pool_wait_separately_from_latency(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        client._client = httpx.AsyncClient(
+            transport=_DelayedPoolTransport(0.05, successful_api_response)
         )
 
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert metrics.pool_wait_ms is not None
+    assert metrics.pool_wait_ms >= 40
+    assert metrics.latency_ms < metrics.pool_wait_ms
+
+
+async def test_generate_without_trace_events_leaves_pool_wait_empty(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, successful_api_response))
+
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert metrics.pool_wait_ms is None
+
+
+async def test_warmup_opens_requested_connections():
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"data": []})
+
+    async with OpenRouterClient(api_key="k", base_url="https://fake/api/v1") as client:
+        _mock_transport(client, handler)
+
+        await client.warmup(connections=3)
+
+    assert paths == ["/api/v1/models"] * 3
+
+
+async def test_warmup_ignores_http_errors():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused")
+
+    async with OpenRouterClient(api_key="k") as client:
+        _mock_transport(client, handler)
+
+        await client.warmup(connections=2)
+
+
+async def test_warmup_without_context_manager_raises_not_initialized():
+    with pytest.raises(ProviderNotInitializedError):
+        await OpenRouterClient(api_key="k").warmup()
+
+
+async def test_generate_waits_for_rate_limiter_and_records_wait(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    limiter = RateLimiter({"m": RateLimit(tokens_per_minute=1000)})
+    limiter.acquire = AsyncMock(return_value=0.25)
+    limiter.reconcile = MagicMock()
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=no_retry_config, rate_limiter=limiter
+    ) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, successful_api_response))
+
+        _, metrics = await client.generate(prompt="hello", model="m", max_tokens=50)
+
+    limiter.acquire.assert_awaited_once_with("m", estimate_tokens("hello", None, 50))
+    limiter.reconcile.assert_called_once_with("m", estimate_tokens("hello", None, 50), 30)
+    assert metrics.rate_limit_wait_ms == 250.0
+
+
+async def test_generate_stream_records_rate_limit_wait(no_retry_config: RetryConfig):
+    limiter = RateLimiter({"m": RateLimit(requests_per_minute=10)})
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=no_retry_config, rate_limiter=limiter
+    ) as client:
+        _mock_transport(client, lambda request: httpx.Response(200, content=_sse_body()))
+
+        _, metrics = await client.generate_stream(prompt="hello", model="m")
+
+    assert metrics.rate_limit_wait_ms is not None
+
+
+async def test_generate_refunds_tokens_for_failed_attempts(
+    successful_api_response: dict[str, Any],
+    retry_config_3_attempts: RetryConfig,
+):
+    limiter = RateLimiter({"m": RateLimit(tokens_per_minute=1000)})
+    limiter.reconcile = MagicMock()
+    responses = [
+        httpx.ReadTimeout("slow"),
+        _make_response(429),
+        _make_response(200, successful_api_response),
+    ]
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=retry_config_3_attempts, rate_limiter=limiter
+    ) as client:
+        client._client.post = AsyncMock(side_effect=responses)
+        client._sleep = AsyncMock()
+
+        await client.generate(prompt="hello", model="m")
+
+    estimate = estimate_tokens("hello", None, None)
+    assert [c.args for c in limiter.reconcile.call_args_list] == [
+        ("m", estimate, 0),
+        ("m", estimate, 0),
+        ("m", estimate, 30),
+    ]
+
+
+async def test_generate_without_rate_limiter_leaves_wait_empty(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, successful_api_response))
+
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert metrics.rate_limit_wait_ms is None
+
+
+async def test_generate_open_circuit_fails_fast_without_request(no_retry_config: RetryConfig):
+    breaker = CircuitBreaker(min_requests=1)
+    breaker.before_request("m")
+    breaker.record("m", False)
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=no_retry_config, circuit_breaker=breaker
+    ) as client:
+        client._client.post = AsyncMock()
+
+        with pytest.raises(ProviderCircuitOpenError):
+            await client.generate(prompt="hello", model="m")
+
+    client._client.post.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    ("responses", "expected_state"),
+    [
+        ([_make_response(500)] * 3, CircuitState.OPEN),
+        ([httpx.ReadTimeout("slow")] * 3, CircuitState.OPEN),
+        ([_make_response(503)], CircuitState.OPEN),
+        ([_make_response(400)], CircuitState.CLOSED),
+    ],
+    ids=["retry_exhausted", "transient", "server_error", "client_error"],
+)
+async def test_generate_records_failures_in_circuit_breaker(
+    responses: list[Any],
+    expected_state: CircuitState,
+):
+    breaker = CircuitBreaker(min_requests=1)
+    config = RetryConfig(
+        max_attempts=len(responses), initial_delay=0.01, retryable_status_codes=(500,)
+    )
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=config, circuit_breaker=breaker
+    ) as client:
+        client._client.post = AsyncMock(side_effect=responses)
+        client._sleep = AsyncMock()
+
+        with pytest.raises(ProviderError):
+            await client.generate(prompt="hello", model="m")
+
+    assert breaker.state("m") is expected_state
+
+
+async def test_generate_success_closes_half_open_circuit(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    breaker = CircuitBreaker(min_requests=1, recovery_timeout=0.0)
+    breaker.before_request("m")
+    breaker.record("m", False)
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=no_retry_config, circuit_breaker=breaker
+    ) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, successful_api_response))
+
+        await client.generate(prompt="hello", model="m")
+
+    assert breaker.state("m") is CircuitState.CLOSED
+
+
+async def test_generate_stops_retrying_when_circuit_opens_during_backoff(
+    retry_config_3_attempts: RetryConfig,
+):
+    breaker = CircuitBreaker(min_requests=1)
+
+    async def trip_during_sleep(delay: float) -> None:
+        breaker.record("m", False)
+
+    async with OpenRouterClient(
+        api_key="k", default_retry_config=retry_config_3_attempts, circuit_breaker=breaker
+    ) as client:
+        client._client.post = AsyncMock(return_value=_make_response(500))
+        client._sleep = trip_during_sleep
+
+        with pytest.raises(ProviderCircuitOpenError):
+            await client.generate(prompt="hello", model="m")
+
+    assert client._client.post.await_count == 1
+
+
+def _hedging_client(successful_api_response: dict[str, Any], delays: list[float]):
+    client = OpenRouterClient(
+        api_key="k",
+        default_retry_config=RetryConfig(max_attempts=1),
+        hedging=HedgingConfig(percentile=0.9, min_samples=3),
+    )
+    for _ in range(3):
+        client.latency_tracker.record("m", 0.02)
+
+    async def post(*args: Any, **kwargs: Any) -> httpx.Response:
+        await asyncio.sleep(delays.pop(0))
+        return _make_response(200, successful_api_response)
+
+    return client, post
+
+
+async def test_generate_hedges_slow_request_and_takes_faster_copy(
+    successful_api_response: dict[str, Any],
+):
+    client, post = _hedging_client(successful_api_response, [1.0, 0.01])
+
+    async with client:
+        client._client.post = AsyncMock(side_effect=post)
+
+        content, metrics = await client.generate(prompt="hello", model="m")
+
+    assert content == "Hello, world!"
+    assert client._client.post.await_count == 2
+    assert metrics.hedged is True
+    assert metrics.hedge_won is True
+
+
+async def test_generate_fast_request_is_not_hedged(successful_api_response: dict[str, Any]):
+    client, post = _hedging_client(successful_api_response, [0.0])
+
+    async with client:
+        client._client.post = AsyncMock(side_effect=post)
+
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert client._client.post.await_count == 1
+    assert metrics.hedged is False
+    assert client.latency_tracker.count("m") == 4
+
+
+async def test_generate_primary_can_win_after_hedge_fires(successful_api_response: dict[str, Any]):
+    client, post = _hedging_client(successful_api_response, [0.05, 1.0])
+
+    async with client:
+        client._client.post = AsyncMock(side_effect=post)
+
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert metrics.hedged is True
+    assert metrics.hedge_won is False
+
+
+async def test_generate_hedge_succeeds_when_primary_fails(successful_api_response: dict[str, Any]):
+    client, _ = _hedging_client(successful_api_response, [])
+    calls = 0
+
+    async def post(*args: Any, **kwargs: Any) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            return _make_response(403)
+        await asyncio.sleep(0.1)
+        return _make_response(200, successful_api_response)
+
+    async with client:
+        client._client.post = AsyncMock(side_effect=post)
+
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert metrics.hedge_won is True
+
+
+async def test_generate_hedged_raises_when_both_copies_fail(
+    successful_api_response: dict[str, Any],
+):
+    client, _ = _hedging_client(successful_api_response, [])
+
+    async def post(*args: Any, **kwargs: Any) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return _make_response(403)
+
+    async with client:
+        client._client.post = AsyncMock(side_effect=post)
+
+        with pytest.raises(ProviderHTTPStatusError):
+            await client.generate(prompt="hello", model="m")
+
+
+async def test_generate_without_enough_samples_does_not_hedge(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(
+        api_key="k",
+        default_retry_config=no_retry_config,
+        hedging=HedgingConfig(min_samples=5),
+    ) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, successful_api_response))
+
+        _, metrics = await client.generate(prompt="hello", model="m")
+
+    assert metrics.hedged is False
+    assert client.latency_tracker.count("m") == 1
+
+
+def test_compile_reuses_serialized_request():
+    client = OpenRouterClient(api_key="k")
+
+    first = client.compile("hello", "m", system_prompt="sys", max_tokens=10, top_p=0.5)
+    second = client.compile("hello", "m", system_prompt="sys", max_tokens=10, top_p=0.5)
+
+    assert first is second
+    assert json.loads(first.body) == {
+        "model": "m",
+        "messages": [
+            {"role": "system", "content": "sys"},
+            {"role": "user", "content": "hello"},
+        ],
+        "temperature": 1.0,
+        "max_tokens": 10,
+        "top_p": 0.5,
+    }
+    assert first.estimated_tokens == estimate_tokens("hello", "sys", 10)
+
+
+def test_compile_stream_sets_stream_flag():
+    client = OpenRouterClient(api_key="k")
+
+    compiled = client.compile("hello", "m", stream=True)
+
+    assert compiled.stream is True
+    assert json.loads(compiled.body)["stream"] is True
+    assert client.compile("hello", "m") is not compiled
+
+
+def test_compile_evicts_least_recently_used():
+    client = OpenRouterClient(api_key="k", max_compiled=2)
+
+    a = client.compile("a", "m")
+    client.compile("b", "m")
+    client.compile("a", "m")
+    client.compile("c", "m")
+
+    assert client.compile("a", "m") is a
+    assert len(client._compiled) == 2
+
+
+def test_compile_without_cache_builds_fresh_requests():
+    uncached = OpenRouterClient(api_key="k", max_compiled=0)
+
+    assert uncached.compile("a", "m") is not uncached.compile("a", "m")
+    assert len(uncached._compiled) == 0
+
+
+def test_compile_keys_container_kwargs_by_value():
+    client = OpenRouterClient(api_key="k")
+    stop = ["\n"]
+
+    first = client.compile("a", "m", stop=stop, response_format={"type": "json_object"})
+    assert client.compile("a", "m", stop=["\n"], response_format={"type": "json_object"}) is first
+    stop.append("END")
+    assert json.loads(client.compile("a", "m", stop=stop).body)["stop"] == ["\n", "END"]
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        ({"temperature": 1}, {"temperature": 1.0}),
+        ({"temperature": 1, "seed": True}, {"temperature": 1, "seed": 1}),
+        ({"logit_bias": {"42": 1}}, {"logit_bias": {"42": True}}),
+        ({"stop": [1]}, {"stop": [1.0]}),
+    ],
+)
+def test_compile_keeps_equal_values_of_different_types_apart(
+    first: dict[str, Any], second: dict[str, Any]
+):
+    client = OpenRouterClient(api_key="k")
+
+    a = client.compile("a", "m", **first)
+    b = client.compile("a", "m", **second)
+
+    assert a is not b
+    assert a.body != b.body
+
+
+async def test_generate_retries_send_identical_bytes(
+    successful_api_response: dict[str, Any],
+):
+    bodies: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        if len(bodies) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json=successful_api_response)
+
+    config = RetryConfig(max_attempts=2, initial_delay=0.01)
+    async with OpenRouterClient(api_key="k", default_retry_config=config) as client:
+        _mock_transport(client, handler)
+        client._sleep = AsyncMock()
+
+        await client.generate(prompt="hello", model="m")
+
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1]
+
+
+async def test_generate_compiled_sends_precompiled_request(
+    successful_api_response: dict[str, Any],
+    no_retry_config: RetryConfig,
+):
+    async with OpenRouterClient(api_key="k", default_retry_config=no_retry_config) as client:
+        client._client.post = AsyncMock(return_value=_make_response(200, successful_api_response))
+        compiled = client.compile("hello", "m")
+
+        content, _ = await client.generate_compiled(compiled)
+
     assert content == "Hello, world!"
+    assert client._client.post.call_args[1]["content"] is compiled.body
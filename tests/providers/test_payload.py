@@ -0,0 +1,11 @@
+from promptum.providers.payload import decode_json, encode_json
+
+
+def test_encode_json_is_compact_and_round_trips():
+    data = {"model": "m", "messages": [{"role": "user", "content": "héllo"}]}
+
+    encoded = encode_json(data)
+
+    assert b" " not in encoded
+    assert decode_json(encoded) == data
+    assert decode_json(encoded.decode()) == data
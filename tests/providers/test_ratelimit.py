@@ -0,0 +1,117 @@
+import asyncio
+
+from promptum.providers.ratelimit import RateLimit, RateLimiter, estimate_tokens
+
+
+class _FakeClockLimiter(RateLimiter):
+    def __init__(self, *args, **kwargs):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+        super().__init__(*args, **kwargs)
+
+    def _now(self) -> float:
+        return self.now
+
+    async def _sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def test_estimate_tokens_counts_prompt_system_and_max_tokens():
+    assert estimate_tokens("a" * 40, "b" * 8, 100) == 40 // 4 + 8 // 4 + 1 + 100
+    assert estimate_tokens("", None, None) == 1
+
+
+async def test_unconfigured_model_is_not_limited():
+    limiter = _FakeClockLimiter({"other": RateLimit(requests_per_minute=1)})
+
+    for _ in range(5):
+        assert await limiter.acquire("free-model", tokens=1000) == 0.0
+    assert limiter.sleeps == []
+
+
+async def test_requests_per_minute_waits_when_bucket_is_empty():
+    limiter = _FakeClockLimiter({"m": RateLimit(requests_per_minute=60)})
+
+    for _ in range(60):
+        await limiter.acquire("m")
+    waited = await limiter.acquire("m")
+
+    assert waited == 1.0
+    assert limiter.sleeps == [1.0]
+
+
+async def test_tokens_per_minute_waits_for_token_budget():
+    limiter = _FakeClockLimiter({"m": RateLimit(tokens_per_minute=600)})
+
+    await limiter.acquire("m", tokens=600)
+    waited = await limiter.acquire("m", tokens=100)
+
+    assert waited == 10.0
+
+
+async def test_oversized_request_waits_for_full_bucket_only():
+    limiter = _FakeClockLimiter({"m": RateLimit(tokens_per_minute=600)})
+
+    await limiter.acquire("m", tokens=300)
+    waited = await limiter.acquire("m", tokens=10_000)
+
+    assert waited == 30.0
+
+
+async def test_default_limit_applies_per_model():
+    limiter = _FakeClockLimiter(default=RateLimit(requests_per_minute=1))
+
+    await limiter.acquire("a")
+    assert await limiter.acquire("b") == 0.0
+    assert await limiter.acquire("a") == 60.0
+
+
+async def test_reconcile_charges_actual_usage():
+    limiter = _FakeClockLimiter({"m": RateLimit(tokens_per_minute=600)})
+
+    await limiter.acquire("m", tokens=100)
+    limiter.reconcile("m", estimated_tokens=100, actual_tokens=700)
+
+    assert await limiter.acquire("m", tokens=60) == 16.0
+
+
+async def test_reconcile_refund_is_capped_at_capacity():
+    limiter = _FakeClockLimiter({"m": RateLimit(tokens_per_minute=600)})
+
+    await limiter.acquire("m", tokens=100)
+    limiter.reconcile("m", estimated_tokens=100, actual_tokens=0)
+    limiter.reconcile("m", estimated_tokens=100, actual_tokens=0)
+
+    assert await limiter.acquire("m", tokens=600) == 0.0
+    assert await limiter.acquire("m", tokens=60) == 6.0
+
+
+def test_reconcile_without_token_limit_is_noop():
+    limiter = RateLimiter({"m": RateLimit(requests_per_minute=10)})
+
+    limiter.reconcile("m", estimated_tokens=10, actual_tokens=100)
+    limiter.reconcile("unknown", estimated_tokens=10, actual_tokens=100)
+
+
+async def test_shared_limiter_serializes_concurrent_waiters():
+    limiter = RateLimiter({"m": RateLimit(requests_per_minute=600)})
+    for _ in range(600):
+        await limiter.acquire("m")
+
+    waits = await asyncio.gather(*(limiter.acquire("m") for _ in range(3)))
+
+    assert sorted(waits)[-1] >= 0.25
+
+
+def test_partition_divides_every_budget():
+    limiter = RateLimiter(
+        {"m": RateLimit(requests_per_minute=60, tokens_per_minute=1000)},
+        default=RateLimit(requests_per_minute=30),
+    )
+
+    shard = limiter.partition(3)
+
+    assert shard.limits == {"m": RateLimit(requests_per_minute=20, tokens_per_minute=1000 / 3)}
+    assert shard.default == RateLimit(requests_per_minute=10)
+    assert RateLimiter().partition(2).default is None
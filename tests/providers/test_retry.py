@@ -18,3 +18,11 @@ def test_retry_config_custom() -> None:
     assert config.max_attempts == 5
     assert config.strategy == RetryStrategy.FIXED_DELAY
     assert config.initial_delay == 2.0
+
+
+def test_retry_config_delay() -> None:
+    exponential = RetryConfig(initial_delay=1.0, exponential_base=3.0, max_delay=5.0)
+    fixed = RetryConfig(strategy=RetryStrategy.FIXED_DELAY, initial_delay=2.0)
+
+    assert [exponential.delay(attempt) for attempt in range(3)] == [1.0, 3.0, 5.0]
+    assert [fixed.delay(attempt) for attempt in range(3)] == [2.0, 2.0, 2.0]
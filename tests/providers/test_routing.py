@@ -0,0 +1,159 @@
+import asyncio
+from collections import Counter
+from typing import Any
+
+import pytest
+
+from promptum.providers.exceptions import (
+    ProviderCircuitOpenError,
+    ProviderHTTPStatusError,
+    ProviderRetryExhaustedError,
+    ProviderTransientError,
+)
+from promptum.providers.metrics import Metrics
+from promptum.providers.routing import Backend, RoutingProvider, RoutingStrategy
+
+
+class _FakeProvider:
+    def __init__(self, content: str = "ok", error: Exception | None = None):
+        self.content = content
+        self.error = error
+        self.calls: list[dict[str, Any]] = []
+        self.stream_calls = 0
+        self.release: asyncio.Event | None = None
+
+    async def generate(self, prompt: str, model: str, **kwargs: Any) -> tuple[str, Metrics]:
+        self.calls.append({"prompt": prompt, "model": model, **kwargs})
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.content, Metrics(latency_ms=1.0)
+
+
+class _FakeStreamingProvider(_FakeProvider):
+    async def generate_stream(self, prompt: str, model: str, **kwargs: Any) -> tuple[str, Metrics]:
+        self.stream_calls += 1
+        return await self.generate(prompt, model, **kwargs)
+
+
+async def test_generate_records_serving_backend():
+    provider = _FakeProvider("hello")
+    router = RoutingProvider([Backend("a", provider)])
+
+    content, metrics = await router.generate("p", "m", temperature=0.5, retry_config=None)
+
+    assert content == "hello"
+    assert metrics.backend == "a"
+    assert provider.calls[0]["temperature"] == 0.5
+    assert provider.calls[0]["retry_config"] is None
+
+
+async def test_least_outstanding_prefers_idle_backend():
+    busy, idle = _FakeProvider("busy"), _FakeProvider("idle")
+    busy.release = asyncio.Event()
+    router = RoutingProvider([Backend("busy", busy), Backend("idle", idle)])
+
+    first = asyncio.create_task(router.generate("p", "m"))
+    await asyncio.sleep(0)
+    assert router.outstanding("busy") + router.outstanding("idle") == 1
+    pending = "busy" if router.outstanding("busy") else "idle"
+
+    _, metrics = await router.generate("p", "m")
+    busy.release.set()
+    await first
+
+    assert metrics.backend != pending
+    assert router.outstanding("busy") == router.outstanding("idle") == 0
+
+
+async def test_least_outstanding_rotates_ties():
+    router = RoutingProvider([Backend("a", _FakeProvider()), Backend("b", _FakeProvider())])
+
+    backends = [(await router.generate("p", "m"))[1].backend for _ in range(4)]
+
+    assert backends == ["a", "b", "a", "b"]
+
+
+async def test_weighted_routing_follows_weights():
+    router = RoutingProvider(
+        [Backend("a", _FakeProvider(), weight=3), Backend("b", _FakeProvider(), weight=1)],
+        strategy=RoutingStrategy.WEIGHTED,
+    )
+
+    backends = [(await router.generate("p", "m"))[1].backend for _ in range(8)]
+
+    assert Counter(backends) == {"a": 6, "b": 2}
+    # Smooth round-robin interleaves instead of sending runs to one backend.
+    assert backends[:4].count("b") == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ProviderRetryExhaustedError(3, 429, "", [1.0, 2.0]),
+        ProviderTransientError(3, [1.0, 2.0]),
+        ProviderCircuitOpenError("m", 5.0),
+    ],
+)
+async def test_fails_over_when_backend_is_unavailable(error: Exception):
+    failing, healthy = _FakeProvider(error=error), _FakeProvider("fallback")
+    router = RoutingProvider([Backend("a", failing), Backend("b", healthy)])
+
+    content, metrics = await router.generate("p", "m")
+
+    assert content == "fallback"
+    assert metrics.backend == "b"
+    assert len(failing.calls) == 1
+
+
+async def test_raises_last_error_when_every_backend_fails():
+    router = RoutingProvider(
+        [
+            Backend("a", _FakeProvider(error=ProviderTransientError(1, []))),
+            Backend("b", _FakeProvider(error=ProviderRetryExhaustedError(1, 503, "", []))),
+        ]
+    )
+
+    with pytest.raises(ProviderRetryExhaustedError):
+        await router.generate("p", "m")
+
+    assert router.outstanding("a") == router.outstanding("b") == 0
+
+
+async def test_does_not_fail_over_on_request_errors():
+    other = _FakeProvider()
+    router = RoutingProvider(
+        [
+            Backend("a", _FakeProvider(error=ProviderHTTPStatusError(400, "bad"))),
+            Backend("b", other),
+        ]
+    )
+
+    with pytest.raises(ProviderHTTPStatusError):
+        await router.generate("p", "m")
+
+    assert other.calls == []
+
+
+async def test_generate_stream_uses_streaming_backends_when_available():
+    streaming, plain = _FakeStreamingProvider("s"), _FakeProvider("g")
+    router = RoutingProvider([Backend("s", streaming), Backend("g", plain)])
+
+    results = [await router.generate_stream("p", "m") for _ in range(2)]
+
+    assert sorted(content for content, _ in results) == ["g", "s"]
+    assert streaming.stream_calls == 1
+
+
+@pytest.mark.parametrize(
+    ("backends", "match"),
+    [
+        ([], "at least one"),
+        ([Backend("a", _FakeProvider()), Backend("a", _FakeProvider())], "unique"),
+        ([Backend("a", _FakeProvider(), weight=0)], "positive"),
+    ],
+)
+def test_rejects_invalid_backends(backends: list[Backend], match: str):
+    with pytest.raises(ValueError, match=match):
+        RoutingProvider(backends)
@@ -1,11 +1,88 @@
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from promptum.providers.exceptions import ProviderRetryExhaustedError
 from promptum.providers.metrics import Metrics
+from promptum.providers.retry import RetryConfig
 from promptum.session.case import Prompt
 
 
+class FakeProvider:
+    """
+    Answers every prompt with the prompt itself and records each call.
+
+    Responses cost `cost_usd` and use `tokens`. The first `failures[prompt]` attempts of a
+    prompt raise `error`. Prompts in `hang` ("*" for all) wait until `release` is set, and
+    those cancelled while waiting are added to `cancelled`. Requests for a model take
+    `delays[model]` seconds, and `peak` keeps the most that were in flight at once.
+    """
+
+    def __init__(
+        self,
+        cost_usd: float | None = None,
+        tokens: int | None = None,
+        failures: dict[str, int] | None = None,
+        error: Exception | None = None,
+        hang: Iterable[str] = (),
+        delays: dict[str, float] | None = None,
+    ):
+        self.cost_usd = cost_usd
+        self.tokens = tokens
+        self.failures = dict(failures or {})
+        self.error = error or ProviderRetryExhaustedError(1, 429, "slow down", [])
+        self.hang = set(hang)
+        self.delays = delays or {}
+        self.release = asyncio.Event()
+        self.calls: list[str] = []
+        self.retry_configs: list[RetryConfig | None] = []
+        self.cancelled: list[str] = []
+        self.in_flight: Counter[str] = Counter()
+        self.peak: Counter[str] = Counter()
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str = "m",
+        retry_config: RetryConfig | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, Metrics]:
+        self.calls.append(prompt)
+        self.retry_configs.append(retry_config)
+        if self.failures.get(prompt, 0) > 0:
+            self.failures[prompt] -= 1
+            raise self.error
+        self.in_flight[model] += 1
+        self.peak[model] = max(self.peak[model], self.in_flight[model])
+        try:
+            if prompt in self.hang or "*" in self.hang:
+                await self.release.wait()
+            await asyncio.sleep(self.delays.get(model, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(prompt)
+            raise
+        finally:
+            self.in_flight[model] -= 1
+        metrics = Metrics(latency_ms=1.0, cost_usd=self.cost_usd, total_tokens=self.tokens)
+        return prompt, metrics
+
+
+def make_prompt(name: str, validator: Any, model: str = "m", **kwargs: Any) -> Prompt:
+    """A prompt whose text is its name."""
+    return Prompt(name=name, prompt=name, model=model, validator=validator, **kwargs)
+
+
+def make_prompts(names: Iterable[str] | int, validator: Any, **kwargs: Any) -> list[Prompt]:
+    """Prompts with the given names, or `p0`, `p1`, ... for a count."""
+    if isinstance(names, int):
+        names = [f"p{i}" for i in range(names)]
+    return [make_prompt(name, validator, **kwargs) for name in names]
+
+
 @pytest.fixture
 def mock_provider() -> AsyncMock:
     provider = AsyncMock()
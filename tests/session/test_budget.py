@@ -0,0 +1,112 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from promptum.providers.metrics import Metrics
+from promptum.session.budget import Budget
+from promptum.session.concurrency import AdaptiveConcurrency
+from promptum.session.journal import Journal
+from promptum.session.runner import Runner
+from promptum.session.session import Session
+
+from .conftest import FakeProvider, make_prompts
+
+
+async def test_cost_budget_skips_remaining_prompts(passing_validator: MagicMock):
+    provider = FakeProvider(cost_usd=0.4)
+    runner = Runner(provider, max_concurrent=1, budget=Budget(max_cost_usd=1.0))
+
+    results = await runner.run(make_prompts(5, passing_validator))
+
+    assert provider.calls == ["p0", "p1", "p2"]
+    assert [r.skipped for r in results] == [False, False, False, True, True]
+    assert all(r.response is None and r.metrics is None for r in results[3:])
+
+
+async def test_token_budget_is_enforced(passing_validator: MagicMock):
+    provider = FakeProvider(tokens=100)
+    runner = Runner(provider, max_concurrent=1, budget=Budget(max_tokens=200))
+
+    results = await runner.run(make_prompts(4, passing_validator))
+
+    assert [r.skipped for r in results] == [False, False, True, True]
+
+
+async def test_exhausted_budget_cancels_in_flight_requests(passing_validator: MagicMock):
+    provider = FakeProvider(cost_usd=5.0, hang={"p1", "p2"})
+    progress = MagicMock()
+    runner = Runner(
+        provider, max_concurrent=3, progress_callback=progress, budget=Budget(max_cost_usd=1.0)
+    )
+
+    results = await runner.run(make_prompts(5, passing_validator))
+
+    assert sorted(provider.cancelled) == ["p1", "p2"]
+    assert [r.skipped for r in results] == [False, True, True, True, True]
+    assert progress.call_count == 5
+
+
+async def test_deadline_cancels_and_skips(passing_validator: MagicMock):
+    provider = FakeProvider(hang={"*"})
+    runner = Runner(
+        provider,
+        max_concurrent=2,
+        adaptive=AdaptiveConcurrency(),
+        budget=Budget(max_duration_s=0.05),
+    )
+
+    results = await asyncio.wait_for(runner.run(make_prompts(4, passing_validator)), timeout=2)
+
+    assert all(r.skipped for r in results)
+    assert runner._limiter is not None and runner._limiter.in_flight == 0
+
+
+async def test_cached_results_do_not_spend_budget(passing_validator: MagicMock):
+    class _CachedProvider:
+        async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+            return prompt, Metrics(latency_ms=0.1, cost_usd=10.0, cached=True)
+
+    runner = Runner(_CachedProvider(), budget=Budget(max_cost_usd=1.0))
+
+    results = await runner.run(make_prompts(3, passing_validator))
+
+    assert not any(r.skipped for r in results)
+
+
+async def test_outer_cancellation_is_not_swallowed(passing_validator: MagicMock):
+    runner = Runner(FakeProvider(hang={"*"}), budget=Budget(max_cost_usd=1.0))
+
+    task = asyncio.create_task(runner.run(make_prompts(2, passing_validator)))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_session_reports_skipped_and_budget(tmp_path: Path, passing_validator: MagicMock):
+    budget = Budget(max_cost_usd=0.5)
+    journal = Journal(tmp_path / "run.jsonl")
+    session = Session(
+        provider=FakeProvider(cost_usd=0.5), max_concurrent=1, budget=budget, journal=journal
+    )
+    session.add_tests(make_prompts(3, passing_validator))
+
+    summary = (await session.run()).get_summary()
+
+    assert (summary.total, summary.passed, summary.skipped, summary.failed) == (3, 1, 2, 0)
+    assert summary.pass_rate == 1.0
+    assert summary.total_cost_usd == 0.5
+    assert summary.budget == budget
+    # Skipped prompts are not journaled, so a resumed run executes them.
+    assert len(journal.pending(session._test_cases)) == 2
+
+
+def test_budget_partition_splits_cost_and_tokens():
+    budget = Budget(max_cost_usd=3.0, max_tokens=100, max_duration_s=60)
+
+    assert budget.partition(3) == Budget(max_cost_usd=1.0, max_tokens=33, max_duration_s=60)
+    assert Budget().partition(2) == Budget()
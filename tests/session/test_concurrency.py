@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from promptum.session.concurrency import AdaptiveConcurrency, AdaptiveLimiter
+
+
+def test_initial_limit_is_clamped_to_bounds():
+    config = AdaptiveConcurrency(min_concurrent=2, max_concurrent=8)
+
+    assert AdaptiveLimiter(config, initial_limit=1).limit == 2
+    assert AdaptiveLimiter(config, initial_limit=50).limit == 8
+
+
+async def test_healthy_window_increases_limit_additively():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(max_concurrent=10), initial_limit=4)
+
+    for _ in range(4):
+        await limiter.acquire()
+    for _ in range(4):
+        limiter.release(latency_ms=100.0)
+
+    assert limiter.limit == 4
+    for _ in range(4):
+        await limiter.acquire()
+        limiter.release(latency_ms=100.0)
+    assert limiter.limit == 5
+
+
+async def test_limit_never_exceeds_max():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(max_concurrent=3), initial_limit=3)
+
+    for _ in range(50):
+        await limiter.acquire()
+        limiter.release(latency_ms=10.0)
+
+    assert limiter.limit == 3
+
+
+async def test_overload_decreases_limit_multiplicatively():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(), initial_limit=16)
+
+    await limiter.acquire()
+    limiter.release(overloaded=True)
+
+    assert limiter.limit == 8
+
+
+async def test_overload_never_drops_below_min():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(min_concurrent=2), initial_limit=3)
+
+    for _ in range(5):
+        await limiter.acquire()
+        limiter.release(overloaded=True)
+
+    assert limiter.limit == 2
+
+
+async def test_overloads_from_same_burst_back_off_once():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(), initial_limit=16)
+
+    for _ in range(8):
+        await limiter.acquire()
+    for _ in range(8):
+        limiter.release(overloaded=True)
+
+    assert limiter.limit == 8
+
+
+async def test_latency_spike_counts_as_overload():
+    config = AdaptiveConcurrency(min_latency_samples=3, latency_spike_factor=2.0)
+    limiter = AdaptiveLimiter(config, initial_limit=10)
+
+    for _ in range(3):
+        await limiter.acquire()
+        limiter.release(latency_ms=100.0)
+    limit_before_spike = limiter.limit
+    await limiter.acquire()
+    limiter.release(latency_ms=500.0)
+
+    assert limiter.limit == limit_before_spike // 2
+
+
+async def test_acquire_waits_until_slot_is_released():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(min_concurrent=1), initial_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release(latency_ms=1.0)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.in_flight == 1
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(min_concurrent=1), initial_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release(latency_ms=1.0)
+    assert limiter.in_flight == 0
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+async def test_waiter_cancelled_after_handoff_passes_slot_on():
+    limiter = AdaptiveLimiter(AdaptiveConcurrency(max_concurrent=1), initial_limit=1)
+    await limiter.acquire()
+
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release(latency_ms=1.0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    await asyncio.wait_for(second, timeout=1)
+    assert limiter.in_flight == 1
@@ -0,0 +1,124 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from promptum.providers.exceptions import (
+    ProviderHTTPStatusError,
+    ProviderTransientError,
+)
+from promptum.providers.openrouter import OpenRouterClient
+from promptum.providers.retry import RetryConfig, RetryStrategy
+from promptum.session.budget import Budget
+from promptum.session.runner import Runner
+from promptum.session.stopping import EarlyStopping
+from promptum.testing.server import MockServer, MockServerConfig
+
+from .conftest import FakeProvider, make_prompts
+
+_FAST = RetryConfig(max_attempts=3, initial_delay=0.02, exponential_base=2.0)
+
+
+async def test_backoff_does_not_hold_the_slot(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"flaky": 2})
+    runner = Runner(provider, max_concurrent=1, deferred_retries=_FAST)
+
+    results = await runner.run(make_prompts(["flaky", "a", "b"], passing_validator))
+
+    assert provider.calls == ["flaky", "a", "b", "flaky", "flaky"]
+    assert all(r.passed for r in results)
+    assert results[0].metrics is not None
+    assert results[0].metrics.retry_delays == (0.02, 0.04)
+    assert results[0].metrics.total_attempts == 3
+    assert all(config and config.max_attempts == 1 for config in provider.retry_configs)
+
+
+async def test_exhausted_retries_report_every_attempt(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"down": 9}, error=ProviderTransientError(1, []))
+    progress = MagicMock()
+    runner = Runner(provider, progress_callback=progress, deferred_retries=_FAST)
+
+    results = await runner.run(make_prompts(["down"], passing_validator))
+
+    assert len(provider.calls) == 3
+    assert results[0].execution_error == str(ProviderTransientError(3, [0.02, 0.04]))
+    progress.assert_called_once()
+
+
+async def test_non_retryable_errors_are_not_deferred(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"bad": 9}, error=ProviderHTTPStatusError(400, "bad request"))
+    runner = Runner(provider, deferred_retries=_FAST)
+
+    results = await runner.run(make_prompts(["bad"], passing_validator))
+
+    assert provider.calls == ["bad"]
+    assert results[0].execution_error == "HTTP error 400: bad request"
+
+
+async def test_prompt_retry_config_takes_precedence(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"flaky": 9})
+    config = RetryConfig(max_attempts=2, initial_delay=0.01, strategy=RetryStrategy.FIXED_DELAY)
+    runner = Runner(provider, deferred_retries=_FAST)
+
+    results = await runner.run(make_prompts(["flaky"], passing_validator, retry_config=config))
+
+    assert len(provider.calls) == 2
+    assert results[0].execution_error is not None
+    assert "after 2 attempts" in results[0].execution_error
+
+
+async def test_stop_skips_jobs_waiting_out_their_backoff(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"flaky": 9})
+    runner = Runner(provider, deferred_retries=RetryConfig(initial_delay=60))
+
+    task = asyncio.create_task(runner.run(make_prompts(["flaky", "ok"], passing_validator)))
+    while len(provider.calls) < 2:
+        await asyncio.sleep(0)
+    runner.stop()
+    results = await asyncio.wait_for(task, timeout=2)
+
+    assert [r.skipped for r in results] == [True, False]
+
+
+async def test_retries_with_early_stopping(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"a": 3, "b": 1})
+    runner = Runner(
+        provider,
+        max_concurrent=2,
+        early_stopping=EarlyStopping(max_width=None, threshold=0.5, min_samples=2),
+        deferred_retries=RetryConfig(max_attempts=5, initial_delay=0.01),
+    )
+
+    results = await asyncio.wait_for(
+        runner.run(make_prompts(["a", "b"], passing_validator, samples=10)), timeout=5
+    )
+
+    assert all(r.passed for r in results)
+    assert {r.test_case.name for r in results} == {"a", "b"}
+
+
+async def test_openrouter_client_makes_one_attempt_per_dispatch(passing_validator: MagicMock):
+    config = MockServerConfig(rate_limit_probability=1.0)
+    async with (
+        MockServer(config) as server,
+        OpenRouterClient(api_key="k", base_url=server.base_url) as client,
+    ):
+        runner = Runner(client, deferred_retries=_FAST)
+        results = await runner.run(make_prompts(["a", "b"], passing_validator))
+
+    assert server.stats[429] == 6
+    assert all("after 3 attempts (last status 429)" in str(r.execution_error) for r in results)
+
+
+async def test_deadline_skips_jobs_waiting_out_their_backoff(passing_validator: MagicMock):
+    provider = FakeProvider(failures={"flaky": 9})
+    runner = Runner(
+        provider,
+        budget=Budget(max_duration_s=0.05),
+        deferred_retries=RetryConfig(initial_delay=60),
+    )
+
+    results = await asyncio.wait_for(
+        runner.run(make_prompts(["flaky"], passing_validator)), timeout=2
+    )
+
+    assert provider.calls == ["flaky"]
+    assert results[0].skipped
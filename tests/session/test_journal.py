@@ -0,0 +1,212 @@
+import asyncio
+import contextlib
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from promptum.providers.exceptions import ProviderRetryExhaustedError
+from promptum.providers.metrics import Metrics
+from promptum.session.case import Prompt
+from promptum.session.journal import Journal, JournaledValidator, prompt_key
+from promptum.session.result import TestResult as _TestResult
+from promptum.session.session import Session
+from promptum.validation import Contains
+
+
+def _result(prompt: Prompt, passed: bool = True) -> _TestResult:
+    return _TestResult(
+        test_case=prompt,
+        response="answer",
+        passed=passed,
+        metrics=Metrics(latency_ms=12.5, total_tokens=7, cost_usd=0.01, retry_delays=(1.0,)),
+        validation_details={"matched": passed},
+        timestamp=datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+    )
+
+
+@pytest.fixture
+def prompts() -> list[Prompt]:
+    return [
+        Prompt(
+            name=f"p{i}",
+            prompt=f"question {i}",
+            model="m",
+            validator=Contains("answer"),
+            tags=("math",),
+            metadata={"i": i},
+        )
+        for i in range(3)
+    ]
+
+
+def test_prompt_key_ignores_validator_and_tags(prompts: list[Prompt]):
+    other = Prompt(name="p0", prompt="question 0", model="m", validator=Contains("x"))
+
+    assert prompt_key(prompts[0]) == prompt_key(other)
+    assert prompt_key(prompts[0]) != prompt_key(prompts[1])
+
+
+def test_append_and_read_round_trip(tmp_path: Path, prompts: list[Prompt]):
+    with Journal(tmp_path / "run.jsonl", fsync=True) as journal:
+        journal.append(_result(prompts[0]))
+        journal.append(_TestResult(prompts[1], None, False, None, {}, execution_error="boom"))
+
+    restored = list(journal.read(prompts))
+
+    assert restored[0] == _result(prompts[0])
+    assert restored[1].metrics is None
+    assert restored[1].execution_error == "boom"
+    assert restored[1].test_case is prompts[1]
+
+
+def test_read_without_prompts_rebuilds_test_cases(tmp_path: Path, prompts: list[Prompt]):
+    journal = Journal(tmp_path / "run.jsonl")
+    journal.append(_result(prompts[2]))
+    journal.close()
+
+    report = journal.load_report()
+    test_case = report.results[0].test_case
+
+    assert report.get_summary().total_cost_usd == 0.01
+    assert (test_case.name, test_case.tags, test_case.metadata) == ("p2", ("math",), {"i": 2})
+    assert isinstance(test_case.validator, JournaledValidator)
+    assert test_case.validator.describe() == Contains("answer").describe()
+    assert test_case.validator.validate("answer") == (
+        False,
+        {"error": "Journaled validators cannot re-validate a response"},
+    )
+
+
+async def test_rerunning_a_journaled_prompt_fails_validation(tmp_path: Path, prompts: list[Prompt]):
+    journal = Journal(tmp_path / "run.jsonl")
+    journal.append(_result(prompts[0]))
+    journal.close()
+    provider = AsyncMock()
+    provider.generate.return_value = ("answer", Metrics(latency_ms=1.0))
+    session = Session(provider=provider)
+    session.add_tests([r.test_case for r in journal.read()])
+
+    report = await session.run()
+
+    result = report.results[0]
+    assert (result.passed, result.execution_error) == (False, None)
+    assert "re-validate" in result.validation_details["error"]
+
+
+def test_torn_last_line_is_skipped_and_terminated(tmp_path: Path, prompts: list[Prompt]):
+    path = tmp_path / "run.jsonl"
+    journal = Journal(path)
+    journal.append(_result(prompts[0]))
+    journal.close()
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"key": "trunc')
+
+    assert journal.completed() == {prompt_key(prompts[0]): 1}
+    journal.append(_result(prompts[1]))
+    journal.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["test_case"]["name"] == "p1"
+    assert [r.test_case.name for r in journal.read()] == ["p0", "p1"]
+
+
+def test_pending_counts_duplicate_prompts(tmp_path: Path, prompts: list[Prompt]):
+    journal = Journal(tmp_path / "run.jsonl")
+    journal.append(_result(prompts[0]))
+
+    pending = journal.pending([prompts[0], prompts[0], prompts[1]])
+    assert [(prompt, resume.samples) for prompt, resume in pending] == [
+        (prompts[0], (0,)),
+        (prompts[1], (0,)),
+    ]
+    assert [p for p, _ in Journal(tmp_path / "missing.jsonl").pending(prompts)] == prompts
+
+
+async def test_session_resumes_from_journal(tmp_path: Path, prompts: list[Prompt]):
+    path = tmp_path / "run.jsonl"
+    provider = AsyncMock()
+    provider.generate.return_value = ("answer", Metrics(latency_ms=1.0))
+
+    interrupted = Session(provider=provider, max_concurrent=1, journal=path)
+    interrupted.add_tests(prompts)
+    async with contextlib.aclosing(interrupted.run_iter()) as results:
+        async for _ in results:
+            break
+    assert provider.generate.await_count == 1
+
+    resumed = Session(provider=provider, journal=str(path))
+    resumed.add_tests(prompts)
+    report = await resumed.run()
+
+    assert provider.generate.await_count == 3
+    assert sorted(r.test_case.name for r in report.results) == ["p0", "p1", "p2"]
+    assert all(r.passed for r in report.results)
+    assert report.results[0].test_case is prompts[0]
+
+    finished = Session(provider=provider, journal=Journal(path))
+    finished.add_tests(prompts)
+    assert len((await finished.run()).results) == 3
+    assert provider.generate.await_count == 3
+
+
+async def test_journaled_run_reports_new_results_in_input_order(
+    tmp_path: Path, prompts: list[Prompt]
+):
+    async def generate(prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        # The first prompt finishes last.
+        await asyncio.sleep(0.05 if prompt == "question 0" else 0)
+        return "answer", Metrics(latency_ms=1.0)
+
+    provider = AsyncMock()
+    provider.generate.side_effect = generate
+    session = Session(provider=provider, journal=tmp_path / "run.jsonl")
+    session.add_tests(prompts)
+
+    report = await session.run()
+
+    assert [r.test_case.name for r in report.results] == ["p0", "p1", "p2"]
+    assert [r.test_case.name for r in Journal(tmp_path / "run.jsonl").read()] == ["p1", "p2", "p0"]
+
+
+async def test_resume_retries_errored_results(tmp_path: Path, prompts: list[Prompt]):
+    journal = Journal(tmp_path / "run.jsonl")
+    provider = AsyncMock()
+    provider.generate.side_effect = [
+        ("answer", Metrics(latency_ms=1.0)),
+        ProviderRetryExhaustedError(3, 503, "overloaded", [1.0, 2.0]),
+        ("answer", Metrics(latency_ms=1.0)),
+    ]
+    session = Session(provider=provider, max_concurrent=1, journal=journal)
+    session.add_tests(prompts)
+
+    first = await session.run()
+    assert [r.execution_error is None for r in first.results] == [True, False, True]
+    assert [p.name for p, _ in journal.pending(prompts)] == ["p1"]
+
+    provider.generate.side_effect = None
+    provider.generate.return_value = ("answer", Metrics(latency_ms=1.0))
+    resumed = await session.run()
+
+    assert provider.generate.await_count == 4
+    assert sorted(r.test_case.name for r in resumed.results) == ["p0", "p1", "p2"]
+    assert all(r.passed for r in resumed.results)
+    assert journal.pending(prompts) == []
+
+
+async def test_session_without_journal_does_not_write(
+    tmp_path: Path, prompts: list[Prompt], passing_validator: MagicMock
+):
+    provider = AsyncMock()
+    provider.generate.return_value = ("answer", Metrics(latency_ms=1.0))
+    session = Session(provider=provider)
+    session.add_tests(prompts)
+
+    results = [r async for r in session.run_iter()]
+
+    assert len(results) == 3
+    assert session.journal is None
+    assert list(tmp_path.iterdir()) == []
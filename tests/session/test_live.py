@@ -0,0 +1,140 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from promptum.providers.exceptions import ProviderHTTPStatusError
+from promptum.providers.metrics import Metrics
+from promptum.session.budget import Budget, skipped_result
+from promptum.session.case import Prompt
+from promptum.session.live import LiveSummary
+from promptum.session.report import Report
+from promptum.session.result import TestResult as _TestResult
+from promptum.session.runner import Runner
+from promptum.session.session import Session
+
+
+class _Provider:
+    """Latency and cost grow with the prompt number; prompts containing "!" fail."""
+
+    async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        if "!" in prompt:
+            raise ProviderHTTPStatusError(500, "boom")
+        n = int(prompt.split(":")[1])
+        return prompt, Metrics(latency_ms=10.0 * n, total_tokens=n, cost_usd=0.001 * n)
+
+
+def _prompts(validator: MagicMock) -> list[Prompt]:
+    return [
+        Prompt(
+            name=f"p{i}",
+            prompt=f"{'!' if i == 3 else ''}p:{i}",
+            model=f"m{i % 2}",
+            validator=validator,
+            tags=("even",) if i % 2 == 0 else ("odd", "big") if i > 4 else ("odd",),
+        )
+        for i in range(1, 9)
+    ]
+
+
+def _assert_same(live: Any, expected: Any) -> None:
+    assert live.avg_latency_ms == pytest.approx(expected.avg_latency_ms)
+    assert live.total_cost_usd == pytest.approx(expected.total_cost_usd)
+    for field in (
+        "total",
+        "passed",
+        "failed",
+        "pass_rate",
+        "min_latency_ms",
+        "max_latency_ms",
+        "total_tokens",
+        "execution_errors",
+        "validation_failures",
+        "cached",
+        "coalesced",
+        "skipped",
+        "latency_sketch",
+        "cost_sketch",
+    ):
+        assert getattr(live, field) == getattr(expected, field), field
+
+
+async def test_runner_live_summary_matches_the_report(passing_validator: MagicMock):
+    runner = Runner(_Provider(), max_concurrent=3)
+
+    results = await runner.run(_prompts(passing_validator))
+    report = Report(results=results)
+
+    _assert_same(runner.live.summary(), report.get_summary())
+    assert runner.live.summary().execution_errors == 1
+    for model, summary in runner.live.by_model().items():
+        _assert_same(summary, report.filter(model=model).get_summary())
+    assert list(runner.live.by_tag()) == ["odd", "even", "big"]
+    for tag, summary in runner.live.by_tag().items():
+        _assert_same(summary, report.filter(tags=[tag]).get_summary())
+
+
+async def test_progress_callback_reads_the_live_summary(passing_validator: MagicMock):
+    seen: list[tuple[int, int]] = []
+    runner = Runner(
+        _Provider(),
+        max_concurrent=2,
+        progress_callback=lambda done, total, result: seen.append(
+            (done, runner.live.summary().total)
+        ),
+    )
+
+    await runner.run(_prompts(passing_validator))
+    first = runner.live
+    await runner.run(_prompts(passing_validator)[:2])
+
+    assert seen[:8] == [(n, n) for n in range(1, 9)]
+    # Each run starts from zero.
+    assert runner.live is not first
+    assert runner.live.completed == 2
+
+
+def test_cached_coalesced_and_skipped_results(passing_validator: MagicMock):
+    prompt = Prompt(name="p", prompt="p", model="m", validator=passing_validator)
+    results = [
+        _TestResult(prompt, "x", True, Metrics(latency_ms=5.0, cost_usd=0.5, total_tokens=9), {}),
+        _TestResult(prompt, "x", True, Metrics(latency_ms=0.1, cost_usd=0.5, cached=True), {}),
+        _TestResult(prompt, "x", False, Metrics(latency_ms=7.0, cost_usd=0.5, coalesced=True), {}),
+        skipped_result(prompt),
+    ]
+    budget = Budget(max_cost_usd=1.0)
+    live = LiveSummary(budget)
+    for result in results:
+        live.add(result)
+
+    summary = live.summary()
+
+    _assert_same(summary, Report(results, budget).get_summary())
+    assert (summary.cached, summary.coalesced, summary.skipped) == (1, 1, 1)
+    assert summary.budget == budget
+
+
+def test_summaries_are_snapshots(passing_validator: MagicMock):
+    prompt = Prompt(name="p", prompt="p", model="m", validator=passing_validator)
+    live = LiveSummary()
+    live.add(_TestResult(prompt, "x", True, Metrics(latency_ms=5.0), {}))
+
+    before = live.summary()
+    live.add(_TestResult(prompt, "x", True, Metrics(latency_ms=500.0), {}))
+
+    assert before.latency_sketch is not None
+    assert before.latency_sketch.count == 1
+    assert before.max_latency_ms == 5.0
+    assert live.summary().p99_latency_ms == pytest.approx(500.0, rel=0.01)
+    assert LiveSummary().summary().total == 0
+
+
+async def test_session_live_summary(passing_validator: MagicMock):
+    session = Session(_Provider())
+    assert session.live is None
+    session.add_tests(_prompts(passing_validator))
+
+    report = await session.run()
+
+    assert session.live is not None
+    _assert_same(session.live.summary(), report.get_summary())
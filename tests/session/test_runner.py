@@ -5,10 +5,17 @@ from unittest.mock import AsyncMock, MagicMock
 import httpx
 import pytest
 
-from promptum.providers.exceptions import ProviderError
+from promptum.providers.exceptions import (
+    ProviderError,
+    ProviderHTTPStatusError,
+    ProviderRetryExhaustedError,
+    ProviderTransientError,
+)
 from promptum.providers.metrics import Metrics
 from promptum.session.case import Prompt
-from promptum.session.runner import Runner
+from promptum.session.concurrency import AdaptiveConcurrency
+from promptum.session.result import TestResult as _TestResult
+from promptum.session.runner import Runner, _is_overload
 
 
 async def test_run_single_passing_test(
@@ -154,3 +161,249 @@ async def test_run_respects_max_concurrent_limit(
     await runner.run(prompts)
 
     assert peak <= 3
+
+
+async def test_run_stream_uses_generate_stream_when_supported(sample_prompt: Prompt):
+    class StreamingProvider:
+        async def generate(self, **kwargs):
+            raise AssertionError("generate should not be called when streaming")
+
+        async def generate_stream(self, **kwargs):
+            return "streamed", Metrics(latency_ms=80.0, time_to_first_token_ms=20.0)
+
+    runner = Runner(provider=StreamingProvider(), stream=True)
+
+    results = await runner.run([sample_prompt])
+
+    assert results[0].response == "streamed"
+    assert results[0].metrics.time_to_first_token_ms == 20.0
+
+
+async def test_run_stream_falls_back_to_generate_without_streaming_support(
+    sample_prompt: Prompt,
+):
+    class PlainProvider:
+        async def generate(self, **kwargs):
+            return "plain", Metrics(latency_ms=10.0)
+
+    runner = Runner(provider=PlainProvider(), stream=True)
+
+    results = await runner.run([sample_prompt])
+
+    assert results[0].response == "plain"
+
+
+async def test_concurrency_limit_defaults_to_max_concurrent(mock_provider: AsyncMock):
+    runner = Runner(provider=mock_provider, max_concurrent=7)
+
+    assert runner.concurrency_limit == 7
+
+
+async def test_run_adaptive_backs_off_on_throttling(passing_validator: MagicMock):
+    provider = AsyncMock()
+    provider.generate.side_effect = ProviderRetryExhaustedError(3, 429, "slow down", [1.0, 2.0])
+    limits: list[int] = []
+    prompts = [
+        Prompt(name=f"t-{i}", prompt=f"p{i}", model="m", validator=passing_validator)
+        for i in range(4)
+    ]
+    runner = Runner(
+        provider=provider,
+        max_concurrent=8,
+        adaptive=AdaptiveConcurrency(min_concurrent=1),
+        progress_callback=lambda done, total, result: limits.append(runner.concurrency_limit),
+    )
+
+    results = await runner.run(prompts)
+
+    assert all(r.execution_error for r in results)
+    assert limits[-1] < 8
+
+
+async def test_run_adaptive_grows_limit_while_healthy(passing_validator: MagicMock):
+    provider = AsyncMock()
+    provider.generate.return_value = ("ok", Metrics(latency_ms=10.0))
+    prompts = [
+        Prompt(name=f"t-{i}", prompt=f"p{i}", model="m", validator=passing_validator)
+        for i in range(20)
+    ]
+    runner = Runner(
+        provider=provider,
+        max_concurrent=2,
+        adaptive=AdaptiveConcurrency(max_concurrent=16),
+    )
+
+    results = await runner.run(prompts)
+
+    assert all(r.passed for r in results)
+    assert runner.concurrency_limit > 2
+
+
+@pytest.mark.parametrize(
+    ("exception", "metrics", "expected"),
+    [
+        (ProviderTransientError(3, [1.0, 2.0]), None, True),
+        (ProviderHTTPStatusError(429, "busy"), None, True),
+        (ProviderHTTPStatusError(503, "down"), None, True),
+        (ProviderHTTPStatusError(400, "bad request"), None, False),
+        (httpx.ReadTimeout("timed out"), None, True),
+        (ValueError("bad"), None, False),
+        (None, Metrics(latency_ms=1.0, retry_delays=(1.0,)), True),
+        (None, Metrics(latency_ms=1.0), False),
+    ],
+    ids=["transient", "429", "503", "400", "timeout", "value_error", "retried", "clean"],
+)
+def test_is_overload_classification(
+    sample_prompt: Prompt,
+    exception: Exception | None,
+    metrics: Metrics | None,
+    expected: bool,
+):
+    result = _TestResult(
+        test_case=sample_prompt,
+        response=None,
+        passed=False,
+        metrics=metrics,
+        validation_details={},
+    )
+
+    assert _is_overload(result, exception) is expected
+
+
+async def test_run_adaptive_releases_slot_when_cancelled(sample_prompt: Prompt):
+    async def hang(**kwargs):
+        await asyncio.sleep(10)
+
+    provider = AsyncMock()
+    provider.generate.side_effect = hang
+    runner = Runner(provider=provider, max_concurrent=1, adaptive=AdaptiveConcurrency())
+
+    task = asyncio.create_task(runner.run([sample_prompt]))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert runner._limiter.in_flight == 0
+
+
+async def test_run_iter_yields_results_in_completion_order(passing_validator: MagicMock):
+    release = {name: asyncio.Event() for name in ("slow", "fast")}
+
+    async def generate(prompt: str, **kwargs: object) -> tuple[str, Metrics]:
+        await release[prompt].wait()
+        return prompt, Metrics(latency_ms=1.0)
+
+    provider = AsyncMock()
+    provider.generate.side_effect = generate
+    prompts = [
+        Prompt(name=name, prompt=name, model="m", validator=passing_validator)
+        for name in ("slow", "fast")
+    ]
+    progress = MagicMock()
+    runner = Runner(provider=provider, progress_callback=progress)
+
+    results = runner.run_iter(prompts)
+    release["fast"].set()
+    first = await anext(results)
+    release["slow"].set()
+    rest = [result async for result in results]
+
+    assert [first.response] + [r.response for r in rest] == ["fast", "slow"]
+    assert [c.args[:2] for c in progress.call_args_list] == [(1, 2), (2, 2)]
+
+
+async def test_run_iter_closing_early_cancels_pending_tests(
+    mock_provider: AsyncMock,
+    passing_validator: MagicMock,
+):
+    started = 0
+
+    async def generate(prompt: str, **kwargs: object) -> tuple[str, Metrics]:
+        nonlocal started
+        started += 1
+        if prompt != "0":
+            await asyncio.Event().wait()
+        return prompt, Metrics(latency_ms=1.0)
+
+    mock_provider.generate.side_effect = generate
+    prompts = [
+        Prompt(name=str(i), prompt=str(i), model="m", validator=passing_validator)
+        for i in range(10)
+    ]
+    runner = Runner(provider=mock_provider, max_concurrent=2)
+
+    results = runner.run_iter(prompts)
+    first = await anext(results)
+    await results.aclose()
+
+    assert first.response == "0"
+    assert 2 <= started <= 3
+    assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+
+async def test_run_iter_with_adaptive_limiter(mock_provider: AsyncMock, sample_prompt: Prompt):
+    runner = Runner(provider=mock_provider, adaptive=AdaptiveConcurrency())
+
+    results = [result async for result in runner.run_iter([sample_prompt] * 3)]
+
+    assert len(results) == 3
+    assert runner.concurrency_limit >= 5
+
+
+async def test_run_consumes_lazy_iterable_as_workers_free_up(passing_validator: MagicMock):
+    release = asyncio.Event()
+    pulled = 0
+
+    async def generate(prompt: str, **kwargs: object) -> tuple[str, Metrics]:
+        await release.wait()
+        return prompt, Metrics(latency_ms=1.0)
+
+    def prompts():
+        nonlocal pulled
+        for i in range(1000):
+            pulled += 1
+            yield Prompt(name=str(i), prompt=str(i), model="m", validator=passing_validator)
+
+    provider = AsyncMock()
+    provider.generate.side_effect = generate
+    progress = MagicMock()
+    runner = Runner(provider=provider, max_concurrent=4, progress_callback=progress)
+
+    task = asyncio.create_task(runner.run(prompts()))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    # Four running, four queued and one waiting to be queued.
+    assert pulled <= 9
+    release.set()
+    results = await task
+
+    assert [r.response for r in results] == [str(i) for i in range(1000)]
+    assert progress.call_args_list[-1].args[:2] == (1000, 0)
+
+
+async def test_run_propagates_unexpected_errors(
+    mock_provider: AsyncMock,
+    sample_prompt: Prompt,
+    passing_validator: MagicMock,
+):
+    passing_validator.validate.side_effect = RuntimeError("validator bug")
+    runner = Runner(provider=mock_provider)
+
+    with pytest.raises(RuntimeError, match="validator bug"):
+        await runner.run([sample_prompt] * 3)
+
+
+async def test_run_iter_propagates_errors_from_test_case_iterable(
+    mock_provider: AsyncMock,
+    sample_prompt: Prompt,
+):
+    def prompts():
+        yield sample_prompt
+        raise RuntimeError("source failed")
+
+    runner = Runner(provider=mock_provider)
+
+    with pytest.raises(RuntimeError, match="source failed"):
+        async for _ in runner.run_iter(prompts()):
+            pass
@@ -0,0 +1,233 @@
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from promptum.providers.cache import CachedProvider
+from promptum.providers.metrics import Metrics
+from promptum.session.case import Prompt, Resume
+from promptum.session.journal import Journal
+from promptum.session.report import Report
+from promptum.session.result import TestResult as _TestResult
+from promptum.session.runner import Runner
+from promptum.session.session import Session
+from promptum.session.stats import PromptStats, pass_at_k
+from promptum.validation import Contains
+
+from .conftest import make_prompt
+
+_P = Contains("p")
+
+
+class _Provider:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        self.calls += 1
+        return f"{prompt} {self.calls}", Metrics(latency_ms=10.0 * self.calls, cost_usd=0.5)
+
+
+class _SamplingProvider(_Provider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    async def generate_stream(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        return await self.generate(prompt, **kwargs)
+
+    async def generate_samples(
+        self, prompt: str, n: int, **kwargs: Any
+    ) -> tuple[list[str], Metrics]:
+        self.batches.append(n)
+        metrics = Metrics(
+            latency_ms=40.0, prompt_tokens=5, completion_tokens=12, total_tokens=17, cost_usd=0.9
+        )
+        return [f"{prompt} {i}" for i in range(n)], metrics
+
+
+async def test_cached_samples_are_generated_and_replayed_one_by_one():
+    provider = _Provider()
+    runner = Runner(CachedProvider(provider), max_concurrent=1)
+    prompt = make_prompt("p", Contains("p 1"), samples=5)
+
+    first = await runner.run([prompt])
+    replayed = await runner.run([prompt])
+
+    assert [r.response for r in first] == [f"p {i}" for i in range(1, 6)]
+    assert not any(r.metrics and r.metrics.cached for r in first)
+    assert [r.response for r in replayed] == [r.response for r in first]
+    assert all(r.metrics and r.metrics.cached for r in replayed)
+    assert provider.calls == 5
+    assert Report(results=first).prompt_stats(k=(1, 5))[0].pass_at_k == pytest.approx(
+        {1: 0.2, 5: 1.0}
+    )
+
+
+def test_prompt_rejects_non_positive_samples():
+    with pytest.raises(ValueError, match="samples must be at least 1"):
+        make_prompt("p", _P, samples=0)
+
+
+async def test_samples_are_batched_into_one_request():
+    provider = _SamplingProvider()
+    progress = MagicMock()
+    runner = Runner(provider, progress_callback=progress)
+
+    results = await runner.run(
+        [make_prompt("p", _P, samples=3), make_prompt("q", Contains("q"), samples=1)]
+    )
+
+    assert provider.batches == [3]
+    assert provider.calls == 1
+    assert [(r.test_case.name, r.sample_index) for r in results] == [
+        ("p", 0),
+        ("p", 1),
+        ("p", 2),
+        ("q", 0),
+    ]
+    assert [r.response for r in results[:3]] == ["p 0", "p 1", "p 2"]
+    # The batch's tokens and cost are split across its samples without losing any.
+    batch = [r.metrics for r in results[:3] if r.metrics]
+    assert [m.total_tokens for m in batch] == [6, 6, 5]
+    assert sum(m.completion_tokens or 0 for m in batch) == 12
+    assert sum(m.cost_usd or 0 for m in batch) == pytest.approx(0.9)
+    assert {m.latency_ms for m in batch} == {40.0}
+    assert [call.args[:2] for call in progress.call_args_list] == [(i, 4) for i in range(1, 5)]
+
+
+async def test_samples_without_batching_support_are_separate_requests():
+    provider = _Provider()
+
+    results = await Runner(provider, max_concurrent=2).run([make_prompt("p", _P, samples=3)])
+
+    assert provider.calls == 3
+    assert [r.sample_index for r in results] == [0, 1, 2]
+    assert all(r.passed for r in results)
+
+
+async def test_streaming_samples_are_separate_requests():
+    provider = _SamplingProvider()
+
+    results = await Runner(provider, stream=True).run([make_prompt("p", _P, samples=2)])
+
+    assert provider.batches == []
+    assert provider.calls == 2
+    assert [r.sample_index for r in results] == [0, 1]
+
+
+async def test_failed_batch_marks_every_sample(failing_validator: MagicMock):
+    class _Broken(_SamplingProvider):
+        async def generate_samples(
+            self, prompt: str, n: int, **kwargs: Any
+        ) -> tuple[list[str], Metrics]:
+            raise ValueError("boom")
+
+    results = await Runner(_Broken()).run([make_prompt("p", _P, samples=2)])
+
+    assert [(r.sample_index, r.execution_error) for r in results] == [(0, "boom"), (1, "boom")]
+
+
+def test_pass_at_k_matches_unbiased_estimator():
+    assert pass_at_k(10, 0, 1) == 0.0
+    assert pass_at_k(10, 3, 1) == pytest.approx(0.3)
+    assert pass_at_k(10, 3, 2) == pytest.approx(1 - 21 / 45)
+    assert pass_at_k(4, 2, 3) == 1.0
+    with pytest.raises(ValueError, match="k must be between 1 and 4"):
+        pass_at_k(4, 2, 5)
+
+
+def _sample(prompt: Prompt, passed: bool, latency_ms: float, **kwargs: Any) -> _TestResult:
+    return _TestResult(
+        test_case=prompt,
+        response="r",
+        passed=passed,
+        metrics=Metrics(latency_ms=latency_ms),
+        validation_details={},
+        **kwargs,
+    )
+
+
+def test_report_rolls_samples_up_per_prompt():
+    flaky = make_prompt("flaky", Contains("flaky"), samples=4)
+    stable = make_prompt("stable", Contains("stable"), samples=2)
+    report = Report(
+        results=[
+            _sample(flaky, True, 10.0),
+            _sample(stable, True, 5.0),
+            _sample(flaky, False, 30.0, sample_index=1),
+            _sample(stable, True, 5.0, sample_index=1),
+            _sample(flaky, True, 20.0, sample_index=2),
+            _TestResult(flaky, None, False, None, {}, skipped=True, sample_index=3),
+        ]
+    )
+
+    first, second = report.prompt_stats(k=(1, 2, 5))
+
+    assert first.test_case is flaky and first.flaky
+    assert (first.samples, first.passed) == (3, 2)
+    assert first.pass_rate == pytest.approx(2 / 3)
+    assert first.pass_rate_variance == pytest.approx(2 / 27)
+    assert first.pass_at_k == {1: pytest.approx(2 / 3), 2: 1.0}
+    assert first.latencies_ms == (10.0, 30.0, 20.0)
+    assert (first.avg_latency_ms, first.min_latency_ms, first.max_latency_ms) == (20, 10, 30)
+    assert first.latency_stdev_ms == pytest.approx((200 / 3) ** 0.5)
+
+    assert not second.flaky
+    assert (second.pass_rate, second.pass_rate_variance, second.latency_stdev_ms) == (1, 0, 0)
+
+
+def test_prompt_stats_of_fully_skipped_prompt_are_empty():
+    prompt = make_prompt("p", _P, samples=1)
+    stats = PromptStats.from_results([_TestResult(prompt, None, False, None, {}, skipped=True)])
+
+    assert (stats.samples, stats.pass_rate, stats.pass_at_k, stats.avg_latency_ms) == (
+        0,
+        0,
+        {},
+        0,
+    )
+
+
+async def test_journal_resumes_missing_samples(tmp_path: Path):
+    prompt = make_prompt("p", _P, samples=3)
+    journal = Journal(tmp_path / "run.jsonl")
+    with journal:
+        journal.append(_sample(prompt, True, 1.0, sample_index=0))
+        journal.append(_sample(prompt, True, 1.0, sample_index=1))
+
+    assert [r.sample_index for r in journal.read([prompt])] == [0, 1]
+    assert journal.pending([prompt, prompt]) == [
+        (prompt, Resume(samples=(2,), completed=2, passed=2)),
+        (prompt, Resume(samples=(0, 1, 2))),
+    ]
+
+    session = Session(provider=_SamplingProvider(), journal=journal)
+    session.add_test(prompt)
+    report = await session.run()
+
+    assert [(r.test_case, r.sample_index) for r in report.results] == [
+        (prompt, 0),
+        (prompt, 1),
+        (prompt, 2),
+    ]
+    assert report.prompt_stats()[0].samples == 3
+
+
+@pytest.mark.parametrize("provider", [_Provider, _SamplingProvider])
+async def test_resumed_samples_keep_their_indices(tmp_path: Path, provider: type[_Provider]):
+    prompt = make_prompt("p", _P, samples=4)
+    journal = Journal(tmp_path / "run.jsonl")
+    with journal:
+        journal.append(_sample(prompt, True, 1.0, sample_index=0))
+        journal.append(_sample(prompt, True, 1.0, sample_index=2))
+
+    session = Session(provider=provider(), journal=journal)
+    session.add_test(prompt)
+    report = await session.run()
+
+    assert sorted(r.sample_index for r in list(journal.read())[2:]) == [1, 3]
+    assert sorted(r.sample_index for r in report.results) == [0, 1, 2, 3]
+    assert all(r.test_case is prompt for r in report.results)
+    assert journal.pending([prompt]) == []
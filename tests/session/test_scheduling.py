@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import Counter, defaultdict
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from promptum.providers.metrics import Metrics
+from promptum.providers.retry import RetryConfig
+from promptum.session.case import Prompt
+from promptum.session.concurrency import AdaptiveConcurrency
+from promptum.session.runner import Runner
+from promptum.session.scheduling import FairScheduling
+from promptum.session.session import Session
+from promptum.session.stopping import EarlyStopping
+
+from .conftest import FakeProvider, make_prompts
+
+
+def _prompts(counts: dict[str, int], validator: MagicMock, samples: int = 1) -> list[Prompt]:
+    return [
+        prompt
+        for model, count in counts.items()
+        for prompt in make_prompts(
+            [f"{model}{i}" for i in range(count)], validator, model=model, samples=samples
+        )
+    ]
+
+
+async def test_models_take_turns(passing_validator: MagicMock):
+    provider = FakeProvider()
+    runner = Runner(provider, max_concurrent=1, fair_scheduling=FairScheduling())
+
+    results = await runner.run(_prompts({"a": 3, "b": 3}, passing_validator))
+
+    assert provider.calls == ["a0", "b0", "a1", "b1", "a2", "b2"]
+    # Results still come back in input order.
+    assert [r.test_case.name for r in results] == ["a0", "a1", "a2", "b0", "b1", "b2"]
+
+
+async def test_slow_model_does_not_starve_the_others(passing_validator: MagicMock):
+    provider = FakeProvider(delays={"slow": 0.05})
+    runner = Runner(provider, max_concurrent=2, fair_scheduling=FairScheduling())
+
+    await runner.run(_prompts({"slow": 3, "fast": 3}, passing_validator))
+
+    assert provider.calls == ["slow0", "fast0", "fast1", "fast2", "slow1", "slow2"]
+
+
+async def test_backoff_does_not_hold_the_model_slot(passing_validator: MagicMock):
+    class _TimedProvider(FakeProvider):
+        async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+            started[prompt].append(time.monotonic())
+            return await super().generate(prompt, **kwargs)
+
+    started: defaultdict[str, list[float]] = defaultdict(list)
+    runner = Runner(
+        _TimedProvider(failures={"a0": 1}),
+        max_concurrent=4,
+        fair_scheduling=FairScheduling(limits={"a": 1}),
+        deferred_retries=RetryConfig(max_attempts=2, initial_delay=0.5),
+    )
+
+    results = await runner.run(_prompts({"a": 2}, passing_validator))
+
+    assert all(r.passed for r in results)
+    first, retry = started["a0"]
+    assert retry - first >= 0.5
+    # a1 takes the model's only slot while a0 waits out its backoff.
+    assert started["a1"][0] < retry - 0.25
+
+
+async def test_per_model_limits(passing_validator: MagicMock):
+    provider = FakeProvider(delays={"a": 0.01, "b": 0.01})
+    scheduling = FairScheduling(limits={"a": 1}, default_limit=2)
+    runner = Runner(provider, max_concurrent=8, fair_scheduling=scheduling)
+
+    await runner.run(_prompts({"a": 4, "b": 6}, passing_validator))
+
+    assert provider.peak == Counter({"a": 1, "b": 2})
+
+
+async def test_weights_share_the_slots(passing_validator: MagicMock):
+    provider = FakeProvider(hang={"*"})
+    scheduling = FairScheduling(weights={"a": 3})
+    runner = Runner(provider, max_concurrent=4, fair_scheduling=scheduling)
+
+    task = asyncio.create_task(runner.run(_prompts({"a": 5, "b": 5}, passing_validator)))
+    while len(provider.calls) < 4:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert provider.peak == Counter({"a": 3, "b": 1})
+
+
+async def test_limits_apply_with_adaptive_concurrency(passing_validator: MagicMock):
+    provider = FakeProvider(delays={"a": 0.01})
+    runner = Runner(
+        provider,
+        max_concurrent=4,
+        adaptive=AdaptiveConcurrency(min_concurrent=4),
+        fair_scheduling=FairScheduling(limits={"a": 1}),
+    )
+
+    results = await runner.run(_prompts({"a": 2}, passing_validator, samples=5))
+
+    assert provider.peak["a"] == 1
+    assert results and all(r.passed for r in results)
+
+
+@pytest.mark.parametrize("cls", [Runner, Session])
+def test_early_stopping_and_fair_scheduling_are_rejected(cls: type):
+    with pytest.raises(ValueError, match="cannot be used together"):
+        cls(
+            FakeProvider(),
+            early_stopping=EarlyStopping(max_width=0.2),
+            fair_scheduling=FairScheduling(),
+        )
+
+
+async def test_short_lookahead_still_runs_everything(passing_validator: MagicMock):
+    provider = FakeProvider()
+    runner = Runner(provider, max_concurrent=2, fair_scheduling=FairScheduling(lookahead=1))
+
+    results = await runner.run(_prompts({"a": 3, "b": 2}, passing_validator))
+
+    assert len(results) == 5
+    assert provider.calls == ["a0", "a1", "a2", "b0", "b1"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"limits": {"a": 0}},
+        {"default_limit": 0},
+        {"weights": {"a": 0.0}},
+        {"lookahead": 0},
+    ],
+)
+def test_fair_scheduling_validation(kwargs: dict[str, Any]):
+    with pytest.raises(ValueError):
+        FairScheduling(**kwargs)
+
+
+def test_fair_scheduling_partition():
+    scheduling = FairScheduling(limits={"a": 8, "b": 1}, default_limit=3, weights={"a": 2})
+
+    part = scheduling.partition(2)
+
+    assert part.limits == {"a": 4, "b": 1}
+    assert part.default_limit == 1
+    assert part.weights == {"a": 2}
+    assert FairScheduling().partition(3).default_limit is None
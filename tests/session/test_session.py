@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from promptum.session.case import Prompt
+from promptum.session.concurrency import AdaptiveConcurrency
 from promptum.session.report import Report
 from promptum.session.session import Session
 
@@ -70,6 +71,13 @@ async def test_run_passes_max_concurrent(
             provider=mock_provider,
             max_concurrent=10,
             progress_callback=None,
+            stream=False,
+            adaptive=None,
+            budget=None,
+            early_stopping=None,
+            validation_executor=None,
+            deferred_retries=None,
+            fair_scheduling=None,
         )
 
 
@@ -92,4 +100,49 @@ async def test_run_passes_progress_callback(
             provider=mock_provider,
             max_concurrent=5,
             progress_callback=callback,
+            stream=False,
+            adaptive=None,
+            budget=None,
+            early_stopping=None,
+            validation_executor=None,
+            deferred_retries=None,
+            fair_scheduling=None,
         )
+
+
+async def test_concurrency_limit_reflects_runner_after_run(
+    mock_provider: AsyncMock,
+    sample_prompt: Prompt,
+):
+    session = Session(
+        provider=mock_provider,
+        max_concurrent=4,
+        adaptive=AdaptiveConcurrency(max_concurrent=4),
+    )
+    session.add_test(sample_prompt)
+
+    assert session.concurrency_limit == 4
+    await session.run()
+
+    assert session.concurrency_limit == 4
+
+
+async def test_run_iter_yields_every_result(
+    mock_provider: AsyncMock,
+    sample_prompt: Prompt,
+    failing_prompt: Prompt,
+):
+    session = Session(provider=mock_provider, max_concurrent=1)
+    session.add_tests([sample_prompt, failing_prompt])
+
+    results = [result async for result in session.run_iter()]
+
+    assert sorted(r.test_case.name for r in results) == ["failing-prompt", "test-prompt"]
+    assert session.concurrency_limit == 1
+
+
+async def test_run_iter_empty_session_yields_nothing(mock_provider: AsyncMock):
+    session = Session(provider=mock_provider)
+
+    assert [result async for result in session.run_iter()] == []
+    mock_provider.generate.assert_not_called()
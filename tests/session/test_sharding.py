@@ -0,0 +1,258 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from promptum.providers.metrics import Metrics
+from promptum.session.journal import Journal
+from promptum.session.session import Session
+from promptum.session.sharding import Shard, _run_shard, partition, split
+from promptum.validation import Contains
+
+from .conftest import make_prompt, make_prompts
+
+_VALIDATOR = Contains("p")
+
+
+class _PidProvider:
+    """Answers with the worker's pid; module-level so spawned processes can unpickle it."""
+
+    def __init__(self, shard: Shard):
+        self.shard = shard
+        self.entered = False
+
+    async def __aenter__(self) -> "_PidProvider":
+        self.entered = True
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def generate(self, prompt: str, model: str, **kwargs: Any) -> tuple[str, Metrics]:
+        assert self.entered
+        return f"{prompt} {os.getpid()} {self.shard.index}", Metrics(latency_ms=1.0)
+
+
+class _StallingProvider(_PidProvider):
+    """Answers `p0` at once and stalls on every other prompt."""
+
+    async def generate(self, prompt: str, model: str, **kwargs: Any) -> tuple[str, Metrics]:
+        if prompt != "p0":
+            await asyncio.sleep(60)
+        return await super().generate(prompt, model, **kwargs)
+
+
+def _failing_provider(shard: Shard) -> _PidProvider:
+    raise ValueError(f"no provider for shard {shard.index}")
+
+
+def _exiting_provider(shard: Shard) -> _PidProvider:
+    os._exit(3)
+
+
+def test_partition_deals_round_robin():
+    assert partition(list(range(7)), 3) == [[0, 3, 6], [1, 4], [2, 5]]
+
+
+def test_split_spreads_total_and_keeps_every_share_positive():
+    assert split(10, 3) == [4, 3, 3]
+    assert split(2, 4) == [1, 1, 1, 1]
+
+
+async def test_run_shard_enters_provider_and_runs_prompts():
+    batches: dict[tuple[int, int], list[Any]] = {}
+
+    await _run_shard(
+        batches.__setitem__,
+        None,
+        _PidProvider,
+        Shard(1, 2),
+        make_prompts(3, _VALIDATOR),
+        resume={},
+        max_concurrent=2,
+        stream=False,
+        adaptive=None,
+        budget=None,
+        early_stopping=None,
+        deferred_retries=None,
+        fair_scheduling=None,
+    )
+
+    results = [result for key in sorted(batches) for result in batches[key]]
+    assert [r.response for r in results] == [f"p{i} {os.getpid()} 1" for i in range(3)]
+    assert all(r.passed for r in results)
+
+
+async def test_run_sharded_spreads_prompts_over_processes(tmp_path: Path):
+    prompts = make_prompts(6, _VALIDATOR)
+    progress: list[tuple[int, int]] = []
+    journal = Journal(tmp_path / "run.jsonl")
+    session = Session(
+        provider=_PidProvider(Shard(0, 1)),
+        max_concurrent=4,
+        progress_callback=lambda done, total, result: progress.append((done, total)),
+        journal=journal,
+    )
+    session.add_tests(prompts)
+
+    report = await session.run_sharded(_PidProvider, shards=2)
+
+    assert [r.test_case.name for r in report.results] == [p.name for p in prompts]
+    assert all(r.passed for r in report.results)
+    pids = {r.response.split()[1] for r in report.results if r.response}
+    assert len(pids) == 2 and str(os.getpid()) not in pids
+    assert [r.response.split()[2] for r in report.results if r.response] == ["0", "1"] * 3
+    assert progress[-1] == (6, 6)
+    assert len(journal.pending(prompts)) == 0
+
+    resumed = await session.run_sharded(_PidProvider, shards=2)
+    assert len(resumed.results) == 6
+
+
+async def test_run_sharded_resumes_missing_samples(tmp_path: Path):
+    prompts = [replace(p, samples=2) for p in make_prompts(4, _VALIDATOR)]
+    journal = Journal(tmp_path / "run.jsonl")
+    session = Session(provider=_PidProvider(Shard(0, 1)), journal=journal)
+    session.add_tests(prompts)
+    await session.run_sharded(_PidProvider, shards=2)
+    # Keep only sample 0 of p1 and sample 1 of p2, as if the run had been interrupted.
+    lines = journal.path.read_text().splitlines(keepends=True)
+    journal.path.write_text(
+        "".join(
+            line
+            for line in lines
+            if (json.loads(line)["test_case"]["name"], json.loads(line)["sample_index"])
+            in {("p1", 0), ("p2", 1)}
+        )
+    )
+
+    report = await session.run_sharded(_PidProvider, shards=2)
+
+    assert sorted((r.test_case.name, r.sample_index) for r in report.results) == [
+        (f"p{i}", sample_index) for i in range(4) for sample_index in range(2)
+    ]
+    assert len(list(journal.read())) == 8
+
+
+async def test_run_sharded_empty_session_returns_empty_report():
+    session = Session(provider=_PidProvider(Shard(0, 1)))
+
+    report = await session.run_sharded(_PidProvider)
+
+    assert report.results == ()
+
+
+@pytest.mark.parametrize("shards", [1, 8])
+async def test_run_sharded_caps_shards_at_prompt_count(shards: int):
+    session = Session(provider=_PidProvider(Shard(0, 1)))
+    session.add_tests(make_prompts(2, _VALIDATOR))
+
+    report = await session.run_sharded(_PidProvider, shards=shards)
+
+    assert {r.response.split()[2] for r in report.results if r.response} == (
+        {"0"} if shards == 1 else {"0", "1"}
+    )
+
+
+async def test_run_sharded_keeps_samples_of_a_prompt_together():
+    prompts = [make_prompt(f"p{i}", _VALIDATOR, samples=i + 1) for i in range(3)]
+    progress: list[tuple[int, int]] = []
+    session = Session(
+        provider=_PidProvider(Shard(0, 1)),
+        progress_callback=lambda done, total, result: progress.append((done, total)),
+    )
+    session.add_tests(prompts)
+
+    report = await session.run_sharded(_PidProvider, shards=2)
+
+    assert [(r.test_case.name, r.sample_index) for r in report.results] == [
+        ("p0", 0),
+        ("p1", 0),
+        ("p1", 1),
+        ("p2", 0),
+        ("p2", 1),
+        ("p2", 2),
+    ]
+    assert progress[-1] == (6, 6)
+    assert session.live is not None
+    assert session.live.summary().passed == report.get_summary().passed == 6
+
+
+async def test_run_sharded_streams_results_and_terminates_workers_on_cancel(tmp_path: Path):
+    prompts = make_prompts(3, _VALIDATOR)
+    first = asyncio.Event()
+    journal = Journal(tmp_path / "run.jsonl")
+    session = Session(
+        provider=_PidProvider(Shard(0, 1)),
+        progress_callback=lambda done, total, result: first.set(),
+        journal=journal,
+    )
+    session.add_tests(prompts)
+
+    task = asyncio.create_task(session.run_sharded(_StallingProvider, shards=1))
+    await asyncio.wait_for(first.wait(), timeout=30)
+    start = time.monotonic()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The stalled requests are not awaited; the worker is terminated instead.
+    assert time.monotonic() - start < 10
+    assert session.last_report is not None
+    assert [(r.test_case.name, r.passed, r.skipped) for r in session.last_report.results] == [
+        ("p0", True, False),
+        ("p1", False, True),
+        ("p2", False, True),
+    ]
+    assert [prompt for prompt, _ in journal.pending(prompts)] == prompts[1:]
+
+
+async def test_run_sharded_stop_reaches_the_workers():
+    session = Session(provider=_PidProvider(Shard(0, 1)), max_concurrent=2)
+    session.progress_callback = lambda done, total, result: session.stop(0)
+    session.add_tests(make_prompts(4, _VALIDATOR))
+
+    report = await asyncio.wait_for(session.run_sharded(_StallingProvider, shards=2), timeout=30)
+
+    assert [(r.test_case.name, r.skipped) for r in report.results] == [
+        ("p0", False),
+        ("p1", True),
+        ("p2", True),
+        ("p3", True),
+    ]
+    assert session.last_report is report
+
+
+async def test_run_sharded_raises_shard_errors_and_keeps_a_partial_report():
+    session = Session(provider=_PidProvider(Shard(0, 1)))
+    session.add_tests(make_prompts(2, _VALIDATOR))
+
+    with pytest.raises(ValueError, match="no provider for shard"):
+        await session.run_sharded(_failing_provider, shards=2)
+
+    assert session.last_report is not None
+    assert [r.skipped for r in session.last_report.results] == [True, True]
+
+
+async def test_run_sharded_reports_a_worker_that_died():
+    session = Session(provider=_PidProvider(Shard(0, 1)))
+    session.add_tests(make_prompts(1, _VALIDATOR))
+
+    with pytest.raises(BrokenProcessPool, match="Shard 0 exited"):
+        await session.run_sharded(_exiting_provider)
+
+
+async def test_run_sharded_rejects_a_validation_executor():
+    with ThreadPoolExecutor(1) as executor:
+        session = Session(provider=_PidProvider(Shard(0, 1)), validation_executor=executor)
+        session.add_tests(make_prompts(1, _VALIDATOR))
+
+        with pytest.raises(ValueError, match="validation_executor"):
+            await session.run_sharded(_PidProvider)
@@ -0,0 +1,175 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from promptum.providers.metrics import Metrics
+from promptum.session.journal import Journal
+from promptum.session.runner import Runner
+from promptum.session.session import Session
+from promptum.session.stopping import EarlyStopping
+
+from .conftest import FakeProvider, make_prompts
+
+
+class _FirstCallProvider(FakeProvider):
+    """Answers the first request at once, whatever `hang` says."""
+
+    async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        if not self.calls:
+            self.calls.append(prompt)
+            return prompt, Metrics(latency_ms=1.0)
+        return await super().generate(prompt, **kwargs)
+
+
+async def _wait_for_calls(provider: FakeProvider, count: int) -> None:
+    while len(provider.calls) < count:
+        await asyncio.sleep(0)
+
+
+async def test_stop_lets_in_flight_requests_finish(passing_validator: MagicMock):
+    provider = FakeProvider(hang={"*"})
+    runner = Runner(provider, max_concurrent=2)
+
+    task = asyncio.create_task(runner.run(make_prompts(["a", "b", "c", "d"], passing_validator)))
+    await _wait_for_calls(provider, 2)
+    runner.stop()
+    provider.release.set()
+    results = await task
+
+    assert provider.calls == ["a", "b"]
+    assert [r.skipped for r in results] == [False, False, True, True]
+    assert results[0].response == "a"
+
+
+async def test_stop_cancels_in_flight_requests_after_grace_period(passing_validator: MagicMock):
+    provider = FakeProvider(hang={"a", "b"})
+    progress = MagicMock()
+    runner = Runner(provider, max_concurrent=2, progress_callback=progress)
+
+    task = asyncio.create_task(runner.run(make_prompts(["fast", "a", "b"], passing_validator)))
+    await _wait_for_calls(provider, 3)
+    runner.stop(grace_period=0.01)
+    results = await asyncio.wait_for(task, timeout=2)
+
+    assert sorted(provider.cancelled) == ["a", "b"]
+    assert [r.skipped for r in results] == [False, True, True]
+    assert progress.call_count == 3
+
+
+async def test_stop_from_progress_callback(passing_validator: MagicMock):
+    provider = FakeProvider()
+    session = Session(provider, max_concurrent=1)
+    session.progress_callback = lambda completed, total, result: session.stop(grace_period=0)
+    session.add_tests(make_prompts(["fast1", "fast2", "fast3"], passing_validator))
+
+    report = await session.run()
+
+    assert provider.calls == ["fast1"]
+    assert report.get_summary().skipped == 2
+    assert session.last_report is report
+
+
+async def test_stop_without_a_run_is_ignored(passing_validator: MagicMock):
+    session = Session(FakeProvider())
+    session.stop(grace_period=0)
+    session.add_tests(make_prompts(["fast"], passing_validator))
+
+    report = await session.run()
+
+    assert report.get_summary().passed == 1
+
+
+async def test_stop_ends_early_stopping_runs(passing_validator: MagicMock):
+    provider = FakeProvider(hang={"*"})
+    runner = Runner(
+        provider, max_concurrent=2, early_stopping=EarlyStopping(max_width=0.01, min_samples=2)
+    )
+
+    task = asyncio.create_task(runner.run(make_prompts(["a", "b"], passing_validator, samples=50)))
+    await _wait_for_calls(provider, 2)
+    runner.stop(grace_period=0)
+    results = await asyncio.wait_for(task, timeout=2)
+
+    assert len(provider.calls) == 2
+    assert results and all(r.skipped for r in results)
+
+
+async def test_cancelled_session_keeps_a_partial_report(passing_validator: MagicMock):
+    provider = FakeProvider(hang={"slow1", "slow2"})
+    session = Session(provider, max_concurrent=2)
+    session.add_tests(make_prompts(["fast1", "slow1", "fast2", "slow2"], passing_validator))
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.05):
+            await session.run()
+
+    assert session.last_report is not None
+    results = session.last_report.results
+    assert [r.test_case.name for r in results if not r.skipped] == ["fast1", "fast2"]
+    assert sorted(r.test_case.name for r in results if r.skipped) == ["slow1", "slow2"]
+    assert sorted(provider.cancelled) == ["slow1", "slow2"]
+
+
+async def test_cancelled_run_skips_the_unfinished_samples_of_a_started_prompt(
+    passing_validator: MagicMock,
+):
+    provider = _FirstCallProvider(hang={"*"})
+    runner = Runner(provider, max_concurrent=1)
+
+    task = asyncio.create_task(runner.run(make_prompts(["slow"], passing_validator, samples=3)))
+    await _wait_for_calls(provider, 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert [(r.sample_index, r.skipped) for r in runner.last_results] == [
+        (0, False),
+        (1, True),
+        (2, True),
+    ]
+
+
+async def test_cancelled_run_skips_a_repeated_prompt_that_did_not_run(
+    passing_validator: MagicMock,
+):
+    provider = FakeProvider(hang={"slow"})
+    fast, slow = make_prompts(["fast", "slow"], passing_validator)
+    runner = Runner(provider, max_concurrent=1)
+
+    task = asyncio.create_task(runner.run([fast, slow, fast]))
+    await _wait_for_calls(provider, 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The same Prompt object at two positions gets one row per position.
+    assert [(r.test_case.name, r.skipped) for r in runner.last_results] == [
+        ("fast", False),
+        ("slow", True),
+        ("fast", True),
+    ]
+
+
+async def test_cancelled_journaled_session_keeps_a_partial_report(
+    tmp_path: Path, passing_validator: MagicMock
+):
+    provider = FakeProvider(hang={"slow", "other"})
+    journal = Journal(tmp_path / "run.jsonl")
+    session = Session(provider, max_concurrent=1, journal=journal)
+    session.add_tests(make_prompts(["fast", "slow"], passing_validator))
+    session.add_tests(make_prompts(["other"], passing_validator, samples=2))
+
+    task = asyncio.create_task(session.run())
+    await _wait_for_calls(provider, 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert session.last_report is not None
+    summary = session.last_report.get_summary()
+    assert (summary.total, summary.passed, summary.skipped) == (4, 1, 3)
+    # Skipped results are not journaled, so resuming runs them.
+    assert [p.name for p, _ in journal.pending(session._test_cases)] == ["slow", "other"]
@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from promptum.session.sketch import QuantileSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    return sorted(values)[round(q * (len(values) - 1))]
+
+
+@pytest.mark.parametrize("q", [0.0, 0.5, 0.9, 0.95, 0.99, 1.0])
+def test_quantiles_are_within_the_relative_accuracy(q: float):
+    rng = random.Random(0)
+    values = [rng.lognormvariate(5, 1.5) for _ in range(10_000)]
+
+    sketch = QuantileSketch.of(values, relative_accuracy=0.01)
+
+    assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.01)
+
+
+def test_add_and_update_agree():
+    values = [0.0, 0.5, 3.0, 3.0, 120.0]
+    one_by_one = QuantileSketch()
+    for value in values:
+        one_by_one.add(value)
+
+    assert one_by_one == QuantileSketch.of(values)
+    assert one_by_one.count == 5
+    assert one_by_one.zeros == 1
+    assert one_by_one.avg == pytest.approx(25.3)
+    assert (one_by_one.min, one_by_one.max) == (0.0, 120.0)
+
+
+def test_numpy_update_matches_the_list_update():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(2)
+    values = [0.0, *(rng.lognormvariate(3, 2) for _ in range(2_000))]
+
+    sketch = QuantileSketch.of(np.array(values))
+
+    assert sketch == QuantileSketch.of(values)
+    assert sketch.avg == pytest.approx(QuantileSketch.of(values).avg)
+    assert QuantileSketch.of(np.array([])).count == 0
+    with pytest.raises(ValueError, match="non-negative"):
+        QuantileSketch.of(np.array([1.0, -1.0]))
+
+
+def test_merge_matches_a_sketch_of_all_values():
+    rng = random.Random(1)
+    parts = [[rng.expovariate(0.01) for _ in range(500)] for _ in range(3)]
+
+    merged = QuantileSketch.merge(*(QuantileSketch.of(part) for part in parts))
+
+    assert merged == QuantileSketch.of(v for part in parts for v in part)
+    assert QuantileSketch.merge().count == 0
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError, match="different accuracy"):
+        QuantileSketch.merge(QuantileSketch(0.01), QuantileSketch(0.05))
+
+
+def test_bucket_count_is_bounded():
+    sketch = QuantileSketch(max_buckets=8)
+    sketch.update(float(2**i) for i in range(40))
+    sketch.add(2.0**50)
+
+    assert len(sketch.histogram()) == 8
+    # Only the low end loses accuracy.
+    assert sketch.quantile(1.0) == 2.0**50
+    assert sketch.quantile(0.95) == pytest.approx(2.0**38, rel=0.01)
+
+
+def test_histogram_covers_every_value():
+    sketch = QuantileSketch.of([0.0, 1.0, 1.0, 10.0])
+
+    histogram = sketch.histogram()
+
+    assert histogram[0] == (0.0, sketch.min_value, 1)
+    assert sum(count for _, _, count in histogram) == 4
+    assert all(low < high for low, high, _ in histogram)
+    assert histogram[1][0] < 1.0 <= histogram[1][1]
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+
+    assert sketch.quantile(0.99) == 0.0
+    assert sketch.avg == 0.0
+    assert sketch.histogram() == []
+
+
+@pytest.mark.parametrize("kwargs", [{"relative_accuracy": 0}, {"max_buckets": 0}, {"min_value": 0}])
+def test_validation(kwargs: dict[str, float]):
+    with pytest.raises(ValueError):
+        QuantileSketch(**kwargs)  # ty: ignore[invalid-argument-type]
+
+
+def test_rejects_bad_input():
+    sketch = QuantileSketch()
+
+    with pytest.raises(ValueError, match="non-negative"):
+        sketch.add(-1.0)
+    with pytest.raises(ValueError, match="non-negative"):
+        sketch.update([1.0, -1.0])
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        sketch.quantile(1.5)
+    assert "count=0" in repr(sketch)
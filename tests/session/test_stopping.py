@@ -0,0 +1,228 @@
+import asyncio
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from promptum.providers.metrics import Metrics
+from promptum.session.budget import Budget
+from promptum.session.journal import Journal
+from promptum.session.result import TestResult as _TestResult
+from promptum.session.runner import Runner
+from promptum.session.session import Session
+from promptum.session.sharding import Shard
+from promptum.session.stopping import EarlyStopping, wilson_interval
+from promptum.validation import Contains
+
+from .conftest import make_prompt
+
+_OK = Contains("ok")
+
+
+class _Provider:
+    """Passes prompts named `pass`, fails `fail`, and alternates for anything else."""
+
+    def __init__(self, shard: Shard | None = None) -> None:
+        self.calls: Counter[str] = Counter()
+
+    async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+        self.calls[prompt] += 1
+        passed = prompt == "pass" or (prompt != "fail" and self.calls[prompt] % 2 == 0)
+        await asyncio.sleep(0)
+        return "ok" if passed else "no", Metrics(latency_ms=1.0, cost_usd=1.0)
+
+
+class _SamplingProvider(_Provider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    async def generate_samples(
+        self, prompt: str, n: int, **kwargs: Any
+    ) -> tuple[list[str], Metrics]:
+        self.batches.append(n)
+        return ["ok"] * n, Metrics(latency_ms=1.0)
+
+
+def test_wilson_interval():
+    assert wilson_interval(8, 10) == pytest.approx((0.4902, 0.9433), abs=1e-4)
+    assert wilson_interval(50, 100) == pytest.approx((0.4038, 0.5962), abs=1e-4)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(5, 5, confidence=0.99)
+    assert high == 1.0 and low < wilson_interval(5, 5)[0]
+
+
+def test_early_stopping_validates_config():
+    with pytest.raises(ValueError, match="confidence"):
+        EarlyStopping(confidence=1.0)
+    with pytest.raises(ValueError, match="max_width, threshold or both"):
+        EarlyStopping(max_width=None)
+    with pytest.raises(ValueError, match="min_samples"):
+        EarlyStopping(min_samples=0)
+
+
+def test_decided_by_width_or_threshold():
+    by_width = EarlyStopping(max_width=0.2)
+    by_threshold = EarlyStopping(max_width=None, threshold=0.5)
+
+    assert not by_width.decided(15, 15) and by_width.decided(16, 16)
+    assert not by_width.decided(4, 4)
+    assert by_threshold.decided(0, 5) and by_threshold.decided(5, 5)
+    assert not by_threshold.decided(3, 6)
+
+
+async def test_sampling_stops_once_pass_rate_is_known():
+    provider = _Provider()
+    runner = Runner(provider, max_concurrent=1, early_stopping=EarlyStopping(max_width=0.2))
+
+    results = await runner.run([make_prompt("pass", _OK, samples=100)])
+
+    assert provider.calls["pass"] == 16
+    assert [r.sample_index for r in results] == list(range(16))
+
+
+async def test_freed_slots_go_to_undecided_prompts():
+    provider = _Provider()
+    stopping = EarlyStopping(max_width=None, threshold=0.5)
+    runner = Runner(provider, max_concurrent=2, early_stopping=stopping)
+
+    results = await runner.run(
+        [
+            make_prompt("fail", _OK, samples=100),
+            make_prompt("flaky", _OK, samples=20),
+            make_prompt("pass", _OK, samples=100),
+        ]
+    )
+
+    assert 5 <= provider.calls["fail"] <= 6
+    assert 5 <= provider.calls["pass"] <= 6
+    assert provider.calls["flaky"] == 20
+    names = [r.test_case.name for r in results]
+    assert names == sorted(names, key=["fail", "flaky", "pass"].index)
+
+
+async def test_first_samples_are_batched_then_sent_one_by_one():
+    provider = _SamplingProvider()
+    runner = Runner(
+        provider, max_concurrent=1, early_stopping=EarlyStopping(max_width=0.25, min_samples=4)
+    )
+
+    results = await runner.run(
+        [make_prompt("pass", _OK, samples=100), make_prompt("single", _OK, samples=1)]
+    )
+
+    assert provider.batches == [4]
+    assert provider.calls == {"pass": 8, "single": 1}
+    assert [r.sample_index for r in results] == [*range(12), 0]
+
+
+async def test_budget_exhaustion_stops_sampling():
+    provider = _Provider()
+    runner = Runner(
+        provider,
+        max_concurrent=1,
+        budget=Budget(max_cost_usd=3.0),
+        early_stopping=EarlyStopping(),
+    )
+
+    results = await runner.run(
+        [make_prompt("flaky", _OK, samples=100), make_prompt("pass", _OK, samples=100)]
+    )
+
+    assert provider.calls == {"flaky": 3}
+    assert [r.skipped for r in results] == [False, False, False, True, True]
+
+
+async def test_lazy_input_is_admitted_as_slots_free_up():
+    pulled = 0
+
+    def prompts():
+        nonlocal pulled
+        for _ in range(100):
+            pulled += 1
+            yield make_prompt("pass", _OK, samples=1)
+
+    runner = Runner(_Provider(), max_concurrent=4, early_stopping=EarlyStopping())
+    async with asyncio.timeout(5):
+        async for _ in runner.run_iter(prompts()):
+            assert pulled <= 9
+            break
+
+
+@pytest.mark.parametrize("provider", [_Provider, _SamplingProvider])
+async def test_resume_does_not_resample_decided_prompts(tmp_path: Path, provider: type[_Provider]):
+    journal = Journal(tmp_path / "run.jsonl")
+    session = Session(
+        provider(),
+        max_concurrent=1,
+        early_stopping=EarlyStopping(max_width=None, threshold=0.5),
+        journal=journal,
+    )
+    session.add_test(make_prompt("pass", _OK, samples=100))
+
+    for _ in range(3):
+        report = await session.run()
+
+    assert len(list(journal.read())) == 5
+    assert [r.sample_index for r in report.results] == list(range(5))
+
+
+@pytest.mark.parametrize("provider", [_Provider, _SamplingProvider])
+async def test_resume_counts_journaled_samples(tmp_path: Path, provider: type[_Provider]):
+    prompt = make_prompt("pass", _OK, samples=100)
+    journal = Journal(tmp_path / "run.jsonl")
+    with journal:
+        for sample_index in range(3):
+            journal.append(_TestResult(prompt, "ok", True, None, {}, sample_index=sample_index))
+    session = Session(
+        provider(),
+        max_concurrent=1,
+        early_stopping=EarlyStopping(max_width=None, threshold=0.5),
+        journal=journal,
+    )
+    session.add_test(prompt)
+
+    report = await session.run()
+
+    # Two more passes decide the prompt, on top of the three journaled ones.
+    assert len(list(journal.read())) == 5
+    assert [r.sample_index for r in report.results] == list(range(5))
+    assert journal.pending([prompt], session.early_stopping) == []
+
+
+async def test_run_sharded_passes_early_stopping():
+    session = Session(
+        _Provider(), max_concurrent=2, early_stopping=EarlyStopping(max_width=None, threshold=0.5)
+    )
+    session.add_tests(
+        [make_prompt("pass", _OK, samples=100), make_prompt("fail", _OK, samples=100)]
+    )
+
+    report = await session.run_sharded(_Provider, shards=2)
+
+    assert Counter(r.test_case.name for r in report.results) == {"pass": 5, "fail": 5}
+
+
+async def test_samples_in_flight_when_decided_are_still_reported():
+    gate = asyncio.Event()
+    calls = 0
+
+    class _Gated:
+        async def generate(self, prompt: str, **kwargs: Any) -> tuple[str, Metrics]:
+            nonlocal calls
+            calls += 1
+            if calls > 5:
+                await gate.wait()
+            await asyncio.sleep(0)
+            return "no", Metrics(latency_ms=1.0)
+
+    stopping = EarlyStopping(max_width=None, threshold=0.5)
+    runner = Runner(_Gated(), max_concurrent=3, early_stopping=stopping)
+    asyncio.get_running_loop().call_later(0.05, gate.set)
+
+    results = await runner.run([make_prompt("fail", _OK, samples=10)])
+
+    # Samples started before the fifth failure decided the prompt still finish.
+    assert calls > 5
+    assert [r.sample_index for r in results] == list(range(calls))
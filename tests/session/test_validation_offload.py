@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, ClassVar
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from promptum.providers.metrics import Metrics
+from promptum.session.case import Prompt
+from promptum.session.runner import Runner
+from promptum.validation import Contains, JsonSchema, Regex, is_cpu_heavy
+
+
+class _SlowValidator:
+    cpu_heavy: ClassVar[bool] = True
+
+    def __init__(self, seconds: float = 0.0, error: Exception | None = None):
+        self.seconds = seconds
+        self.error = error
+        self.threads: list[int] = []
+
+    def validate(self, response: str) -> tuple[bool, dict[str, Any]]:
+        self.threads.append(threading.get_ident())
+        if self.error is not None:
+            raise self.error
+        time.sleep(self.seconds)
+        return True, {}
+
+    def describe(self) -> str:
+        return "slow"
+
+
+class _LightValidator(_SlowValidator):
+    cpu_heavy: ClassVar[bool] = False
+
+
+def _prompt(validator: Any, name: str = "p") -> Prompt:
+    return Prompt(name=name, prompt='{"a": 1}', model="m", validator=validator)
+
+
+def test_cpu_heavy_declarations():
+    assert is_cpu_heavy(JsonSchema()) and is_cpu_heavy(Regex("a"))
+    assert not is_cpu_heavy(Contains("a"))
+    assert not is_cpu_heavy(MagicMock())
+
+
+async def test_cpu_heavy_validators_run_on_the_executor(mock_provider: AsyncMock):
+    heavy = _SlowValidator(seconds=0.01)
+    light = _LightValidator()
+
+    with ThreadPoolExecutor(1) as executor:
+        runner = Runner(mock_provider, validation_executor=executor)
+        results = await runner.run([_prompt(heavy), _prompt(light)])
+
+    assert heavy.threads[0] != threading.get_ident()
+    assert light.threads == [threading.get_ident()]
+    assert results[0].validation_ms is not None and results[0].validation_ms >= 10
+    assert results[1].validation_ms is not None
+
+
+async def test_without_executor_validation_stays_inline(mock_provider: AsyncMock):
+    heavy = _SlowValidator()
+
+    results = await Runner(mock_provider).run([_prompt(heavy)])
+
+    assert heavy.threads == [threading.get_ident()]
+    assert results[0].passed
+
+
+async def test_offloaded_validation_keeps_the_event_loop_responsive(mock_provider: AsyncMock):
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(tick())
+    with ThreadPoolExecutor(1) as executor:
+        await Runner(mock_provider, validation_executor=executor).run(
+            [_prompt(_SlowValidator(seconds=0.1))]
+        )
+    ticker.cancel()
+
+    assert ticks >= 5
+
+
+async def test_offloaded_validation_errors_are_execution_errors(mock_provider: AsyncMock):
+    with ThreadPoolExecutor(1) as executor:
+        runner = Runner(mock_provider, validation_executor=executor)
+        results = await runner.run([_prompt(_SlowValidator(error=ValueError("bad input")))])
+
+        with pytest.raises(RuntimeError, match="validator bug"):
+            await runner.run([_prompt(_SlowValidator(error=RuntimeError("validator bug")))])
+
+    assert results[0].execution_error == "bad input"
+    assert results[0].validation_ms is None
+
+
+async def test_process_pool_validation():
+    provider = AsyncMock()
+    provider.generate.return_value = ('{"a": 1}', Metrics(latency_ms=1.0))
+
+    with ProcessPoolExecutor(1) as executor:
+        runner = Runner(provider, validation_executor=executor)
+        results = await runner.run([_prompt(JsonSchema(required_keys=("a",)))])
+
+    assert results[0].passed
+    assert results[0].validation_details["parsed"] == {"a": 1}
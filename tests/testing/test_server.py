@@ -0,0 +1,166 @@
+import asyncio
+import contextlib
+import random
+from typing import Any
+
+import httpx
+import pytest
+
+from promptum.providers.exceptions import ProviderRetryExhaustedError
+from promptum.providers.openrouter import OpenRouterClient
+from promptum.providers.retry import RetryConfig
+from promptum.testing.server import (
+    FixedLatency,
+    LogNormalLatency,
+    MockServer,
+    MockServerConfig,
+    UniformLatency,
+)
+
+
+async def test_generate_against_mock_server_reports_usage_and_cost():
+    config = MockServerConfig(completion_tokens=4, cost_per_token=0.01)
+    async with (
+        MockServer(config) as server,
+        OpenRouterClient(api_key="k", base_url=server.base_url) as client,
+    ):
+        content, metrics = await client.generate(prompt="12345678", model="m")
+
+    assert content == "token0 token1 token2 token3 "
+    assert metrics.prompt_tokens == 3
+    assert metrics.completion_tokens == 4
+    assert metrics.total_tokens == 7
+    assert metrics.cost_usd == pytest.approx(0.07)
+    assert server.stats == {200: 1}
+
+
+async def test_generate_stream_against_mock_server_paces_tokens():
+    config = MockServerConfig(completion_tokens=3, tokens_per_second=200)
+    async with (
+        MockServer(config) as server,
+        OpenRouterClient(api_key="k", base_url=server.base_url) as client,
+    ):
+        content, metrics = await client.generate_stream(prompt="hi", model="m")
+
+    assert content == "token0 token1 token2 "
+    assert metrics.completion_tokens == 3
+    assert metrics.inter_token_latency_ms is not None
+    assert metrics.inter_token_latency_ms >= 4
+
+
+async def test_respond_and_max_tokens_shape_the_completion():
+    def respond(payload: dict[str, Any]) -> str:
+        return payload["messages"][-1]["content"].upper()
+
+    async with (
+        MockServer(MockServerConfig(respond=respond)) as server,
+        OpenRouterClient(api_key="k", base_url=server.base_url) as client,
+    ):
+        echoed, metrics = await client.generate(prompt="two words", model="m")
+
+    async with (
+        MockServer(MockServerConfig(completion_tokens=10)) as server,
+        OpenRouterClient(api_key="k", base_url=server.base_url) as client,
+    ):
+        _, capped = await client.generate(prompt="hi", model="m", max_tokens=2)
+
+    assert echoed == "TWO WORDS"
+    assert metrics.completion_tokens == 2
+    assert capped.completion_tokens == 2
+
+
+async def test_n_returns_independent_choices_and_sums_usage():
+    config = MockServerConfig(completion_tokens=3, cost_per_token=0.01)
+    async with (
+        MockServer(config) as server,
+        OpenRouterClient(api_key="k", base_url=server.base_url) as client,
+    ):
+        contents, metrics = await client.generate_samples(prompt="1234", model="m", n=3)
+
+    assert contents == ["token0 token1 token2 "] * 3
+    assert metrics.completion_tokens == 9
+    assert metrics.total_tokens == 11
+    assert server.stats == {200: 1}
+
+
+async def test_injected_rate_limits_send_retry_after_and_exhaust_retries():
+    config = MockServerConfig(rate_limit_probability=1.0, retry_after=2)
+    retry_config = RetryConfig(max_attempts=3, initial_delay=0.0)
+    async with (
+        MockServer(config) as server,
+        httpx.AsyncClient(base_url=server.base_url) as http,
+    ):
+        response = await http.post("/chat/completions", json={"messages": []})
+        async with OpenRouterClient(
+            api_key="k", base_url=server.base_url, default_retry_config=retry_config
+        ) as client:
+            with pytest.raises(ProviderRetryExhaustedError) as exc_info:
+                await client.generate(prompt="hi", model="m")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert exc_info.value.last_status_code == 429
+    assert server.stats == {429: 4}
+
+
+async def test_injected_server_errors_are_seeded():
+    config = MockServerConfig(server_error_probability=0.5, server_error_status=502, seed=7)
+    statuses = []
+    for _ in range(2):
+        async with MockServer(config) as server:
+            async with httpx.AsyncClient(base_url=server.base_url) as http:
+                for _ in range(10):
+                    response = await http.post("/chat/completions", json={"messages": []})
+            statuses.append(dict(server.stats))
+
+    assert statuses[0] == statuses[1]
+    assert set(statuses[0]) == {200, 502}
+    assert "Retry-After" not in response.headers
+
+
+async def test_models_unknown_routes_and_invalid_bodies():
+    async with (
+        MockServer() as server,
+        httpx.AsyncClient(base_url=server.base_url) as http,
+    ):
+        models = await http.get("/models")
+        missing = await http.get("/nowhere")
+        invalid = await http.post("/chat/completions", content=b"not json")
+
+    assert models.json() == {"data": []}
+    assert missing.status_code == 404
+    assert invalid.status_code == 400
+
+
+async def test_stop_is_idempotent():
+    server = MockServer()
+    await server.stop()
+    await server.start()
+    assert server.port != 0
+    await server.stop()
+    await server.stop()
+
+
+def test_latency_distributions():
+    rng = random.Random(0)
+
+    assert FixedLatency(0.25).sample(rng) == 0.25
+    assert all(0.1 <= UniformLatency(0.1, 0.2).sample(rng) <= 0.2 for _ in range(100))
+    samples = sorted(LogNormalLatency(0.1, sigma=0.5).sample(rng) for _ in range(1001))
+    assert samples[500] == pytest.approx(0.1, rel=0.15)
+
+
+async def test_serve_forever_starts_server_until_cancelled():
+    server = MockServer()
+    task = asyncio.create_task(server.serve_forever())
+    while server._server is None:
+        await asyncio.sleep(0)
+
+    async with httpx.AsyncClient(base_url=server.base_url) as http:
+        response = await http.get("/models")
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    await server.stop()
+
+    assert response.status_code == 200